@@ -14,6 +14,7 @@ from src.database import Base
 
 # Importar todos los modelos para que Alembic los detecte
 from src.models import (  # noqa: F401
+    CatalogVersion,
     Feedback,
     Institution,
     Profile,
@@ -34,6 +35,21 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Columnas e índices de búsqueda creados por la migración 003 (no mapeados
+# en los modelos): autogenerate no debe proponer borrarlos
+UNMAPPED_SEARCH_OBJECTS = {
+    "search_vector",
+    "idx_programs_search",
+    "idx_programs_name_trgm",
+    "idx_trajectories_search",
+}
+
+
+def include_object(_obj, name, _type, reflected, compare_to) -> bool:
+    """Excluye de autogenerate los objetos de búsqueda no mapeados."""
+    return not (reflected and compare_to is None and name in UNMAPPED_SEARCH_OBJECTS)
+
+
 # Obtener la URL de la BD desde la configuración
 settings = get_settings()
 config.set_main_option("sqlalchemy.url", settings.database_url)
@@ -80,6 +96,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,  # Detectar cambios de tipo
             compare_server_default=True,  # Detectar cambios en defaults
+            include_object=include_object,
         )
 
         with context.begin_transaction():
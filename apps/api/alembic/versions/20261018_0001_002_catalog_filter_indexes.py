@@ -0,0 +1,50 @@
+"""Catalog filter indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filtro por provincia del listado de programas
+    op.create_index("idx_institutions_province", "institutions", ["province"], unique=False)
+
+    # Filtros combinados; reemplaza al índice sobre area (es su prefijo)
+    op.create_index(
+        "idx_programs_area_modality_type",
+        "programs",
+        ["area", "modality", "type"],
+        unique=False,
+    )
+    op.drop_index("idx_programs_area", table_name="programs")
+
+    # Listados y motor solo leen trayectorias verificadas: el índice parcial
+    # reemplaza al índice completo sobre program_id
+    op.create_index(
+        "idx_trajectories_verified_program",
+        "trajectories",
+        ["program_id"],
+        unique=False,
+        postgresql_where=sa.text("is_verified"),
+    )
+    op.drop_index("idx_trajectories_program", table_name="trajectories")
+
+
+def downgrade() -> None:
+    op.create_index("idx_trajectories_program", "trajectories", ["program_id"], unique=False)
+    op.drop_index("idx_trajectories_verified_program", table_name="trajectories")
+    op.create_index("idx_programs_area", "programs", ["area"], unique=False)
+    op.drop_index("idx_programs_area_modality_type", table_name="programs")
+    op.drop_index("idx_institutions_province", table_name="institutions")
@@ -0,0 +1,76 @@
+"""Full-text and trigram search
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # unaccent() es STABLE; este envoltorio IMMUTABLE permite indexarlo
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+
+    # Español sin acentos: 'Ingeniería' e 'ingenieria' generan el mismo lexema
+    op.execute("CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION es_unaccent "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem"
+    )
+
+    # Vectores de búsqueda mantenidos por la BD (nombre/título pesan más)
+    op.execute(
+        """
+        ALTER TABLE programs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('es_unaccent', coalesce(name, '')), 'A')
+            || setweight(to_tsvector('es_unaccent', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE trajectories ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('es_unaccent', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('es_unaccent', coalesce(summary, '')), 'B')
+            || setweight(to_tsvector('es_unaccent', coalesce(story, '')), 'C')
+        ) STORED
+        """
+    )
+    op.create_index("idx_programs_search", "programs", ["search_vector"], postgresql_using="gin")
+    op.create_index(
+        "idx_trajectories_search", "trajectories", ["search_vector"], postgresql_using="gin"
+    )
+
+    # Búsqueda aproximada por nombre (operador <% de pg_trgm)
+    op.execute(
+        "CREATE INDEX idx_programs_name_trgm ON programs "
+        "USING gin (f_unaccent(lower(name)) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_programs_name_trgm", table_name="programs")
+    op.drop_index("idx_trajectories_search", table_name="trajectories")
+    op.drop_index("idx_programs_search", table_name="programs")
+    op.execute("ALTER TABLE trajectories DROP COLUMN search_vector")
+    op.execute("ALTER TABLE programs DROP COLUMN search_vector")
+    op.execute("DROP TEXT SEARCH CONFIGURATION es_unaccent")
+    op.execute("DROP FUNCTION f_unaccent(text)")
@@ -0,0 +1,70 @@
+"""Catalog version counter and triggers
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATALOG_TABLES = ("institutions", "programs", "trajectories")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_version",
+        sa.Column("id", sa.SmallInteger(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 0)")
+
+    # Cada sentencia sobre el catálogo avanza la versión y la notifica por
+    # `catalog_changed` (el NOTIFY se entrega al confirmar la transacción)
+    op.execute(
+        """
+        CREATE FUNCTION bump_catalog_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            new_version bigint;
+            changed_at timestamptz;
+        BEGIN
+            UPDATE catalog_version SET version = version + 1, updated_at = now()
+            WHERE id = 1
+            RETURNING version, updated_at INTO new_version, changed_at;
+            PERFORM pg_notify(
+                'catalog_changed', new_version || ',' || extract(epoch FROM changed_at)
+            );
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for table in CATALOG_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_catalog_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version()"
+        )
+
+
+def downgrade() -> None:
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER {table}_catalog_version ON {table}")
+    op.execute("DROP FUNCTION bump_catalog_version()")
+    op.drop_table("catalog_version")
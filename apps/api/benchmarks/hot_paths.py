@@ -0,0 +1,267 @@
+"""
+Benchmarks de los caminos calientes de la API a distintos tamaños de catálogo.
+
+Para cada tamaño genera un catálogo sintético (`scripts.synthetic_data`) en
+una BD SQLite en memoria y mide, llamando a los servicios directamente:
+
+- `RecommendationService.generate`, sin cache y con el cache caliente.
+- `RecommendationService.get_by_id`.
+- `ProgramService.list` con cada combinación de filtros, y `get_by_id`.
+- `TrajectoryService.list` por resultado y área y, en Postgres, con
+  superposición de 1 a 3 tags (el operador `&&` no existe en SQLite).
+
+De cada caso registra los percentiles de latencia, las sentencias SQL por
+llamada y el pico de memoria (tracemalloc, en una pasada aparte para no
+distorsionar los tiempos). Los resultados se escriben en JSON; con
+`--compare` se contrastan con los de otra corrida (p. ej. otro commit).
+Con `--database-url` mide contra una BD existente, sin generar datos.
+
+Ejecutar con: python -m benchmarks.hot_paths [--sizes 1000 10000] [--output r.json]
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, event, func, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from scripts.synthetic_data import OUTCOMES, TAGS, SyntheticScale, generate
+from src.database import Base
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.schemas.programs import ProgramFilters
+from src.schemas.trajectories import TrajectoryFilters
+from src.services.catalog import catalog_store
+from src.services.program_service import ProgramService
+from src.services.recommendation_cache import RecommendationCache
+from src.services.recommendation_service import RecommendationService
+from src.services.trajectory_service import TrajectoryService
+
+# Caso: nombre -> función que ejecuta una llamada (recibe el número de iteración)
+Cases = dict[str, Callable[[int], Any]]
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Iterator[list[str]]:
+    """Registra las sentencias SQL ejecutadas contra el engine."""
+    statements: list[str] = []
+
+    def before_cursor_execute(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def build_database(programs: int, seed: int) -> tuple[Engine, Session]:
+    """BD SQLite en memoria con un catálogo sintético del tamaño pedido."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    scale = SyntheticScale.for_programs(programs)
+    generate(db, scale, seed=seed)
+    # Los INSERT en lote no pasan por el flush del ORM: se descarta el snapshot
+    catalog_store.clear()
+    return engine, db
+
+
+def filter_combinations(sample: Program, province: str) -> dict[str, ProgramFilters]:
+    """Todas las combinaciones de filtros, con valores de un programa existente."""
+    values = {
+        "area": sample.area,
+        "type": sample.type,
+        "modality": sample.modality,
+        "province": province,
+        "work_compatible": bool(sample.work_compatible),
+        "max_duration": float(sample.duration_years or 6),
+    }
+    combinations = {}
+    for size in range(len(values) + 1):
+        for fields in itertools.combinations(values, size):
+            name = "+".join(fields) or "sin filtros"
+            combinations[name] = ProgramFilters(**{field: values[field] for field in fields})
+    return combinations
+
+
+def build_cases(db: Session, seed: int) -> Cases:
+    """Casos a medir sobre el catálogo cargado en `db`."""
+    rng = random.Random(seed)
+    profile_ids = db.scalars(select(Profile.id).limit(200)).all()
+    program_ids = db.scalars(select(Program.id).limit(200)).all()
+    sample = db.get(Program, program_ids[0])
+    province = db.scalar(
+        select(Institution.province).where(Institution.id == sample.institution_id)
+    )
+
+    cold = RecommendationService(db, cache=None, factor_cache=None)
+    warm = RecommendationService(db, cache=RecommendationCache(maxsize=1024, ttl=3600))
+    recommendation_ids = [cold.generate(profile_id).id for profile_id in profile_ids[:50]]
+    for profile_id in profile_ids[:20]:
+        warm.generate(profile_id)
+    programs = ProgramService(db)
+    trajectories = TrajectoryService(db)
+
+    cases: Cases = {
+        "recommendations.generate (sin cache)": lambda i: cold.generate(
+            profile_ids[i % len(profile_ids)]
+        ),
+        "recommendations.generate (cache caliente)": lambda i: warm.generate(profile_ids[i % 20]),
+        "recommendations.get_by_id": lambda i: cold.get_by_id(
+            recommendation_ids[i % len(recommendation_ids)]
+        ),
+        "programs.get_by_id": lambda i: programs.get_by_id(program_ids[i % len(program_ids)]),
+    }
+    for name, filters in filter_combinations(sample, province).items():
+        cases[f"programs.list [{name}]"] = lambda _, filters=filters: programs.list(filters)
+    for outcome in OUTCOMES:
+        cases[f"trajectories.list [outcome={outcome}]"] = lambda _, outcome=outcome: (
+            trajectories.list(TrajectoryFilters(outcome=outcome, area=sample.area))
+        )
+    if db.get_bind().dialect.name != "postgresql":
+        return cases
+    tag_vocabulary = list(TAGS)
+    for overlap in (1, 2, 3):
+        tag_sets = [rng.sample(tag_vocabulary, overlap) for _ in range(10)]
+        cases[f"trajectories.list [{overlap} tags]"] = lambda i, tag_sets=tag_sets: (
+            trajectories.list(TrajectoryFilters(tags=tag_sets[i % len(tag_sets)]))
+        )
+    return cases
+
+
+def measure(engine: Engine, call: Callable[[int], Any], repetitions: int) -> dict[str, float]:
+    """Latencias (ms), sentencias SQL por llamada y pico de memoria (KiB)."""
+    call(0)
+    timings = []
+    with count_statements(engine) as statements:
+        for i in range(repetitions):
+            start = time.perf_counter()
+            call(i)
+            timings.append((time.perf_counter() - start) * 1000)
+    percentiles = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+
+    tracemalloc.start()
+    try:
+        for i in range(min(repetitions, 5)):
+            call(i)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentiles[49], 3),
+        "p95_ms": round(percentiles[94], 3),
+        "p99_ms": round(percentiles[98], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "statements": round(len(statements) / repetitions, 2),
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def git_commit() -> str | None:
+    """Commit actual, para identificar la corrida."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Casos cuyo p50 empeoró más que `threshold` respecto de la corrida base."""
+    regressions = []
+    for size, cases in results["sizes"].items():
+        for name, current in cases.items():
+            previous = baseline.get("sizes", {}).get(size, {}).get(name)
+            if previous is None or not previous["p50_ms"]:
+                continue
+            ratio = current["p50_ms"] / previous["p50_ms"]
+            line = (
+                f"{size:>8} {name}: p50 {previous['p50_ms']:.2f} -> {current['p50_ms']:.2f} ms "
+                f"({ratio - 1:+.0%}), SQL {previous['statements']} -> {current['statements']}"
+            )
+            print(line)
+            if ratio > 1 + threshold or current["statements"] > previous["statements"]:
+                regressions.append(line)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000], help="Programas por catálogo"
+    )
+    parser.add_argument("--repetitions", type=int, default=30, help="Llamadas por caso")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos")
+    parser.add_argument("--database-url", help="BD existente (no genera datos)")
+    parser.add_argument("--output", help="Archivo JSON donde escribir los resultados")
+    parser.add_argument("--compare", help="JSON de una corrida anterior a comparar")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Empeoramiento de p50 tolerado (0.2 = 20%%)"
+    )
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {
+        "commit": git_commit(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "repetitions": args.repetitions,
+        "sizes": {},
+    }
+    for size in [None] if args.database_url else args.sizes:
+        if size is None:
+            engine = create_engine(args.database_url)
+            db = sessionmaker(bind=engine)()
+            size = db.scalar(select(func.count()).select_from(Program))
+        else:
+            engine, db = build_database(size, args.seed)
+        print(f"\nCatálogo de {size} programas")
+        cases = build_cases(db, args.seed)
+        results["sizes"][str(size)] = {}
+        for name, call in cases.items():
+            result = measure(engine, call, args.repetitions)
+            results["sizes"][str(size)][name] = result
+            print(
+                f"  {name}: p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+                f"p99 {result['p99_ms']:.2f} ms, {result['statements']} SQL, "
+                f"pico {result['peak_memory_kib']:.0f} KiB"
+            )
+        db.close()
+        engine.dispose()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+        print(f"\nResultados escritos en {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f"\nComparación con {args.compare} (commit {baseline.get('commit')})")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresiones")
+            raise SystemExit(1)
+        print("\n✅ Sin regresiones")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark de latencia de la búsqueda de texto.
+
+Por defecto genera un catálogo sintético (100k programas, con
+`scripts.synthetic_data`) en una BD SQLite en memoria y mide el índice en
+memoria. Con `--database-url` mide contra una BD
+existente (p. ej. Postgres con la migración 003 y datos cargados), usando el
+backend que corresponda.
+
+Ejecutar con: python -m benchmarks.search [--programs N] [--database-url URL]
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from scripts.synthetic_data import SyntheticScale, generate
+from src.database import Base
+from src.schemas.search import SearchScope
+from src.services.search_service import SearchService
+from src.services.text_search import search_index_store
+
+QUERIES = {
+    "exacta": "ingenieria sistemas",
+    "frecuente": "licenciatura",
+    "varias palabras": "tecnicatura programacion aplicada",
+    "descripción": "pasantias empresas",
+    "con errores": "ingeneria sistmas informacion",
+}
+
+
+def measure(db: Session, query: str, repetitions: int) -> dict[str, float]:
+    """Latencias (ms) de una búsqueda de programas."""
+    service = SearchService(db)
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        service.search(query, SearchScope.PROGRAMS, limit=20)
+        timings.append((time.perf_counter() - start) * 1000)
+    percentiles = statistics.quantiles(timings, n=100)
+    return {"p50": percentiles[49], "p95": percentiles[94], "p99": percentiles[98]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--programs", type=int, default=100_000, help="Programas sintéticos")
+    parser.add_argument("--repetitions", type=int, default=50, help="Búsquedas por consulta")
+    parser.add_argument("--database-url", help="BD existente (no genera datos)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    if not args.database_url:
+        start = time.perf_counter()
+        scale = SyntheticScale(
+            institutions=max(args.programs // 40, 1),
+            programs=args.programs,
+            trajectories=args.programs // 10,
+            profiles=0,
+        )
+        generate(db, scale)
+        print(
+            f"Catálogo sintético: {args.programs} programas en {time.perf_counter() - start:.1f} s"
+        )
+
+    backend = SearchService(db).backend
+    if backend != "postgres":
+        start = time.perf_counter()
+        search_index_store.get(db)
+        print(f"Índice en memoria construido en {time.perf_counter() - start:.2f} s")
+
+    print(f"Backend: {backend}")
+    for name, query in QUERIES.items():
+        result = SearchService(db).search(query, SearchScope.PROGRAMS, limit=20)
+        latency = measure(db, query, args.repetitions)
+        print(
+            f"{name:>16} ({query!r}): p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+            f"p99 {latency['p99']:.2f} ms, {len(result.programs)} resultados"
+            f"{' (aproximada)' if result.fuzzy else ''}"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark del costo de serializar las respuestas más grandes.
+
+Compara, con el mismo payload ya validado, el camino por defecto de FastAPI
+(revalidar contra `response_model` y serializar) con retornar `ModelResponse`,
+y el caso de una recomendación servida desde el cache, cuyo ranking ya está
+serializado. Mide el tiempo de CPU por request llamando a la app ASGI
+directamente, sin cliente HTTP de por medio.
+
+Ejecutar con: python -m benchmarks.serialization [--requests N]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from fastapi import FastAPI
+from pydantic import BaseModel, TypeAdapter
+
+from src.responses import ModelResponse
+from src.schemas.programs import ProgramListResponse
+from src.schemas.recommendations import RecommendationResponse, RecommendedProgram
+
+
+def program_list_payload(items: int = 100) -> ProgramListResponse:
+    """Página de programas del tamaño máximo permitido."""
+    return ProgramListResponse(
+        items=[
+            {
+                "id": uuid.uuid4(),
+                "name": f"Tecnicatura en Programación {i}",
+                "type": "technical",
+                "duration_years": 2.5,
+                "modality": "hybrid",
+                "weekly_hours": 20,
+                "shift": "evening",
+                "area": "technology",
+                "work_compatible": True,
+                "institution": {
+                    "id": uuid.uuid4(),
+                    "name": "Universidad Tecnológica Nacional",
+                    "short_name": "UTN",
+                },
+            }
+            for i in range(items)
+        ],
+        total=items,
+        page=1,
+        per_page=items,
+        pages=1,
+    )
+
+
+def recommendation_payload(programs: int = 50) -> RecommendationResponse:
+    """Recomendación con el límite máximo de programas."""
+    return RecommendationResponse(
+        id=uuid.uuid4(),
+        profile_id=uuid.uuid4(),
+        created_at=datetime.now(UTC),
+        programs=[
+            {
+                "program_id": program_id,
+                "program": {
+                    "id": program_id,
+                    "name": f"Licenciatura en Enfermería {i}",
+                    "institution": {"id": uuid.uuid4(), "name": "UNC", "short_name": "UNC"},
+                },
+                "score": 0.8,
+                "reasons": [
+                    {
+                        "factor": factor,
+                        "description": "Coincide con tus intereses y tu provincia",
+                        "weight": 0.25,
+                        "contribution": 0.2,
+                    }
+                    for factor in ("interest", "location", "modality", "work")
+                ],
+                "matched_trajectories": [
+                    {"id": uuid.uuid4(), "title": "Estudié y trabajé", "match_reason": "Trabaja"}
+                    for _ in range(3)
+                ],
+            }
+            for i, program_id in enumerate(uuid.uuid4() for _ in range(programs))
+        ],
+    )
+
+
+def build_app(payload: BaseModel, fast: bool) -> FastAPI:
+    """App mínima que sirve el payload por el camino por defecto o el rápido."""
+    app = FastAPI()
+
+    if fast:
+
+        @app.get("/", response_model=type(payload), response_class=ModelResponse)
+        async def fast_endpoint() -> ModelResponse:
+            return ModelResponse(payload)
+
+    else:
+
+        @app.get("/", response_model=type(payload))
+        async def default_endpoint() -> BaseModel:
+            return payload
+
+    return app
+
+
+async def _request(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        pass
+
+    await app(scope, receive, send)
+
+
+def cpu_per_request(app: FastAPI, requests: int) -> float:
+    """Tiempo de CPU promedio por request, en milisegundos."""
+
+    async def run() -> float:
+        await _request(app)
+        start = time.process_time()
+        for _ in range(requests):
+            await _request(app)
+        return (time.process_time() - start) / requests * 1000
+
+    return asyncio.run(run())
+
+
+def cached_recommendation_payload() -> RecommendationResponse:
+    """Recomendación servida desde el cache, con el ranking ya serializado."""
+    payload = recommendation_payload()
+    adapter = TypeAdapter(list[RecommendedProgram])
+    payload.set_serialized("programs", adapter.dump_json(payload.programs))
+    return payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500, help="Requests por caso")
+    args = parser.parse_args()
+
+    cases: dict[str, Callable[[], BaseModel]] = {
+        "ProgramListResponse (100 items)": program_list_payload,
+        "RecommendationResponse (50 programas)": recommendation_payload,
+        "RecommendationResponse desde el cache": cached_recommendation_payload,
+    }
+    for name, build in cases.items():
+        payload = build()
+        default = cpu_per_request(build_app(payload, fast=False), args.requests)
+        fast = cpu_per_request(build_app(payload, fast=True), args.requests)
+        print(
+            f"{name}: por defecto {default:.3f} ms, ModelResponse {fast:.3f} ms "
+            f"(ahorro {default - fast:.3f} ms, {1 - fast / default:.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
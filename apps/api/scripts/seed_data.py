@@ -2,6 +2,8 @@
 Script para poblar la base de datos con datos iniciales.
 
 Ejecutar con: python -m scripts.seed_data
+
+Para cargar un catálogo grande (pruebas de carga) usar `scripts.synthetic_data`.
 """
 
 import uuid
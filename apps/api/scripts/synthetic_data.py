@@ -0,0 +1,440 @@
+"""
+Generador de datos sintéticos a escala para pruebas de carga.
+
+Complementa a `seed_data` (pocos datos reales escritos a mano) con un
+catálogo paramétrico de 10k a 1M filas con distribuciones realistas:
+
+- Instituciones repartidas por provincia según la población.
+- Programas con área, tipo y modalidad ponderados, y duración, carga
+  horaria y turno coherentes con el tipo.
+- Trayectorias concentradas en los programas más populares (Zipf), con
+  tags y contexto consistentes con el resultado.
+- Perfiles con intereses, provincia y disponibilidad.
+
+Las filas se generan por lotes y se escriben con COPY en Postgres (psycopg2)
+o con INSERT de varias filas en otras bases.
+
+Ejecutar con: python -m scripts.synthetic_data --programs 100000 [--profiles 50000]
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import time
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.models.trajectory import Trajectory
+
+# Provincias ponderadas por población (millones de habitantes, aprox.)
+PROVINCES = {
+    "Buenos Aires": 17.5,
+    "Ciudad Autónoma de Buenos Aires": 3.1,
+    "Córdoba": 3.8,
+    "Santa Fe": 3.5,
+    "Mendoza": 2.0,
+    "Tucumán": 1.7,
+    "Entre Ríos": 1.4,
+    "Salta": 1.4,
+    "Misiones": 1.3,
+    "Chaco": 1.1,
+    "Corrientes": 1.2,
+    "Santiago del Estero": 1.1,
+    "San Juan": 0.8,
+    "Jujuy": 0.8,
+    "Río Negro": 0.8,
+    "Neuquén": 0.7,
+    "Formosa": 0.6,
+    "Chubut": 0.6,
+    "San Luis": 0.5,
+    "Catamarca": 0.4,
+    "La Rioja": 0.4,
+    "La Pampa": 0.4,
+    "Santa Cruz": 0.3,
+    "Tierra del Fuego": 0.2,
+}
+
+INSTITUTION_TYPES = {"institute": 0.6, "university": 0.3, "other": 0.1}
+INSTITUTION_NAMES = {
+    "university": "Universidad",
+    "institute": "Instituto Superior",
+    "other": "Centro de Formación",
+}
+
+# Áreas: peso relativo y carreras típicas
+AREAS = {
+    "technology": (
+        0.14,
+        ("Sistemas de Información", "Programación", "Ciencia de Datos", "Redes"),
+    ),
+    "health": (0.14, ("Enfermería", "Kinesiología", "Nutrición", "Instrumentación Quirúrgica")),
+    "business": (0.12, ("Administración de Empresas", "Comercio Exterior", "Contabilidad")),
+    "education": (0.12, ("Educación Inicial", "Matemática", "Lengua y Literatura")),
+    "engineering": (0.08, ("Electrónica", "Mecatrónica", "Construcciones", "Industrial")),
+    "social_sciences": (0.08, ("Trabajo Social", "Psicología Social", "Ciencia Política")),
+    "arts": (0.06, ("Diseño Gráfico", "Música Popular", "Artes Visuales")),
+    "communication": (0.05, ("Periodismo", "Comunicación Social", "Publicidad")),
+    "exact_sciences": (0.04, ("Física", "Química", "Biotecnología")),
+    "law": (0.04, ("Abogacía", "Escribanía", "Relaciones del Trabajo")),
+    "agriculture": (0.05, ("Producción Agropecuaria", "Enología", "Agronomía")),
+    "trades": (0.08, ("Gastronomía", "Electricidad Domiciliaria", "Mecánica Automotriz")),
+}
+
+# Tipo: peso, prefijos del nombre, rango de duración (años) y de horas semanales
+PROGRAM_TYPES = {
+    "degree": (0.45, ("Licenciatura en", "Ingeniería en", "Profesorado de"), (4, 6), (20, 35)),
+    "technical": (0.35, ("Tecnicatura Superior en", "Tecnicatura en"), (2, 3), (12, 25)),
+    "course": (0.20, ("Diplomatura en", "Curso de"), (0.5, 1), (4, 12)),
+}
+QUALIFIERS = ("", "", "", " Aplicada", " Industrial", " con orientación Regional")
+MODALITIES = {"in_person": 0.6, "hybrid": 0.25, "remote": 0.15}
+SHIFTS = {"morning": 0.35, "afternoon": 0.2, "evening": 0.35, "flexible": 0.1}
+DESCRIPTIONS = (
+    "Formación práctica con pasantías en empresas de la región.",
+    "Cursado vespertino pensado para quienes trabajan.",
+    "Incluye talleres de investigación y trabajo de campo.",
+    "Título intermedio al finalizar el segundo año.",
+    "Articulación con institutos terciarios de la provincia.",
+    "Prácticas profesionales supervisadas desde el primer año.",
+)
+
+OUTCOMES = {"completed": 0.45, "in_progress": 0.30, "switched": 0.15, "dropped": 0.10}
+TAGS = {
+    "first_generation": 0.45,
+    "worked_full_time": 0.35,
+    "career_change": 0.15,
+    "moved_cities": 0.15,
+    "scholarship": 0.2,
+    "remote_learning": 0.1,
+}
+TITLES = {
+    "completed": "Me recibí de {program} {detail}",
+    "in_progress": "Estoy cursando {program} {detail}",
+    "switched": "Empecé {program} y me cambié de carrera",
+    "dropped": "Dejé {program}: lo que aprendí",
+}
+DETAILS = ("trabajando de noche", "con dos hijos", "lejos de casa", "con beca", "a distancia")
+STORY_SENTENCES = (
+    "Los primeros meses fueron durísimos y pensé en abandonar.",
+    "Encontrar un grupo de estudio fue clave para seguir.",
+    "Trabajaba de día y cursaba de noche, llegaba a casa destruido.",
+    "Los ayudantes de cátedra me salvaron en las materias más difíciles.",
+    "La beca me permitió dejar un trabajo y dedicarme a estudiar.",
+    "Me mudé de ciudad y tuve que aprender a vivir solo.",
+    "Las prácticas en empresas me abrieron la puerta al primer trabajo.",
+    "Cursar a distancia me dio flexibilidad, pero exige mucha disciplina.",
+)
+
+WORK_OPTIONS = {"yes": 0.45, "no": 0.35, "maybe": 0.2}
+PREFERRED_MODALITIES = {"in_person": 0.4, "hybrid": 0.25, "remote": 0.15, "no_preference": 0.2}
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    """Cantidad de filas a generar por tabla."""
+
+    institutions: int
+    programs: int
+    trajectories: int
+    profiles: int
+
+    @classmethod
+    def for_programs(cls, programs: int) -> "SyntheticScale":
+        """Escala con las proporciones habituales para una cantidad de programas."""
+        return cls(
+            institutions=max(programs // 40, 1),
+            programs=programs,
+            trajectories=programs * 2,
+            profiles=programs,
+        )
+
+
+class _Weighted:
+    """Muestreo ponderado con pesos acumulados precalculados."""
+
+    def __init__(self, weights: dict[str, float]):
+        self.values = list(weights)
+        total = 0.0
+        self.cumulative = []
+        for weight in weights.values():
+            total += weight
+            self.cumulative.append(total)
+
+    def pick(self, rng: random.Random) -> str:
+        return rng.choices(self.values, cum_weights=self.cumulative)[0]
+
+
+class SyntheticCatalog:
+    """Genera las filas de cada tabla como diccionarios, en lotes."""
+
+    def __init__(self, scale: SyntheticScale, seed: int = 42, batch_size: int = 5000):
+        self.scale = scale
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.now = datetime.now(UTC)
+        self._provinces = _Weighted(PROVINCES)
+        self._areas = _Weighted({area: weight for area, (weight, _) in AREAS.items()})
+        self._types = _Weighted({kind: spec[0] for kind, spec in PROGRAM_TYPES.items()})
+        self._modalities = _Weighted(MODALITIES)
+        self._shifts = _Weighted(SHIFTS)
+        self._outcomes = _Weighted(OUTCOMES)
+        self._work = _Weighted(WORK_OPTIONS)
+        self._preferred = _Weighted(PREFERRED_MODALITIES)
+        # Datos de las filas ya generadas que necesitan las tablas siguientes
+        self._institutions: list[tuple[uuid.UUID, str]] = []
+        self._programs: list[tuple[uuid.UUID, str, str, str]] = []
+
+    def _id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _created_at(self, max_days: int = 3 * 365) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randrange(max_days * 86400))
+
+    def _batched(self, rows: Iterator[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+        batch: list[dict[str, Any]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def institutions(self) -> Iterator[list[dict[str, Any]]]:
+        """Instituciones por provincia según la población."""
+
+        def rows() -> Iterator[dict[str, Any]]:
+            types = _Weighted(INSTITUTION_TYPES)
+            for i in range(self.scale.institutions):
+                kind = types.pick(self.rng)
+                province = self._provinces.pick(self.rng)
+                institution_id = self._id()
+                self._institutions.append((institution_id, province))
+                yield {
+                    "id": institution_id,
+                    "created_at": self._created_at(),
+                    "name": f"{INSTITUTION_NAMES[kind]} N° {i + 1} de {province}",
+                    "short_name": f"I{i + 1}",
+                    "type": kind,
+                    "province": province,
+                    "city": None,
+                    "website": None,
+                    "is_public": self.rng.random() < 0.7,
+                }
+
+        return self._batched(rows())
+
+    def programs(self) -> Iterator[list[dict[str, Any]]]:
+        """Programas con atributos coherentes con su tipo."""
+
+        def rows() -> Iterator[dict[str, Any]]:
+            rng = self.rng
+            for _ in range(self.scale.programs):
+                area = self._areas.pick(rng)
+                kind = self._types.pick(rng)
+                _, prefixes, (min_years, max_years), (min_hours, max_hours) = PROGRAM_TYPES[kind]
+                modality = self._modalities.pick(rng)
+                shift = "flexible" if modality == "remote" else self._shifts.pick(rng)
+                institution_id, _ = rng.choice(self._institutions)
+                name = (
+                    f"{rng.choice(prefixes)} {rng.choice(AREAS[area][1])}{rng.choice(QUALIFIERS)}"
+                )
+                program_id = self._id()
+                self._programs.append((program_id, name, area, modality))
+                yield {
+                    "id": program_id,
+                    "created_at": self._created_at(),
+                    "institution_id": institution_id,
+                    "name": name,
+                    "type": kind,
+                    "duration_years": round(rng.uniform(min_years, max_years) * 2) / 2,
+                    "modality": modality,
+                    "weekly_hours": rng.randint(min_hours, max_hours),
+                    "shift": shift,
+                    "area": area,
+                    "work_compatible": shift in ("evening", "flexible") or modality == "remote",
+                    "description": rng.choice(DESCRIPTIONS),
+                    "requirements": None,
+                }
+
+        return self._batched(rows())
+
+    def trajectories(self) -> Iterator[list[dict[str, Any]]]:
+        """Trayectorias concentradas en los programas populares."""
+
+        def rows() -> Iterator[dict[str, Any]]:
+            rng = self.rng
+            if not self._programs:
+                return
+            # Popularidad tipo Zipf: el programa i tiene peso 1 / (i + 1)
+            cumulative = []
+            total = 0.0
+            for rank in range(len(self._programs)):
+                total += 1 / (rank + 1)
+                cumulative.append(total)
+            popular = rng.sample(self._programs, len(self._programs))
+            for _ in range(self.scale.trajectories):
+                _, program, _, modality = choice = rng.choices(popular, cum_weights=cumulative)[0]
+                outcome = self._outcomes.pick(rng)
+                tags = [tag for tag, probability in TAGS.items() if rng.random() < probability]
+                if modality == "remote" and "remote_learning" not in tags:
+                    tags.append("remote_learning")
+                worked = "worked_full_time" in tags or rng.random() < 0.3
+                yield {
+                    "id": self._id(),
+                    "created_at": self._created_at(),
+                    "program_id": choice[0],
+                    "title": TITLES[outcome].format(program=program, detail=rng.choice(DETAILS))[
+                        :200
+                    ],
+                    "summary": " ".join(rng.sample(STORY_SENTENCES, 2)),
+                    "story": " ".join(rng.sample(STORY_SENTENCES, rng.randint(3, 6))),
+                    "challenges": rng.choice(STORY_SENTENCES),
+                    "alternatives": None,
+                    "outcome": outcome,
+                    "tags": tags,
+                    "context": {
+                        "worked_while_studying": worked,
+                        "province": self._provinces.pick(rng),
+                        "modality": modality,
+                    },
+                    "year_started": rng.randint(2010, 2025),
+                    "is_verified": rng.random() < 0.8,
+                }
+
+        return self._batched(rows())
+
+    def profiles(self) -> Iterator[list[dict[str, Any]]]:
+        """Perfiles de estudiantes con 1 a 3 áreas de interés."""
+
+        def rows() -> Iterator[dict[str, Any]]:
+            rng = self.rng
+            for _ in range(self.scale.profiles):
+                interests = {self._areas.pick(rng) for _ in range(rng.randint(1, 3))}
+                works = self._work.pick(rng)
+                yield {
+                    "id": self._id(),
+                    "created_at": self._created_at(365),
+                    "province": self._provinces.pick(rng),
+                    "locality": None,
+                    "works_while_studying": works,
+                    "preferred_modality": self._preferred.pick(rng),
+                    "max_weekly_hours": rng.choice((10, 15, 20, 25, 30, 40))
+                    if works != "no"
+                    else None,
+                    "has_technical_degree": rng.random() < 0.25,
+                    "interest_areas": sorted(interests),
+                }
+
+        return self._batched(rows())
+
+
+def _copy_value(value: Any) -> Any:
+    """Valor en el formato CSV que espera COPY de Postgres."""
+    if isinstance(value, list):
+        return "{" + ",".join(value) + "}"
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def write_batches(db: Session, model: type, batches: Iterator[list[dict[str, Any]]]) -> int:
+    """
+    Escribe lotes de filas en la tabla del modelo.
+
+    Usa COPY con psycopg2 y, en otras bases, un INSERT de varias filas por
+    lote. Retorna la cantidad de filas escritas.
+    """
+    table = model.__table__
+    use_copy = db.get_bind().dialect.driver == "psycopg2"
+    written = 0
+    for batch in batches:
+        if use_copy:
+            columns = list(batch[0])
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in batch:
+                writer.writerow([_copy_value(row[column]) for column in columns])
+            buffer.seek(0)
+            cursor = db.connection().connection.dbapi_connection.cursor()
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        else:
+            db.execute(insert(table), batch)
+        written += len(batch)
+    return written
+
+
+def generate(
+    db: Session,
+    scale: SyntheticScale,
+    seed: int = 42,
+    batch_size: int = 5000,
+) -> dict[str, int]:
+    """Genera y escribe el catálogo sintético; retorna las filas por tabla."""
+    catalog = SyntheticCatalog(scale, seed=seed, batch_size=batch_size)
+    counts: dict[str, int] = {}
+    for model, batches in (
+        (Institution, catalog.institutions()),
+        (Program, catalog.programs()),
+        (Trajectory, catalog.trajectories()),
+        (Profile, catalog.profiles()),
+    ):
+        start = time.perf_counter()
+        counts[model.__tablename__] = write_batches(db, model, batches)
+        db.commit()
+        print(
+            f"    ✓ {counts[model.__tablename__]} {model.__tablename__} "
+            f"en {time.perf_counter() - start:.1f} s"
+        )
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos a escala.")
+    parser.add_argument("--programs", type=int, default=10_000, help="Cantidad de programas")
+    parser.add_argument("--institutions", type=int, help="Por defecto, programas / 40")
+    parser.add_argument("--trajectories", type=int, help="Por defecto, programas × 2")
+    parser.add_argument("--profiles", type=int, help="Por defecto, igual a programas")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Filas por lote")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (datos reproducibles)")
+    args = parser.parse_args()
+
+    defaults = SyntheticScale.for_programs(args.programs)
+    scale = SyntheticScale(
+        institutions=args.institutions or defaults.institutions,
+        programs=args.programs,
+        trajectories=defaults.trajectories if args.trajectories is None else args.trajectories,
+        profiles=defaults.profiles if args.profiles is None else args.profiles,
+    )
+    print(f"Generando datos sintéticos: {scale}")
+    db = SessionLocal()
+    try:
+        generate(db, scale, seed=args.seed, batch_size=args.batch_size)
+        print("\n✅ Datos sintéticos generados")
+    except Exception as e:
+        db.rollback()
+        print(f"\n❌ Error generando datos: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,76 @@
 """
 Configuración de la base de datos.
 
-Usa SQLAlchemy 2.0 con patrón async-compatible.
+Usa SQLAlchemy 2.0 con patrón async-compatible. El engine sincrónico está
+siempre disponible (scripts, procesos de fondo, lotes); con
+`DATABASE_ASYNC=true` los endpoints usan además un engine async (asyncpg).
 """
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
+from fastapi import Depends
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from src.config import get_settings
+from src.db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
 settings = get_settings()
 
+# Drivers async equivalentes a cada backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def _timeout_settings() -> dict[str, str]:
+    """Parámetros de sesión de Postgres para los timeouts configurados."""
+    timeouts = {
+        "statement_timeout": settings.db_statement_timeout_ms,
+        "lock_timeout": settings.db_lock_timeout_ms,
+    }
+    return {name: str(value) for name, value in timeouts.items() if value is not None}
+
+
+def engine_options(url: str) -> dict[str, Any]:
+    """Opciones de `create_engine` / `create_async_engine` según la configuración."""
+    parsed = make_url(url)
+    options: dict[str, Any] = {
+        "echo": settings.debug,  # Log SQL queries en desarrollo
+        "pool_pre_ping": settings.db_pool_pre_ping,  # Verificar conexión antes de usar
+    }
+    if parsed.get_backend_name() == "sqlite":
+        return options
+
+    is_async = parsed.get_driver_name() == "asyncpg"
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    if timeouts := _timeout_settings():
+        if is_async:
+            options["connect_args"] = {"server_settings": timeouts}
+        else:
+            options["connect_args"] = {
+                "options": " ".join(f"-c {name}={value}" for name, value in timeouts.items())
+            }
+    return options
+
+
 # Crear engine de SQLAlchemy
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug,  # Log SQL queries en desarrollo
-    pool_pre_ping=True,  # Verificar conexión antes de usar
-)
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
 
 # Crear session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -27,6 +79,27 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def async_database_url(url: str) -> str:
+    """Adapta una URL de BD a su driver async (p. ej. psycopg2 → asyncpg)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No hay driver async para '{parsed.get_backend_name()}'")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+# El engine async solo se crea si está habilitado (requiere asyncpg)
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+if settings.database_async:
+    _async_url = async_database_url(settings.database_url)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency que provee una sesión de base de datos.
@@ -41,3 +114,20 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency que provee una sesión async de base de datos."""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("El engine async no está habilitado (DATABASE_ASYNC)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _get_sync_session(db: Session = Depends(get_db)) -> Session:
+    return db
+
+
+# Sesión de los endpoints async según la configuración: una AsyncSession o,
+# en modo sincrónico, la sesión de `get_db` (los servicios corren en el threadpool)
+get_session = get_async_db if settings.database_async else _get_sync_session
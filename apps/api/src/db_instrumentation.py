@@ -0,0 +1,127 @@
+"""
+Instrumentación de las sentencias SQL.
+
+Los eventos `before_cursor_execute` / `after_cursor_execute` de SQLAlchemy
+miden cada sentencia de cualquier engine (sincrónico, async o de tests):
+
+- Dentro de un request, se acumulan en su `QueryStats` (cantidad, tiempo
+  total y la sentencia más lenta); el middleware `SQLTimingMiddleware` los
+  publica en `Server-Timing` y en el log.
+- Las sentencias que superan `slow_query_threshold_ms` se registran en el
+  log normalizadas (sin literales ni listas de parámetros), para agrupar
+  las que solo difieren en los valores.
+
+El estado del request viaja en una ContextVar, que se copia al threadpool y
+a `run_sync`, así que también cubre a los servicios sincrónicos.
+"""
+
+import logging
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import get_settings
+from src.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+# Duración de todas las sentencias (también fuera de requests)
+statement_duration = registry.histogram(
+    "db_statement_duration_seconds", "Duración de las sentencias SQL."
+)
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Sentencias ejecutadas durante un request."""
+
+    statements: int = 0
+    duration: float = 0.0  # segundos
+    slowest_duration: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, duration: float) -> None:
+        """Suma una sentencia ejecutada."""
+        self.statements += 1
+        self.duration += duration
+        if duration > self.slowest_duration:
+            self.slowest_duration = duration
+            self.slowest_statement = statement
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Acumula en un `QueryStats` las sentencias ejecutadas en el bloque."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Forma canónica de una sentencia para agrupar los logs.
+
+    Reemplaza literales y parámetros por `?` y colapsa las listas (`IN (?, ?)`).
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    return _LIST.sub("(?...)", normalized)
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    # Las sentencias de una conexión son secuenciales: basta un valor
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany):
+    start = conn.info.pop("query_start", None)
+    if start is None:
+        return
+    duration = time.perf_counter() - start
+    statement_duration.observe(duration)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    if duration * 1000 >= slow_query_threshold_ms:
+        normalized = normalize_sql(statement)
+        logger.warning(
+            "slow_query duration_ms=%.1f statement=%s",
+            duration * 1000,
+            normalized,
+            extra={"duration_ms": round(duration * 1000, 1), "statement": normalized},
+        )
+
+
+def install() -> None:
+    """Registra los eventos en todos los engines (idempotente)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+settings = get_settings()
+
+slow_query_threshold_ms = settings.slow_query_threshold_ms
+
+if settings.sql_instrumentation:
+    install()
@@ -0,0 +1,85 @@
+"""
+Pool de conexiones instrumentado.
+
+Mide cuánto se espera para obtener una conexión del pool y cuántas veces se
+agota el `pool_timeout`, además de exponer el estado del pool (conexiones
+en uso, overflow) para el endpoint interno de métricas.
+"""
+
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from src.metrics import Counter, Histogram
+
+T = TypeVar("T")
+
+
+class PoolMetrics:
+    """Tiempo de espera por conexión y timeouts de un pool."""
+
+    def __init__(self) -> None:
+        self.wait_time = Histogram()
+        self.timeouts = Counter()
+
+    def timed_checkout(self, checkout: Callable[[], T]) -> T:
+        """Ejecuta `checkout` registrando la espera (y el timeout, si ocurre)."""
+        start = time.perf_counter()
+        try:
+            return checkout()
+        except exc.TimeoutError:
+            self.timeouts.inc()
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+
+class _InstrumentedPool(QueuePool):
+    """Mide las esperas al obtener conexiones del pool."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> QueuePool:
+        # `engine.dispose()` recrea el pool: las métricas se conservan
+        pool = super().recreate()
+        pool.metrics = self.metrics  # type: ignore[attr-defined]
+        return pool
+
+    def _do_get(self):
+        return self.metrics.timed_checkout(super()._do_get)
+
+
+class InstrumentedQueuePool(_InstrumentedPool):
+    """QueuePool instrumentado (engine sincrónico)."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool instrumentado (engine async)."""
+
+
+def pool_status(pool: Pool | Engine) -> dict[str, Any]:
+    """Estado actual de un pool (o del pool de un engine)."""
+    if isinstance(pool, Engine):
+        pool = pool.pool
+    status: dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    metrics = getattr(pool, "metrics", None)
+    if isinstance(metrics, PoolMetrics):
+        status.update(
+            checkout_timeouts=int(metrics.timeouts.value),
+            checkout_wait_seconds=metrics.wait_time.snapshot(),
+        )
+    return status
@@ -6,12 +6,34 @@ from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from typing import Any
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
 
 from src import __version__
 from src.config import get_settings
-from src.routers import feedback, profiles, programs, recommendations, trajectories
+from src.database import async_engine, get_db
+from src.metrics import registry
+from src.middleware.http_cache import CatalogHTTPCacheMiddleware, catalog_response_cache
+from src.middleware.metrics import RequestMetricsMiddleware
+from src.middleware.sql_timing import SQLTimingMiddleware
+from src.routers import (
+    feedback,
+    internal,
+    profiles,
+    programs,
+    recommendations,
+    search,
+    trajectories,
+)
+from src.services.bulk_scoring import bulk_scorer
+from src.services.catalog import catalog_store
+from src.services.catalog_snapshot import shared_catalog
+from src.services.catalog_sync import catalog_watcher
+from src.services.feedback_writer import feedback_writer
+from src.services.recommendation_writer import recommendation_writer
+from src.services.warmup import Warmup, check_database
 
 settings = get_settings()
 
@@ -21,9 +43,40 @@ async def lifespan(app: FastAPI):
     """Maneja el ciclo de vida de la aplicación."""
     # Startup
     print(f"🚀 Starting {settings.project_name} v{__version__}")
+    # Los workers comparten el catálogo compilado de cada versión de la BD
+    if settings.catalog_shared_snapshot:
+        catalog_store.loader = shared_catalog.load
+    # Invalida el catálogo local ante cambios hechos por otros workers
+    if settings.catalog_sync_enabled:
+        catalog_watcher.start()
+    # Pool, catálogo y una recomendación sintética en segundo plano; /ready
+    # reporta la instancia como lista al terminar. Usa la misma dependencia
+    # de sesión que los endpoints (respetando overrides).
+    app.state.warmup = Warmup(
+        session_factory=app.dependency_overrides.get(get_db, get_db),
+        pool_size=settings.db_pool_size,
+        retry_interval=settings.warmup_retry_interval,
+    )
+    app.state.warmup.start()
+    if settings.recommendation_write_behind:
+        recommendation_writer.start()
+    if settings.feedback_write_behind:
+        feedback_writer.start()
     yield
     # Shutdown
     print("👋 Shutting down...")
+    app.state.warmup.stop()
+    if settings.catalog_sync_enabled:
+        catalog_watcher.stop()
+    if settings.recommendation_write_behind:
+        # Drena las recomendaciones pendientes antes de salir
+        recommendation_writer.stop()
+    if settings.feedback_write_behind:
+        # Drena el feedback aceptado (202) antes de salir
+        feedback_writer.stop()
+    bulk_scorer.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 app = FastAPI(
@@ -36,6 +89,17 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Cache HTTP (ETag/Last-Modified y respuestas renderizadas) del catálogo
+app.add_middleware(
+    CatalogHTTPCacheMiddleware,
+    paths=(
+        f"{settings.api_v1_prefix}/programs",
+        f"{settings.api_v1_prefix}/trajectories",
+    ),
+    max_age=settings.catalog_http_max_age,
+    cache=catalog_response_cache,
+)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -45,14 +109,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Sentencias SQL por request (Server-Timing y log); el más externo, para
+# medir también las respuestas servidas por el cache HTTP
+if settings.sql_instrumentation:
+    app.add_middleware(SQLTimingMiddleware)
+
+# Latencia y requests en curso por ruta (endpoint /metrics)
+if settings.metrics_enabled:
+    app.add_middleware(RequestMetricsMiddleware)
+
 
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 def health_check() -> dict[str, Any]:
     """
-    Endpoint de health check.
+    Endpoint de health check (liveness).
 
-    Retorna el estado de la API y metadatos básicos.
+    Retorna el estado de la API y metadatos básicos, sin consultar
+    dependencias; para saber si la instancia puede recibir tráfico ver /ready.
     """
     return {
         "status": "healthy",
@@ -62,6 +136,43 @@ def health_check() -> dict[str, Any]:
     }
 
 
+@app.get("/ready", tags=["Health"])
+def readiness_check(response: Response, db: Session = Depends(get_db)) -> dict[str, Any]:
+    """
+    Endpoint de readiness para el balanceador.
+
+    Verifica la conexión con la BD y que haya terminado el warmup; si no,
+    responde 503. Informa además el estado del snapshot del catálogo.
+    """
+    database = check_database(db)
+    warmup: Warmup | None = getattr(app.state, "warmup", None)
+    catalog = catalog_store.current
+    ready = database["ok"] and warmup is not None and warmup.ready
+    response.status_code = 200 if ready else 503
+    return {
+        "status": "ready" if ready else "not_ready",
+        "checks": {
+            "database": database,
+            "catalog": {
+                "loaded": catalog is not None,
+                "stale": catalog_store.is_stale,
+                "programs": len(catalog) if catalog is not None else 0,
+                "version": catalog.version if catalog is not None else None,
+                "db_version": catalog_store.db_version,
+                "shared": shared_catalog.path is not None,
+            },
+            "warmup": warmup.snapshot() if warmup is not None else None,
+        },
+    }
+
+
+# Métricas en formato Prometheus
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def prometheus_metrics() -> PlainTextResponse:
+    """Métricas de la API en el formato de texto de Prometheus."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 # Registrar routers
 app.include_router(
     profiles.router,
@@ -93,6 +204,14 @@ app.include_router(
     tags=["Feedback"],
 )
 
+app.include_router(
+    search.router,
+    prefix=f"{settings.api_v1_prefix}/search",
+    tags=["Search"],
+)
+
+app.include_router(internal.router, prefix="/internal")
+
 
 # Root endpoint
 @app.get("/", tags=["Root"])
@@ -0,0 +1,247 @@
+"""
+Primitivas de métricas en proceso.
+
+Los contadores, gauges e histogramas se acumulan en un fragmento por hilo:
+cada hilo solo escribe el suyo, así que registrar una observación no toma
+locks. Al leerlos se suman todos los fragmentos.
+
+`Family` agrupa métricas por etiquetas (p. ej. una por ruta) y `Registry`
+las expone en el formato de texto de Prometheus.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, Generic, TypeVar
+
+# Buckets de latencia en segundos (de 1 ms a 10 s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Sharded:
+    """Base para métricas con un fragmento de estado por hilo."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: list[Any] = []
+        self._register_lock = threading.Lock()
+
+    def _new_shard(self) -> Any:
+        raise NotImplementedError
+
+    def _shard(self) -> Any:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._new_shard()
+            self._local.shard = shard
+            # Solo la primera observación de cada hilo toma el lock
+            with self._register_lock:
+                self._shards.append(shard)
+        return shard
+
+
+class Counter(_Sharded):
+    """Contador monótono."""
+
+    def _new_shard(self) -> list[float]:
+        return [0.0]
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Incrementa el contador."""
+        self._shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        """Valor total del contador."""
+        return sum(shard[0] for shard in list(self._shards))
+
+
+class Gauge(_Sharded):
+    """Valor que sube y baja (p. ej. requests en curso)."""
+
+    def _new_shard(self) -> list[float]:
+        return [0.0]
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Incrementa el valor."""
+        self._shard()[0] += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrementa el valor (puede ser desde otro hilo que el `inc`)."""
+        self._shard()[0] -= amount
+
+    @property
+    def value(self) -> float:
+        """Valor actual."""
+        return sum(shard[0] for shard in list(self._shards))
+
+
+class Histogram(_Sharded):
+    """Histograma de buckets fijos (límites superiores inclusivos)."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__()
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_shard(self) -> list[float]:
+        # Un contador por bucket, uno para +Inf y la suma de los valores
+        return [0.0] * (len(self.buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        """Registra una observación."""
+        shard = self._shard()
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observa la duración del bloque, en segundos."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Conteos acumulados por bucket, total y suma."""
+        totals = [0.0] * (len(self.buckets) + 2)
+        for shard in list(self._shards):
+            for i, value in enumerate(shard):
+                totals[i] += value
+        cumulative: dict[str, int] = {}
+        running = 0
+        for bound, count in zip((*self.buckets, "+Inf"), totals[:-1], strict=True):
+            running += int(count)
+            cumulative[str(bound)] = running
+        return {"buckets": cumulative, "count": running, "sum": totals[-1]}
+
+
+M = TypeVar("M", Counter, Gauge, Histogram)
+
+# Muestra de una métrica calculada al exportar: (etiquetas, valor)
+Sample = tuple[dict[str, str], float]
+
+
+class Family(Generic[M]):
+    """Métricas del mismo tipo distinguidas por valores de etiquetas."""
+
+    def __init__(self, factory: Callable[[], M], label_names: tuple[str, ...]):
+        self.factory = factory
+        self.label_names = label_names
+        self._children: dict[tuple[str, ...], M] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> M:
+        """Métrica de una combinación de etiquetas (se crea la primera vez)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self.factory())
+        return child
+
+    def children(self) -> list[tuple[dict[str, str], M]]:
+        """Métricas existentes con sus etiquetas."""
+        return [
+            (dict(zip(self.label_names, values, strict=True)), child)
+            for values, child in list(self._children.items())
+        ]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# Lo que guarda el registro: una métrica, una familia o un callback
+Metric = Counter | Gauge | Histogram | Family | Callable[[], Iterable[Sample]]
+
+
+class Registry:
+    """Métricas registradas por nombre, exportables en formato Prometheus."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, tuple[str, str, Metric]] = {}
+
+    def register(self, name: str, help: str, metric: Counter | Gauge | Histogram | Family) -> None:
+        """Registra una métrica (o familia) ya creada."""
+        sample = metric.factory() if isinstance(metric, Family) else metric
+        kind = {Counter: "counter", Gauge: "gauge", Histogram: "histogram"}[type(sample)]
+        self._metrics[name] = (kind, help, metric)
+
+    def register_callback(
+        self, name: str, help: str, callback: Callable[[], Iterable[Sample]], kind: str = "gauge"
+    ) -> None:
+        """Registra una métrica calculada al exportar (estado de pools, caches)."""
+        self._metrics[name] = (kind, help, callback)
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Any:
+        """Crea y registra un contador (o una familia si tiene etiquetas)."""
+        metric = Family(Counter, labels) if labels else Counter()
+        self.register(name, help, metric)
+        return metric
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Any:
+        """Crea y registra un gauge (o una familia si tiene etiquetas)."""
+        metric = Family(Gauge, labels) if labels else Gauge()
+        self.register(name, help, metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Any:
+        """Crea y registra un histograma (o una familia si tiene etiquetas)."""
+        metric = Family(lambda: Histogram(buckets), labels) if labels else Histogram(buckets)
+        self.register(name, help, metric)
+        return metric
+
+    def render(self) -> str:
+        """Todas las métricas en el formato de texto de Prometheus (0.0.4)."""
+        lines: list[str] = []
+        for name, (kind, help, metric) in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if isinstance(metric, Family):
+                series = metric.children()
+            elif callable(metric):
+                series = list(metric())
+            else:
+                series = [({}, metric)]
+            for labels, value in series:
+                lines.extend(self._render_series(name, labels, value))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_series(name: str, labels: dict[str, str], value: Any) -> list[str]:
+        if isinstance(value, Histogram):
+            snapshot = value.snapshot()
+            lines = [
+                f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}"
+                for bound, count in snapshot["buckets"].items()
+            ]
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(snapshot['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+            return lines
+        if isinstance(value, Counter | Gauge):
+            value = value.value
+        return [f"{name}{_format_labels(labels)} {_format_value(value)}"]
+
+
+# Registro global que expone el endpoint /metrics
+registry = Registry()
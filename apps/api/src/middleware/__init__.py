@@ -0,0 +1,3 @@
+"""
+Middlewares ASGI de la aplicación.
+"""
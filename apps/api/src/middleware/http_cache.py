@@ -0,0 +1,210 @@
+"""
+Cache HTTP de los endpoints del catálogo.
+
+Programas y trayectorias cambian poco. Sus respuestas se etiquetan con la
+generación del catálogo (`ETag`/`Last-Modified`) y un `Cache-Control`
+público, de modo que navegadores y CDN puedan reutilizarlas:
+
+- `If-None-Match` (o `If-Modified-Since`) vigente → 304. La etiqueta es la
+  de todo el catálogo, así que solo se responde 304 sin tocar la BD si la
+  URL ya está en el cache de respuestas (es decir, ya respondió 200); si
+  no, el endpoint valida primero (404/422 siguen siendo 404/422) y el 304
+  se decide a la salida.
+- Los bytes JSON ya renderizados se guardan en un LRU por ruta, query
+  normalizada y generación; un cambio en el catálogo lo vacía.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import UTC
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import get_settings
+from src.services.catalog import catalog_store
+
+# Clave: (ruta, query normalizada, etag)
+ResponseKey = tuple[str, str, str]
+# Valor: (headers de la respuesta, cuerpo)
+RenderedResponse = tuple[list[tuple[bytes, bytes]], bytes]
+
+
+def catalog_etag() -> str:
+    """ETag débil de la generación actual del catálogo."""
+    return f'W/"{catalog_store.etag_version}"'
+
+
+def _normalize_query(query_string: bytes) -> str:
+    """Query string con los parámetros ordenados (mismo filtro, misma clave)."""
+    return urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparación débil de ETags (RFC 9110, sección 13.1.2)."""
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in (
+        tag.removeprefix("W/") for tag in candidates
+    )
+
+
+class RenderedResponseCache:
+    """LRU acotado de respuestas JSON ya renderizadas."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[ResponseKey, RenderedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: ResponseKey) -> RenderedResponse | None:
+        """Retorna la respuesta guardada o None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: ResponseKey, response: RenderedResponse) -> None:
+        """Guarda una respuesta, desalojando las menos usadas."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Descarta todas las respuestas."""
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Estado actual del cache."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class CatalogHTTPCacheMiddleware:
+    """Validación condicional y cache de respuestas para rutas del catálogo."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: tuple[str, ...],
+        max_age: int,
+        cache: RenderedResponseCache | None = None,
+    ):
+        self.app = app
+        self.paths = paths
+        self.cache_control = f"public, max-age={max_age}".encode()
+        self.cache = cache
+
+    def _applies(self, scope: Scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return False
+        path = scope["path"]
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self._applies(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # La etiqueta se toma antes de leer: si el catálogo cambia mientras
+        # tanto, la respuesta queda asociada a la generación anterior
+        etag = catalog_etag()
+        last_modified = formatdate(catalog_store.changed_at.timestamp(), usegmt=True)
+        cache_headers = [
+            (b"etag", etag.encode()),
+            (b"last-modified", last_modified.encode()),
+            (b"cache-control", self.cache_control),
+        ]
+
+        not_modified = self._not_modified(Headers(scope=scope), etag)
+        key = (scope["path"], _normalize_query(scope["query_string"]), etag)
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            if not_modified:
+                await self._send_not_modified(send, cache_headers)
+                return
+            headers, body = cached
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": headers + cache_headers}
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        status = 0
+        headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if status == 200:
+                    headers = list(message.get("headers", []))
+                    if not_modified:
+                        # El cuerpo se guarda en el cache pero no se envía
+                        return
+                    message["headers"] = headers + cache_headers
+            elif message["type"] == "http.response.body" and status == 200:
+                chunks.append(message.get("body", b""))
+                done = not message.get("more_body", False)
+                if done and self.cache is not None:
+                    self.cache.put(key, (headers, b"".join(chunks)))
+                if not_modified:
+                    if done:
+                        await self._send_not_modified(send, cache_headers)
+                    return
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    async def _send_not_modified(send: Send, cache_headers: list[tuple[bytes, bytes]]) -> None:
+        await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    def _not_modified(self, headers: Headers, etag: str) -> bool:
+        """True si la copia del cliente sigue vigente."""
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, etag)
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=UTC)
+            # Last-Modified tiene resolución de segundos
+            return catalog_store.changed_at.replace(microsecond=0) <= since
+        return False
+
+
+settings = get_settings()
+
+catalog_response_cache = RenderedResponseCache(maxsize=settings.catalog_response_cache_size)
+
+# Un cambio en el catálogo vuelve obsoletas todas las respuestas guardadas
+catalog_store.add_listener(catalog_response_cache.clear)
@@ -0,0 +1,76 @@
+"""
+Métricas HTTP por ruta.
+
+Registra por cada request su duración y su resultado, etiquetados por la
+plantilla de la ruta (`/api/v1/programs/{program_id}`, no la URL concreta)
+para acotar la cantidad de series, y la cantidad de requests en curso.
+Las rutas inexistentes se agrupan en `unmatched`.
+
+Las métricas usan las primitivas de `src.metrics` (un fragmento por hilo),
+así que el camino de un request no toma locks salvo la primera vez que
+aparece una combinación de etiquetas.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.metrics import registry
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "Requests HTTP por método, ruta y código de estado.",
+    labels=("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Duración de los requests HTTP por método y ruta.",
+    labels=("method", "route"),
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "Requests HTTP en curso.")
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Plantilla de la ruta que atendió el request, o `unmatched`.
+
+    Los routers incluidos resuelven una ruta relativa a su prefijo (p. ej.
+    `/{program_id}`); el prefijo se toma de los primeros segmentos del path.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    prefix = scope["path"].rsplit("/", template.count("/"))[0] if template else scope["path"]
+    return prefix + template
+
+
+class RequestMetricsMiddleware:
+    """Latencia, conteo y requests en curso por plantilla de ruta."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+        http_requests_in_flight.inc()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # El router completa `scope["route"]` al resolver el endpoint
+            route = route_template(scope)
+            method = scope["method"]
+            http_request_duration.labels(method, route).observe(time.perf_counter() - start)
+            http_requests.labels(method, route, str(status)).inc()
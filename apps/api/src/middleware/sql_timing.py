@@ -0,0 +1,78 @@
+"""
+Tiempos de base de datos por request.
+
+Acumula las sentencias SQL de cada request (ver `src.db_instrumentation`) y
+las publica:
+
+- En el header `Server-Timing` (visible en las devtools del navegador):
+  `db` con el tiempo total y la cantidad de sentencias, `db-slowest` con la
+  más lenta y `app` con la duración total del request.
+- En una línea de log estructurada por request (`key=value`, y los mismos
+  campos en `extra` para handlers JSON).
+
+Una cantidad de sentencias que crece con el tamaño de la respuesta delata
+un N+1.
+"""
+
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.db_instrumentation import QueryStats, normalize_sql, track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class SQLTimingMiddleware:
+    """Server-Timing y log con las sentencias SQL de cada request."""
+
+    def __init__(self, app: ASGIApp, log_requests: bool = True):
+        self.app = app
+        self.log_requests = log_requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 0
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    elapsed = (time.perf_counter() - start) * 1000
+                    timing = (
+                        f'db;dur={stats.duration * 1000:.1f};desc="{stats.statements} queries", '
+                        f"db-slowest;dur={stats.slowest_duration * 1000:.1f}, "
+                        f"app;dur={elapsed:.1f}"
+                    )
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", timing.encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if self.log_requests and logger.isEnabledFor(logging.INFO):
+                    self._log(scope, status, start, stats)
+
+    def _log(self, scope: Scope, status: int, start: float, stats: QueryStats) -> None:
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "db_statements": stats.statements,
+            "db_ms": round(stats.duration * 1000, 1),
+            "db_slowest_ms": round(stats.slowest_duration * 1000, 1),
+        }
+        message = " ".join(f"{key}={value}" for key, value in fields.items())
+        if stats.slowest_statement is not None:
+            fields["db_slowest_statement"] = normalize_sql(stats.slowest_statement)
+        logger.info("request %s", message, extra=fields)
@@ -2,6 +2,7 @@
 Modelos SQLAlchemy para la base de datos.
 """
 
+from src.models.catalog_version import CatalogVersion
 from src.models.feedback import Feedback
 from src.models.institution import Institution
 from src.models.profile import Profile
@@ -16,4 +17,5 @@ __all__ = [
     "Trajectory",
     "Recommendation",
     "Feedback",
+    "CatalogVersion",
 ]
@@ -7,11 +7,24 @@ from datetime import UTC, datetime
 
 from sqlalchemy import DateTime
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.database import Base
 
 
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(_type: UUID, _compiler: object, **_kw: object) -> str:
+    """
+    UUID como CHAR(32) en SQLite.
+
+    Con el nombre UUID la columna toma afinidad NUMERIC y SQLite convierte a
+    número los hex que lo parecen (p. ej. '1234...e56'); CHAR(32) los guarda
+    como texto.
+    """
+    return "CHAR(32)"
+
+
 class TimestampMixin:
     """Mixin para agregar timestamps automáticos."""
 
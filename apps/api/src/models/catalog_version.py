@@ -0,0 +1,95 @@
+"""
+Modelo de la versión del catálogo.
+
+Una sola fila cuyo contador incrementan los triggers de `institutions`,
+`programs` y `trajectories` en cada cambio. Todos los workers leen la misma
+versión, así que la usan para invalidar sus snapshots locales y como ETag.
+En Postgres el trigger además notifica la nueva versión por el canal
+`catalog_changed` (ver `src.services.catalog_sync`).
+
+Los triggers los crea la migración 004 y, para las BD creadas con
+`create_all` (SQLite, tests), los DDL de este módulo.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DDL, BigInteger, DateTime, SmallInteger, event, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+# Tablas cuyos cambios avanzan la versión del catálogo
+CATALOG_TABLES = ("institutions", "programs", "trajectories")
+
+# Canal de LISTEN/NOTIFY; el payload es "<versión>,<epoch del cambio>"
+NOTIFY_CHANNEL = "catalog_changed"
+
+POSTGRES_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    new_version bigint;
+    changed_at timestamptz;
+BEGIN
+    UPDATE catalog_version SET version = version + 1, updated_at = now()
+    WHERE id = 1
+    RETURNING version, updated_at INTO new_version, changed_at;
+    PERFORM pg_notify('{NOTIFY_CHANNEL}', new_version || ',' || extract(epoch FROM changed_at));
+    RETURN NULL;
+END
+$$
+"""
+
+
+def postgres_trigger(table: str) -> str:
+    """Trigger por sentencia (no por fila) que avanza la versión."""
+    return (
+        f"CREATE OR REPLACE TRIGGER {table}_catalog_version "
+        f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version()"
+    )
+
+
+def sqlite_triggers(table: str) -> list[str]:
+    """Triggers equivalentes en SQLite (solo existen por fila)."""
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_catalog_version_{operation.lower()} "
+        f"AFTER {operation} ON {table} BEGIN "
+        "UPDATE catalog_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP "
+        "WHERE id = 1; END"
+        for operation in ("INSERT", "UPDATE", "DELETE")
+    ]
+
+
+class CatalogVersion(Base):
+    """Versión global del catálogo (fila única con id = 1)."""
+
+    __tablename__ = "catalog_version"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=1)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<CatalogVersion(version={self.version})>"
+
+
+# La fila y los triggers se crean después de todas las tablas; `create_all`
+# puede correr sobre una BD ya creada, así que todo es idempotente
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL("INSERT INTO catalog_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING"),
+)
+for _table in CATALOG_TABLES:
+    for _statement in sqlite_triggers(_table):
+        event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Base.metadata, "after_create", DDL(POSTGRES_FUNCTION).execute_if(dialect="postgresql"))
+for _table in CATALOG_TABLES:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(postgres_trigger(_table)).execute_if(dialect="postgresql"),
+    )
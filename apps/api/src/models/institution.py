@@ -2,7 +2,7 @@
 Modelo de institución educativa.
 """
 
-from sqlalchemy import Boolean, String
+from sqlalchemy import Boolean, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import BaseModel
@@ -12,6 +12,7 @@ class Institution(BaseModel):
     """Institución educativa (universidad, instituto, etc.)."""
 
     __tablename__ = "institutions"
+    __table_args__ = (Index("idx_institutions_province", "province"),)
 
     name: Mapped[str] = mapped_column(String(300), nullable=False)
     short_name: Mapped[str | None] = mapped_column(String(50), nullable=True)
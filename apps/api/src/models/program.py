@@ -4,7 +4,7 @@ Modelo de programa educativo.
 
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -15,6 +15,13 @@ class Program(BaseModel):
     """Programa educativo (carrera, tecnicatura, curso)."""
 
     __tablename__ = "programs"
+    __table_args__ = (
+        # Filtros combinados del listado (area, modality, type) y sus prefijos
+        Index("idx_programs_area_modality_type", "area", "modality", "type"),
+        Index("idx_programs_type", "type"),
+        Index("idx_programs_modality", "modality"),
+        Index("idx_programs_institution", "institution_id"),
+    )
 
     institution_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("institutions.id"), nullable=False
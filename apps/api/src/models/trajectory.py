@@ -4,7 +4,7 @@ Modelo de trayectoria de estudiante.
 
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, JSON
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text, JSON, text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -15,6 +15,17 @@ class Trajectory(BaseModel):
     """Historia/trayectoria de un estudiante (anonimizada)."""
 
     __tablename__ = "trajectories"
+    __table_args__ = (
+        # Listados y motor solo leen trayectorias verificadas
+        Index(
+            "idx_trajectories_verified_program",
+            "program_id",
+            postgresql_where=text("is_verified"),
+            sqlite_where=text("is_verified = 1"),
+        ),
+        Index("idx_trajectories_outcome", "outcome"),
+        Index("idx_trajectories_tags", "tags", postgresql_using="gin"),
+    )
 
     program_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("programs.id"), nullable=True
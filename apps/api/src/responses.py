@@ -0,0 +1,30 @@
+"""
+Respuestas JSON de modelos ya validados.
+
+Si un endpoint retorna un modelo, FastAPI lo vuelve a validar contra
+`response_model` antes de serializarlo. Los servicios ya construyen (y
+validan) los schemas de respuesta, así que los endpoints retornan
+`ModelResponse`: FastAPI no la procesa y el modelo se serializa a bytes una
+única vez con pydantic-core, reutilizando los fragmentos ya serializados de
+los `PreSerializedSchema` (p. ej. rankings servidos desde el cache).
+
+`response_model` se mantiene en los decoradores para la documentación.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.schemas.base import PreSerializedSchema
+
+
+class ModelResponse(JSONResponse):
+    """JSONResponse que serializa modelos pydantic directamente a bytes."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, PreSerializedSchema):
+            return content.render_json()
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
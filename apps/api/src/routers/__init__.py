@@ -2,6 +2,22 @@
 Routers de la API.
 """
 
-from src.routers import feedback, profiles, programs, recommendations, trajectories
+from src.routers import (
+    feedback,
+    internal,
+    profiles,
+    programs,
+    recommendations,
+    search,
+    trajectories,
+)
 
-__all__ = ["profiles", "programs", "trajectories", "recommendations", "feedback"]
+__all__ = [
+    "profiles",
+    "programs",
+    "trajectories",
+    "recommendations",
+    "feedback",
+    "search",
+    "internal",
+]
@@ -2,12 +2,14 @@
 Router para feedback de usuarios.
 """
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.database import get_db
+from src.database import get_session
+from src.responses import ModelResponse
 from src.schemas.feedback import FeedbackCreate, FeedbackResponse
-from src.services.feedback_service import FeedbackService
+from src.services.feedback_service import AsyncFeedbackService
 
 router = APIRouter()
 
@@ -15,15 +17,22 @@ router = APIRouter()
 @router.post(
     "",
     response_model=FeedbackResponse,
-    status_code=status.HTTP_201_CREATED,
+    response_class=ModelResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Enviar feedback",
-    description="Envía feedback sobre una recomendación, trayectoria o programa.",
+    description=(
+        "Envía feedback sobre una recomendación, trayectoria o programa. "
+        "Se acepta con un ID generado de antemano y se persiste en lotes."
+    ),
 )
-def create_feedback(
+async def create_feedback(
     data: FeedbackCreate,
-    db: Session = Depends(get_db),
-) -> FeedbackResponse:
-    """Crea un nuevo feedback."""
-    service = FeedbackService(db)
-    feedback = service.create(data)
-    return feedback
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
+    """Acepta un feedback para persistirlo."""
+    service = AsyncFeedbackService(db)
+    try:
+        feedback = await service.create(data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    return ModelResponse(feedback, status_code=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,128 @@
+"""
+Router interno de métricas operativas.
+
+No forma parte de la API pública: se monta fuera de `/api/v1` y no figura
+en el esquema OpenAPI.
+
+También registra en `src.metrics.registry` el estado de los pools y de los
+caches, que el endpoint `/metrics` exporta en formato Prometheus.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import APIRouter
+
+from src.database import async_engine, engine
+from src.db_pool import PoolMetrics, pool_status
+from src.metrics import Sample, registry
+from src.middleware.http_cache import catalog_response_cache
+from src.services.factor_cache import profile_factor_cache
+from src.services.feedback_writer import feedback_writer
+from src.services.recommendation_cache import recommendation_cache
+
+router = APIRouter(include_in_schema=False)
+
+
+def _pools() -> dict[str, dict[str, Any]]:
+    """Estado de los pools de conexiones por engine."""
+    pools = {"sync": pool_status(engine)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.sync_engine)
+    return pools
+
+
+def _pool_samples(field: str) -> Callable[[], list[Sample]]:
+    return lambda: [
+        ({"pool": name}, status[field]) for name, status in _pools().items() if field in status
+    ]
+
+
+def _pool_wait_samples() -> list[tuple[dict[str, str], Any]]:
+    pools = {"sync": engine.pool}
+    if async_engine is not None:
+        pools["async"] = async_engine.sync_engine.pool
+    samples: list[tuple[dict[str, str], Any]] = []
+    for name, pool in pools.items():
+        metrics = getattr(pool, "metrics", None)
+        if isinstance(metrics, PoolMetrics):
+            samples.append(({"pool": name}, metrics.wait_time))
+    return samples
+
+
+def _cache_samples() -> list[tuple[str, int, int, int]]:
+    """(cache, aciertos, fallos, entradas) de cada cache."""
+    return [
+        (
+            "recommendations",
+            recommendation_cache.stats.hits,
+            recommendation_cache.stats.misses,
+            len(recommendation_cache),
+        ),
+        (
+            "catalog_responses",
+            catalog_response_cache.hits,
+            catalog_response_cache.misses,
+            len(catalog_response_cache),
+        ),
+    ]
+
+
+def _cache_ratio_samples() -> list[Sample]:
+    return [
+        ({"cache": name}, hits / (hits + misses) if hits + misses else 0.0)
+        for name, hits, misses, _ in _cache_samples()
+    ]
+
+
+for field, help in (
+    ("size", "Conexiones persistentes del pool."),
+    ("checked_out", "Conexiones del pool en uso."),
+    ("overflow", "Conexiones de overflow abiertas."),
+):
+    registry.register_callback(f"db_pool_{field}", help, _pool_samples(field))
+registry.register_callback(
+    "db_pool_checkout_timeouts_total",
+    "Veces que se agotó el pool_timeout esperando una conexión.",
+    _pool_samples("checkout_timeouts"),
+    kind="counter",
+)
+registry.register_callback(
+    "db_pool_checkout_wait_seconds",
+    "Espera para obtener una conexión del pool.",
+    _pool_wait_samples,
+    kind="histogram",
+)
+registry.register_callback(
+    "cache_requests_total",
+    "Consultas a los caches por resultado.",
+    lambda: [
+        sample
+        for name, hits, misses, _ in _cache_samples()
+        for sample in (
+            ({"cache": name, "result": "hit"}, hits),
+            ({"cache": name, "result": "miss"}, misses),
+        )
+    ],
+    kind="counter",
+)
+registry.register_callback(
+    "cache_hit_ratio", "Proporción de aciertos de cada cache.", _cache_ratio_samples
+)
+registry.register_callback(
+    "cache_entries",
+    "Entradas guardadas en cada cache.",
+    lambda: [({"cache": name}, entries) for name, _, _, entries in _cache_samples()],
+)
+
+
+@router.get("/metrics")
+def get_metrics() -> dict[str, Any]:
+    """Estado de los pools de conexiones y de los caches."""
+    return {
+        "pools": _pools(),
+        "recommendation_cache": recommendation_cache.snapshot(),
+        "catalog_response_cache": catalog_response_cache.snapshot(),
+        "profile_factor_cache": profile_factor_cache.snapshot(),
+        "feedback_writer": feedback_writer.snapshot(),
+    }
@@ -5,11 +5,13 @@ Router para perfiles de estudiantes.
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.database import get_db
+from src.database import get_session
+from src.responses import ModelResponse
 from src.schemas.profiles import ProfileCreate, ProfileResponse, ProfileUpdate
-from src.services.profile_service import ProfileService
+from src.services.profile_service import AsyncProfileService
 
 router = APIRouter()
 
@@ -17,58 +19,61 @@ router = APIRouter()
 @router.post(
     "",
     response_model=ProfileResponse,
+    response_class=ModelResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Crear perfil",
     description="Crea un nuevo perfil de estudiante.",
 )
-def create_profile(
+async def create_profile(
     profile_data: ProfileCreate,
-    db: Session = Depends(get_db),
-) -> ProfileResponse:
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
     """Crea un nuevo perfil de estudiante."""
-    service = ProfileService(db)
-    profile = service.create(profile_data)
-    return profile
+    service = AsyncProfileService(db)
+    profile = await service.create(profile_data)
+    return ModelResponse(profile, status_code=status.HTTP_201_CREATED)
 
 
 @router.get(
     "/{profile_id}",
     response_model=ProfileResponse,
+    response_class=ModelResponse,
     summary="Obtener perfil",
     description="Obtiene un perfil por su ID.",
 )
-def get_profile(
+async def get_profile(
     profile_id: UUID,
-    db: Session = Depends(get_db),
-) -> ProfileResponse:
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
     """Obtiene un perfil por ID."""
-    service = ProfileService(db)
-    profile = service.get_by_id(profile_id)
+    service = AsyncProfileService(db)
+    profile = await service.get_by_id(profile_id)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Perfil no encontrado",
         )
-    return profile
+    return ModelResponse(profile)
 
 
 @router.patch(
     "/{profile_id}",
     response_model=ProfileResponse,
+    response_class=ModelResponse,
     summary="Actualizar perfil",
     description="Actualiza parcialmente un perfil existente.",
 )
-def update_profile(
+async def update_profile(
     profile_id: UUID,
     profile_data: ProfileUpdate,
-    db: Session = Depends(get_db),
-) -> ProfileResponse:
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
     """Actualiza un perfil existente."""
-    service = ProfileService(db)
-    profile = service.update(profile_id, profile_data)
+    service = AsyncProfileService(db)
+    profile = await service.update(profile_id, profile_data)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Perfil no encontrado",
         )
-    return profile
+    return ModelResponse(profile)
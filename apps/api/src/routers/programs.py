@@ -5,11 +5,13 @@ Router para programas educativos.
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.database import get_db
+from src.database import get_session
+from src.responses import ModelResponse
 from src.schemas.programs import ProgramFilters, ProgramListResponse, ProgramResponse
-from src.services.program_service import ProgramService
+from src.services.program_service import AsyncProgramService
 
 router = APIRouter()
 
@@ -17,10 +19,11 @@ router = APIRouter()
 @router.get(
     "",
     response_model=ProgramListResponse,
+    response_class=ModelResponse,
     summary="Listar programas",
     description="Lista programas educativos con filtros opcionales.",
 )
-def list_programs(
+async def list_programs(
     area: str | None = Query(None, description="Filtrar por área de conocimiento"),
     program_type: str | None = Query(None, alias="type", description="Tipo de programa"),
     modality: str | None = Query(None, description="Modalidad de cursado"),
@@ -29,8 +32,17 @@ def list_programs(
     max_duration: float | None = Query(None, description="Duración máxima en años"),
     page: int = Query(1, ge=1, description="Número de página"),
     per_page: int = Query(20, ge=1, le=100, description="Items por página"),
-    db: Session = Depends(get_db),
-) -> ProgramListResponse:
+    cursor: str | None = Query(
+        None, description="Cursor de la página siguiente (`next_cursor`); reemplaza a `page`"
+    ),
+    include_total: bool | None = Query(
+        None, description="Calcular el total (por defecto solo sin cursor)"
+    ),
+    estimate_total: bool = Query(
+        False, description="Estimar el total con las estadísticas de la BD en lugar de contar"
+    ),
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
     """Lista programas con filtros y paginación."""
     filters = ProgramFilters(
         area=area,
@@ -40,26 +52,41 @@ def list_programs(
         work_compatible=work_compatible,
         max_duration=max_duration,
     )
-    service = ProgramService(db)
-    return service.list(filters=filters, page=page, per_page=per_page)
+    service = AsyncProgramService(db)
+    try:
+        result = await service.list(
+            filters=filters,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+            estimate_total=estimate_total,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+    return ModelResponse(result)
 
 
 @router.get(
     "/{program_id}",
     response_model=ProgramResponse,
+    response_class=ModelResponse,
     summary="Obtener programa",
     description="Obtiene el detalle de un programa por su ID.",
 )
-def get_program(
+async def get_program(
     program_id: UUID,
-    db: Session = Depends(get_db),
-) -> ProgramResponse:
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
     """Obtiene un programa por ID."""
-    service = ProgramService(db)
-    program = service.get_by_id(program_id)
+    service = AsyncProgramService(db)
+    program = await service.get_by_id(program_id)
     if not program:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Programa no encontrado",
         )
-    return program
+    return ModelResponse(program)
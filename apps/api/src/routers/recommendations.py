@@ -2,17 +2,24 @@
 Router para recomendaciones.
 """
 
+from collections.abc import Iterator
+from contextlib import contextmanager
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.database import get_db
+from src.config import get_settings
+from src.database import get_db, get_session
+from src.responses import ModelResponse
 from src.schemas.recommendations import (
+    BulkRecommendationCreate,
     RecommendationCreate,
     RecommendationResponse,
 )
-from src.services.recommendation_service import RecommendationService
+from src.services.recommendation_service import AsyncRecommendationService, RecommendationService
 
 router = APIRouter()
 
@@ -20,19 +27,20 @@ router = APIRouter()
 @router.post(
     "",
     response_model=RecommendationResponse,
+    response_class=ModelResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Generar recomendaciones",
     description="Genera recomendaciones de programas para un perfil.",
 )
-def create_recommendation(
+async def create_recommendation(
     data: RecommendationCreate,
-    db: Session = Depends(get_db),
-) -> RecommendationResponse:
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
     """Genera recomendaciones para un perfil."""
-    service = RecommendationService(db)
+    service = AsyncRecommendationService(db)
     try:
-        recommendation = service.generate(data.profile_id, data.limit)
-        return recommendation
+        recommendation = await service.generate(data.profile_id, data.limit)
+        return ModelResponse(recommendation, status_code=status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,22 +48,56 @@ def create_recommendation(
         )
 
 
+@router.post(
+    "/bulk",
+    response_class=StreamingResponse,
+    summary="Generar recomendaciones en lote",
+    description=(
+        "Genera recomendaciones para un lote de perfiles (existentes o nuevos) "
+        "y las devuelve como NDJSON, una línea por perfil a medida que se completan."
+    ),
+)
+def create_bulk_recommendations(
+    data: BulkRecommendationCreate, request: Request
+) -> StreamingResponse:
+    """Genera recomendaciones para un lote de perfiles."""
+    max_profiles = get_settings().bulk_max_profiles
+    if len(data.profile_ids) + len(data.profiles) > max_profiles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El lote no puede superar los {max_profiles} perfiles",
+        )
+
+    # Trabajo de CPU emitido en streaming: usa una sesión sincrónica propia
+    # del stream, que se cierra al terminar (o al cortarse) la respuesta
+    session_factory = contextmanager(request.app.dependency_overrides.get(get_db, get_db))
+
+    def stream() -> Iterator[str]:
+        with session_factory() as db:
+            service = RecommendationService(db)
+            for result in service.generate_bulk(data.profile_ids, data.profiles, data.limit):
+                yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.get(
     "/{recommendation_id}",
     response_model=RecommendationResponse,
+    response_class=ModelResponse,
     summary="Obtener recomendación",
     description="Obtiene una recomendación guardada por su ID.",
 )
-def get_recommendation(
+async def get_recommendation(
     recommendation_id: UUID,
-    db: Session = Depends(get_db),
-) -> RecommendationResponse:
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
     """Obtiene una recomendación por ID."""
-    service = RecommendationService(db)
-    recommendation = service.get_by_id(recommendation_id)
+    service = AsyncRecommendationService(db)
+    recommendation = await service.get_by_id(recommendation_id)
     if not recommendation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recomendación no encontrada",
         )
-    return recommendation
+    return ModelResponse(recommendation)
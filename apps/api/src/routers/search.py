@@ -0,0 +1,37 @@
+"""
+Router para la búsqueda de texto.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.database import get_session
+from src.responses import ModelResponse
+from src.schemas.search import SearchResponse, SearchScope
+from src.services.search_service import AsyncSearchService
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    response_model=SearchResponse,
+    response_class=ModelResponse,
+    summary="Buscar",
+    description=(
+        "Busca programas (por nombre y descripción) y trayectorias (por título, "
+        "resumen e historia), sin distinguir acentos y ordenados por relevancia. "
+        "Si no hay programas que contengan todas las palabras, los busca por "
+        "similitud del nombre."
+    ),
+)
+async def search(
+    q: str = Query(..., min_length=2, max_length=200, description="Texto a buscar"),
+    scope: SearchScope = Query(SearchScope.ALL, description="Dónde buscar"),
+    limit: int = Query(20, ge=1, le=100, description="Resultados máximos por tipo"),
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
+    """Busca programas y trayectorias por texto libre."""
+    service = AsyncSearchService(db)
+    return ModelResponse(await service.search(q, scope, limit))
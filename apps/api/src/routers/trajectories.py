@@ -5,15 +5,17 @@ Router para trayectorias de estudiantes.
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.database import get_db
+from src.database import get_session
+from src.responses import ModelResponse
 from src.schemas.trajectories import (
     TrajectoryFilters,
     TrajectoryListResponse,
     TrajectoryResponse,
 )
-from src.services.trajectory_service import TrajectoryService
+from src.services.trajectory_service import AsyncTrajectoryService
 
 router = APIRouter()
 
@@ -21,43 +23,68 @@ router = APIRouter()
 @router.get(
     "",
     response_model=TrajectoryListResponse,
+    response_class=ModelResponse,
     summary="Listar trayectorias",
     description="Lista trayectorias de estudiantes con filtros opcionales.",
 )
-def list_trajectories(
+async def list_trajectories(
     tags: str | None = Query(None, description="Tags separados por coma"),
     outcome: str | None = Query(None, description="Resultado de la trayectoria"),
     area: str | None = Query(None, description="Área del programa relacionado"),
     page: int = Query(1, ge=1, description="Número de página"),
     per_page: int = Query(20, ge=1, le=100, description="Items por página"),
-    db: Session = Depends(get_db),
-) -> TrajectoryListResponse:
+    cursor: str | None = Query(
+        None, description="Cursor de la página siguiente (`next_cursor`); reemplaza a `page`"
+    ),
+    include_total: bool | None = Query(
+        None, description="Calcular el total (por defecto solo sin cursor)"
+    ),
+    estimate_total: bool = Query(
+        False, description="Estimar el total con las estadísticas de la BD en lugar de contar"
+    ),
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
     """Lista trayectorias con filtros y paginación."""
     filters = TrajectoryFilters(
         tags=tags.split(",") if tags else None,
         outcome=outcome,
         area=area,
     )
-    service = TrajectoryService(db)
-    return service.list(filters=filters, page=page, per_page=per_page)
+    service = AsyncTrajectoryService(db)
+    try:
+        result = await service.list(
+            filters=filters,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            include_total=include_total,
+            estimate_total=estimate_total,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+    return ModelResponse(result)
 
 
 @router.get(
     "/{trajectory_id}",
     response_model=TrajectoryResponse,
+    response_class=ModelResponse,
     summary="Obtener trayectoria",
     description="Obtiene el detalle completo de una trayectoria.",
 )
-def get_trajectory(
+async def get_trajectory(
     trajectory_id: UUID,
-    db: Session = Depends(get_db),
-) -> TrajectoryResponse:
+    db: AsyncSession | Session = Depends(get_session),
+) -> ModelResponse:
     """Obtiene una trayectoria por ID."""
-    service = TrajectoryService(db)
-    trajectory = service.get_by_id(trajectory_id)
+    service = AsyncTrajectoryService(db)
+    trajectory = await service.get_by_id(trajectory_id)
     if not trajectory:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Trayectoria no encontrada",
         )
-    return trajectory
+    return ModelResponse(trajectory)
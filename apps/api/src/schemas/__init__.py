@@ -14,6 +14,7 @@ from src.schemas.recommendations import (
     RecommendationCreate,
     RecommendationResponse,
 )
+from src.schemas.search import SearchResponse, SearchScope
 from src.schemas.trajectories import (
     TrajectoryFilters,
     TrajectoryListResponse,
@@ -35,4 +36,6 @@ __all__ = [
     "RecommendationResponse",
     "FeedbackCreate",
     "FeedbackResponse",
+    "SearchResponse",
+    "SearchScope",
 ]
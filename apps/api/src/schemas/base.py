@@ -6,7 +6,7 @@ from datetime import datetime
 from enum import Enum
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 
 class BaseSchema(BaseModel):
@@ -18,6 +18,35 @@ class BaseSchema(BaseModel):
     )
 
 
+class PreSerializedSchema(BaseSchema):
+    """
+    Schema que puede llevar el JSON de algunos campos ya serializado.
+
+    `render_json` produce el mismo JSON que `model_dump_json`, pero reutiliza
+    los fragmentos registrados con `set_serialized` en lugar de volver a
+    serializar esos campos. Los campos registrados no deben modificarse.
+    """
+
+    _serialized: dict[str, bytes] = PrivateAttr(default_factory=dict)
+
+    def set_serialized(self, field: str, raw: bytes) -> None:
+        """Registra el JSON ya serializado de un campo."""
+        self._serialized[field] = raw
+
+    def render_json(self) -> bytes:
+        """Serializa el modelo a JSON reutilizando los fragmentos registrados."""
+        # to_json produce bytes directamente, sin pasar por str como model_dump_json
+        serializer = self.__pydantic_serializer__
+        if not self._serialized:
+            return serializer.to_json(self)
+        head = serializer.to_json(self, exclude=set(self._serialized))
+        fields = b",".join(
+            b'"%s":%s' % (name.encode(), raw) for name, raw in self._serialized.items()
+        )
+        separator = b"," if head != b"{}" else b""
+        return head[:-1] + separator + fields + b"}"
+
+
 class TimestampMixin(BaseModel):
     """Mixin para timestamps."""
 
@@ -102,12 +131,19 @@ class InterestArea(str, Enum):
 
 
 class PaginatedResponse(BaseSchema):
-    """Respuesta paginada genérica."""
+    """
+    Respuesta paginada genérica.
+
+    `total` y `pages` solo se informan si se pidió el total; `next_cursor`
+    es el cursor opaco para pedir la página siguiente.
+    """
 
-    total: int
-    page: int
+    total: int | None = None
+    page: int | None = None
     per_page: int
-    pages: int
+    pages: int | None = None
+    total_estimated: bool = False
+    next_cursor: str | None = None
 
 
 class UUIDMixin(BaseModel):
@@ -5,9 +5,10 @@ Schemas para recomendaciones.
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
-from src.schemas.base import BaseSchema
+from src.schemas.base import BaseSchema, PreSerializedSchema
+from src.schemas.profiles import ProfileCreate
 from src.schemas.programs import InstitutionBrief
 
 
@@ -55,10 +56,34 @@ class RecommendationCreate(BaseModel):
     limit: int = Field(10, ge=1, le=50, description="Cantidad máxima de recomendaciones")
 
 
-class RecommendationResponse(BaseSchema):
+class RecommendationResponse(PreSerializedSchema):
     """Respuesta de recomendaciones."""
 
     id: UUID
     profile_id: UUID
     created_at: datetime
     programs: list[RecommendedProgram]
+
+
+class BulkRecommendationCreate(BaseModel):
+    """Schema para solicitar recomendaciones para un lote de perfiles."""
+
+    profile_ids: list[UUID] = Field(default_factory=list, description="IDs de perfiles existentes")
+    profiles: list[ProfileCreate] = Field(
+        default_factory=list, description="Perfiles nuevos a crear y recomendar"
+    )
+    limit: int = Field(10, ge=1, le=50, description="Cantidad máxima de recomendaciones")
+
+    @model_validator(mode="after")
+    def check_not_empty(self) -> "BulkRecommendationCreate":
+        """Valida que el lote tenga al menos un perfil."""
+        if not self.profile_ids and not self.profiles:
+            raise ValueError("Debe indicar profile_ids o profiles")
+        return self
+
+
+class BulkRecommendationError(BaseSchema):
+    """Perfil del lote que no pudo recomendarse."""
+
+    profile_id: UUID
+    error: str
@@ -0,0 +1,44 @@
+"""
+Schemas para la búsqueda de texto.
+"""
+
+from enum import Enum
+
+from pydantic import Field
+
+from src.schemas.base import BaseSchema
+from src.schemas.programs import ProgramBrief
+from src.schemas.trajectories import TrajectoryBrief
+
+
+class SearchScope(str, Enum):
+    """Dónde buscar."""
+
+    ALL = "all"
+    PROGRAMS = "programs"
+    TRAJECTORIES = "trajectories"
+
+
+class ProgramSearchHit(BaseSchema):
+    """Programa encontrado con su relevancia."""
+
+    program: ProgramBrief
+    score: float = Field(..., description="Relevancia (mayor es mejor)")
+
+
+class TrajectorySearchHit(BaseSchema):
+    """Trayectoria encontrada con su relevancia."""
+
+    trajectory: TrajectoryBrief
+    score: float = Field(..., description="Relevancia (mayor es mejor)")
+
+
+class SearchResponse(BaseSchema):
+    """Resultados de una búsqueda, ordenados por relevancia."""
+
+    query: str
+    fuzzy: bool = Field(
+        default=False, description="Los programas se encontraron por similitud (tolerando errores)"
+    )
+    programs: list[ProgramSearchHit] = Field(default_factory=list)
+    trajectories: list[TrajectorySearchHit] = Field(default_factory=list)
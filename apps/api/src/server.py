@@ -0,0 +1,296 @@
+"""
+Servidor multiproceso con precarga (pre-fork).
+
+`uvicorn --workers N` importa la aplicación en cada worker, y cada uno compila
+su catálogo y abre sus conexiones en el primer request. Este runner:
+
+1. Importa la aplicación y calienta el catálogo una sola vez en el proceso
+   principal (el mismo warmup que `/ready`: pool, catálogo y una
+   recomendación sintética).
+2. Cierra las conexiones del proceso principal y congela el GC
+   (`gc.freeze`), para que los objetos precargados no se copien por tocar
+   sus contadores de recolección.
+3. Abre el socket y hace fork de los workers, que heredan el catálogo
+   compilado copy-on-write. Cada worker descarta el pool heredado
+   (`engine.dispose(close=False)`) y abre sus propias conexiones.
+4. Reemplaza los workers que terminan: con `--max-requests` cada worker sale
+   tras atender esa cantidad de requests (más un jitter) y se recicla.
+
+Cada worker informa al quedar listo su tiempo de arranque y su memoria: RSS,
+PSS (la parte proporcional de las páginas compartidas) y memoria privada.
+
+Uso:
+    python -m src.server --workers 16 --max-requests 10000
+"""
+
+import argparse
+import contextlib
+import gc
+import os
+import random
+import resource
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+
+import uvicorn
+
+from src.config import get_settings
+from src.database import engine, get_db
+from src.main import app
+from src.services.catalog import catalog_store
+from src.services.catalog_snapshot import shared_catalog
+from src.services.catalog_sync import catalog_watcher
+from src.services.warmup import Warmup, WarmupStatus
+
+settings = get_settings()
+
+# Si un worker falla al poco de arrancar se espera antes de reemplazarlo
+CRASH_WINDOW = 5.0  # segundos
+CRASH_BACKOFF = 1.0  # segundos
+
+STOP_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+
+
+def memory_usage(pid: int | str = "self") -> dict[str, int]:
+    """
+    Memoria de un proceso en bytes: `rss`, `pss`, `shared` y `private`.
+
+    Usa `/proc/<pid>/smaps_rollup` (Linux); en otros sistemas solo informa el
+    RSS máximo.
+    """
+    rollup = Path(f"/proc/{pid}/smaps_rollup")
+    try:
+        lines = rollup.read_text().splitlines()
+    except OSError:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss está en KiB en Linux y en bytes en macOS
+        return {"rss": maxrss if sys.platform == "darwin" else maxrss * 1024}
+    fields: dict[str, int] = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if value.strip().endswith("kB"):
+            fields[name] = int(value.split()[0]) * 1024
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def format_memory(usage: dict[str, int]) -> str:
+    """Memoria en MiB como `rss=... pss=...`."""
+    return " ".join(f"{name}={value / 2**20:.1f}MiB" for name, value in usage.items())
+
+
+@dataclass
+class WorkerProcess:
+    """Worker lanzado por el proceso principal."""
+
+    pid: int
+    number: int
+    started_at: float
+
+
+class PreforkServer:
+    """Precarga la aplicación y administra los workers forkeados."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        workers: int,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        backlog: int = 2048,
+    ):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.backlog = backlog
+        self.children: dict[int, WorkerProcess] = {}
+        self._socket: socket.socket | None = None
+        self._stopping = False
+
+    def run(self) -> int:
+        """Precarga, lanza los workers y los reemplaza hasta recibir SIGTERM/SIGINT."""
+        self._socket = self._bind()
+        host, port = self._socket.getsockname()[:2]
+        print(f"🚀 Prefork server listening on http://{host}:{port} (pid {os.getpid()})")
+        self.preload()
+
+        for signum in STOP_SIGNALS:
+            signal.signal(signum, self._handle_stop)
+        for number in range(self.workers):
+            self._spawn(number)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            worker = self.children.pop(pid, None)
+            if worker is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            uptime = time.monotonic() - worker.started_at
+            if self._stopping:
+                continue
+            if code == 0:
+                print(f"♻️  Worker {worker.number} (pid {pid}) recycled after {uptime:.0f} s")
+            else:
+                print(f"💥 Worker {worker.number} (pid {pid}) exited with code {code}")
+                if uptime < CRASH_WINDOW:
+                    time.sleep(CRASH_BACKOFF)
+            self._spawn(worker.number)
+        self._socket.close()
+        print("👋 Prefork server stopped")
+        return 0
+
+    def preload(self) -> None:
+        """Calienta catálogo y código en el proceso principal antes del fork."""
+        start = time.perf_counter()
+        # Igual que el lifespan de cada worker
+        if settings.catalog_shared_snapshot:
+            catalog_store.loader = shared_catalog.load
+        if settings.catalog_sync_enabled:
+            # La versión se registra antes de compilar: así los workers no
+            # invalidan el catálogo heredado en su primera verificación
+            catalog_watcher.check()
+        warmup = Warmup(
+            session_factory=get_db,
+            pool_size=settings.db_pool_size,
+            retry_interval=settings.warmup_retry_interval,
+        )
+        if not warmup.run():
+            # Los workers reintentan el warmup por su cuenta
+            print(f"⚠️  Preload failed ({warmup.error}); workers will warm up on their own")
+        # Las conexiones no pueden compartirse entre procesos
+        engine.dispose()
+        gc.collect()
+        gc.freeze()
+        print(
+            f"📦 Preload done in {(time.perf_counter() - start) * 1000:.0f} ms "
+            f"({format_memory(memory_usage())})"
+        )
+
+    def _bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self, number: int) -> None:
+        started_at = time.monotonic()
+        # Lo pendiente en los buffers se imprimiría también desde el hijo
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # Las señales se bloquean durante el fork: el hijo no debe ejecutar
+        # el handler del principal, y un SIGTERM recibido mientras tanto debe
+        # alcanzar también al worker nuevo
+        signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        pid = os.fork()
+        if pid == 0:
+            # El hijo nunca vuelve al loop del proceso principal
+            try:
+                self._serve(number, started_at)
+            except BaseException:
+                traceback.print_exc()
+                os._exit(1)
+            os._exit(0)
+        self.children[pid] = WorkerProcess(pid=pid, number=number, started_at=started_at)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+        if self._stopping:
+            os.kill(pid, signal.SIGTERM)
+
+    def _serve(self, number: int, started_at: float) -> None:
+        """Cuerpo del worker (corre en el proceso hijo)."""
+        for signum in STOP_SIGNALS:
+            signal.signal(signum, signal.SIG_DFL)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+        # Descarta el pool heredado sin cerrar conexiones ajenas (el engine
+        # async no se usa en el proceso principal, no tiene conexiones)
+        engine.dispose(close=False)
+
+        limit = None
+        if self.max_requests > 0:
+            limit = self.max_requests + random.randint(0, self.max_requests_jitter)
+        config = uvicorn.Config(app, lifespan="on", limit_max_requests=limit)
+        server = uvicorn.Server(config)
+        threading.Thread(
+            target=self._report_ready,
+            args=(server, number, started_at),
+            name="worker-report",
+            daemon=True,
+        ).start()
+        assert self._socket is not None
+        server.run(sockets=[self._socket])
+
+    def _report_ready(self, server: uvicorn.Server, number: int, started_at: float) -> None:
+        """Informa tiempo de arranque y memoria cuando el worker queda listo."""
+        while not server.started and not server.should_exit:
+            time.sleep(0.01)
+        warmup: Warmup | None = getattr(app.state, "warmup", None)
+        # Se informa tras el primer intento del warmup, aunque falle
+        while warmup is not None and (
+            warmup.attempts == 0 or warmup.status == WarmupStatus.RUNNING
+        ):
+            time.sleep(0.01)
+        state = "ready" if warmup is None or warmup.ready else f"started (warmup {warmup.error})"
+        print(
+            f"✅ Worker {number} (pid {os.getpid()}) {state} in "
+            f"{(time.monotonic() - started_at) * 1000:.0f} ms ({format_memory(memory_usage())})"
+        )
+
+    def _handle_stop(self, _signum: int, _frame: FrameType | None) -> None:
+        """Detiene los workers (terminan los requests en curso) y luego el principal."""
+        self._stopping = True
+        for pid in self.children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Punto de entrada de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Servidor multiproceso con precarga (pre-fork).")
+    parser.add_argument("--host", default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument(
+        "--workers", type=int, default=settings.server_workers or os.cpu_count() or 1
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=settings.server_max_requests,
+        help="requests por worker antes de reciclarlo (0 no los recicla)",
+    )
+    parser.add_argument(
+        "--max-requests-jitter", type=int, default=settings.server_max_requests_jitter
+    )
+    parser.add_argument("--backlog", type=int, default=settings.server_backlog)
+    args = parser.parse_args(argv)
+    server = PreforkServer(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        backlog=args.backlog,
+    )
+    return server.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ from src.services.feedback_service import FeedbackService
 from src.services.profile_service import ProfileService
 from src.services.program_service import ProgramService
 from src.services.recommendation_service import RecommendationService
+from src.services.search_service import SearchService
 from src.services.trajectory_service import TrajectoryService
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     "TrajectoryService",
     "RecommendationService",
     "FeedbackService",
+    "SearchService",
 ]
@@ -0,0 +1,62 @@
+"""
+Base para las versiones async de los servicios.
+
+Cada servicio async delega en su par sincrónico, de modo que la lógica (y
+las consultas) es una sola:
+
+- Con una `AsyncSession`, el servicio sincrónico corre vía `run_sync` sobre
+  la conexión async: la E/S no bloquea el event loop ni ocupa hilos.
+  `run_sync` corre en el hilo del event loop, así que el trabajo de CPU
+  (scoring con NumPy, búsqueda en el índice en memoria) se separa de la E/S
+  y solo ese paso va al threadpool.
+- Con una `Session` (modo sincrónico), corre en el threadpool, como lo haría
+  un endpoint `def`.
+
+El estado compartido en memoria (catálogo compilado, índice de búsqueda) se
+construye bajo un `threading.Lock` mientras consulta la BD. Con una
+`AsyncSession` esa consulta espera al propio event loop: si otra corrutina
+esperara el mismo lock en el hilo del loop, lo bloquearía para siempre. Por
+eso las construcciones async pasan antes por `build_lock()`.
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import Generic, TypeVar
+from weakref import WeakKeyDictionary
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+S = TypeVar("S")
+R = TypeVar("R")
+
+_build_locks: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = WeakKeyDictionary()
+
+
+def build_lock() -> asyncio.Lock:
+    """Lock del event loop actual que serializa las construcciones de estado compartido."""
+    loop = asyncio.get_running_loop()
+    lock = _build_locks.get(loop)
+    if lock is None:
+        lock = _build_locks[loop] = asyncio.Lock()
+    return lock
+
+
+class AsyncService(Generic[S]):
+    """Adapta un servicio sincrónico a una interfaz async."""
+
+    service_class: type[S]
+
+    def __init__(self, db: AsyncSession | Session):
+        self.db = db
+
+    def _service(self, session: Session) -> S:
+        """Construye el servicio sincrónico sobre la sesión dada."""
+        return self.service_class(session)  # type: ignore[call-arg]
+
+    async def _run(self, call: Callable[[S], R]) -> R:
+        """Ejecuta `call` sobre el servicio sincrónico sin bloquear el event loop."""
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(lambda session: call(self._service(session)))
+        return await run_in_threadpool(call, self._service(self.db))
@@ -0,0 +1,114 @@
+"""
+Scoring de lotes de perfiles.
+
+Los lotes chicos se puntúan en el proceso actual. Los grandes se reparten en
+un pool de procesos: cada worker recibe el catálogo compilado una sola vez
+(al iniciarse) y luego solo intercambia los campos de los perfiles y las
+posiciones/scores ganadores. El pool se recrea cuando cambia el catálogo.
+"""
+
+import multiprocessing
+import threading
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.config import get_settings
+from src.services.catalog import ProgramCatalog
+from src.services.scoring import ScoringInputs, rank_catalog
+
+# Resultado por perfil: (índice en el lote, posiciones, scores)
+RankedChunk = list[tuple[int, list[int], list[float]]]
+
+_worker_catalog: ProgramCatalog | None = None
+_worker_weights: Mapping[str, float] = {}
+
+
+def _init_worker(catalog: ProgramCatalog, weights: Mapping[str, float]) -> None:
+    """Inicializa un worker con el catálogo y los pesos."""
+    global _worker_catalog, _worker_weights
+    _worker_catalog = catalog
+    _worker_weights = weights
+
+
+def _rank_chunk(
+    catalog: ProgramCatalog,
+    weights: Mapping[str, float],
+    chunk: list[tuple[int, ScoringInputs]],
+    limit: int,
+) -> RankedChunk:
+    return [(index, *rank_catalog(catalog, inputs, weights, limit)) for index, inputs in chunk]
+
+
+def _rank_chunk_in_worker(chunk: list[tuple[int, ScoringInputs]], limit: int) -> RankedChunk:
+    assert _worker_catalog is not None, "worker sin catálogo"
+    return _rank_chunk(_worker_catalog, _worker_weights, chunk, limit)
+
+
+class BulkScorer:
+    """Puntúa lotes de perfiles, opcionalmente en un pool de procesos."""
+
+    def __init__(self, max_workers: int | None = None, chunk_size: int = 64):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_version: int | None = None
+        self._lock = threading.Lock()
+
+    def rank(
+        self,
+        catalog: ProgramCatalog,
+        weights: Mapping[str, float],
+        profiles: list[tuple[int, ScoringInputs]],
+        limit: int,
+        use_pool: bool = False,
+    ) -> Iterator[RankedChunk]:
+        """
+        Puntúa los perfiles y produce los resultados por bloques.
+
+        Con `use_pool` los bloques se producen a medida que terminan, no
+        necesariamente en orden.
+        """
+        chunks = [
+            profiles[start : start + self.chunk_size]
+            for start in range(0, len(profiles), self.chunk_size)
+        ]
+        if not use_pool:
+            for chunk in chunks:
+                yield _rank_chunk(catalog, weights, chunk, limit)
+            return
+
+        pool = self._pool_for(catalog, weights)
+        futures = [pool.submit(_rank_chunk_in_worker, chunk, limit) for chunk in chunks]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def shutdown(self) -> None:
+        """Detiene el pool de procesos."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+            self._pool_version = None
+
+    def _pool_for(
+        self, catalog: ProgramCatalog, weights: Mapping[str, float]
+    ) -> ProcessPoolExecutor:
+        """Retorna el pool para la versión del catálogo, recreándolo si cambió."""
+        with self._lock:
+            if self._pool is None or self._pool_version != catalog.version:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                # 'spawn' evita heredar hilos y conexiones del proceso principal
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(catalog, dict(weights)),
+                )
+                self._pool_version = catalog.version
+            return self._pool
+
+
+settings = get_settings()
+
+bulk_scorer = BulkScorer(max_workers=settings.bulk_max_workers)
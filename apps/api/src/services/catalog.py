@@ -0,0 +1,468 @@
+"""
+Catálogo compilado de programas.
+
+Snapshot de solo lectura, local al proceso, con los atributos de los programas
+que usa el motor de recomendaciones guardados por columnas (arrays de NumPy) y
+strings internados. Se construye una vez al iniciar la aplicación y se
+reemplaza de forma atómica cuando cambian las tablas subyacentes.
+"""
+
+import sys
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from itertools import chain
+from typing import Any, NamedTuple
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from src.models.institution import Institution
+from src.models.program import Program
+from src.models.trajectory import Trajectory
+from src.services.async_service import build_lock
+
+# Modelos cuyos cambios invalidan el catálogo (y los resultados derivados)
+CATALOG_MODELS: tuple[type, ...] = (Program, Institution, Trajectory)
+
+# Códigos especiales de las columnas categóricas
+NULL_CODE = -1  # Valor None en la BD
+MISSING_CODE = -2  # Valor ausente del vocabulario (nunca coincide)
+
+_DIRTY_KEY = "catalog_dirty"
+
+
+class CatalogInstitution(NamedTuple):
+    """Institución del catálogo (solo los campos que usa el motor)."""
+
+    id: UUID
+    name: str
+    short_name: str | None
+    province: str
+
+
+class CatalogProgram(NamedTuple):
+    """
+    Vista liviana de un programa del catálogo.
+
+    Expone los mismos atributos que el modelo `Program` que usa el scoring,
+    por lo que puede pasarse a `RecommendationService._calculate_score`.
+    """
+
+    id: UUID
+    name: str
+    area: str
+    modality: str
+    shift: str | None
+    duration_years: float | None
+    work_compatible: bool | None
+    institution: CatalogInstitution
+
+
+class StringTable:
+    """Vocabulario de strings internados con códigos enteros."""
+
+    def __init__(self) -> None:
+        self._codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def encode(self, value: str | None) -> int:
+        """Retorna el código de un valor, agregándolo al vocabulario si es nuevo."""
+        if value is None:
+            return NULL_CODE
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def freeze(self) -> tuple[str, ...]:
+        """Retorna el vocabulario como tupla inmutable."""
+        return tuple(self.values)
+
+    def codes(self) -> dict[str, int]:
+        """Retorna una copia del mapeo valor -> código."""
+        return dict(self._codes)
+
+
+def _lookup(vocabulary: dict[str, int], value: str | None) -> int:
+    """Código de un valor sin modificar el vocabulario."""
+    if value is None:
+        return NULL_CODE
+    return vocabulary.get(value, MISSING_CODE)
+
+
+@dataclass(frozen=True)
+class ProgramCatalog:
+    """
+    Snapshot compilado del catálogo de programas.
+
+    Cada programa ocupa una posición fija; las columnas categóricas guardan
+    códigos enteros sobre vocabularios internados. Los programas se ordenan
+    por ID, de modo que la posición sirve como desempate determinístico.
+    """
+
+    version: int
+    ids: tuple[UUID, ...]
+    names: tuple[str, ...]
+    area: np.ndarray  # int16, códigos sobre `areas`
+    modality: np.ndarray  # int16, códigos sobre `modalities`
+    shift: np.ndarray  # int16, códigos sobre `shifts` (NULL_CODE si no tiene)
+    duration: np.ndarray  # float64, NaN si no tiene duración
+    work_compatible: np.ndarray  # int8: 1, 0 o NULL_CODE
+    province: np.ndarray  # int16, provincia de la institución sobre `provinces`
+    institution: np.ndarray  # int32, posición en `institutions`
+    areas: tuple[str, ...]
+    modalities: tuple[str, ...]
+    shifts: tuple[str, ...]
+    provinces: tuple[str, ...]
+    institutions: tuple[CatalogInstitution, ...]
+    positions: dict[UUID, int] = field(repr=False)
+    _vocabularies: dict[str, dict[str, int]] = field(repr=False)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def code(self, column: str, value: str | None) -> int:
+        """Código de `value` en el vocabulario de la columna indicada."""
+        return _lookup(self._vocabularies[column], value)
+
+    def position(self, program_id: UUID) -> int | None:
+        """Posición de un programa en el catálogo."""
+        return self.positions.get(program_id)
+
+    def program(self, position: int) -> CatalogProgram:
+        """Materializa el programa en la posición indicada."""
+        shift = int(self.shift[position])
+        duration = float(self.duration[position])
+        work_compatible = int(self.work_compatible[position])
+        return CatalogProgram(
+            id=self.ids[position],
+            name=self.names[position],
+            area=self.areas[self.area[position]],
+            modality=self.modalities[self.modality[position]],
+            shift=self.shifts[shift] if shift != NULL_CODE else None,
+            duration_years=None if np.isnan(duration) else duration,
+            work_compatible=None if work_compatible == NULL_CODE else bool(work_compatible),
+            institution=self.institutions[self.institution[position]],
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        version: int,
+        ids: tuple[UUID, ...],
+        names: tuple[str, ...],
+        columns: dict[str, np.ndarray],
+        vocabularies: dict[str, tuple[str, ...]],
+        institutions: tuple[CatalogInstitution, ...],
+    ) -> "ProgramCatalog":
+        """
+        Arma un catálogo a partir de columnas ya compiladas.
+
+        Las columnas se usan tal cual (sin copiarlas), por lo que pueden ser
+        vistas de solo lectura sobre memoria compartida.
+        """
+        return cls(
+            version=version,
+            ids=ids,
+            names=names,
+            **columns,
+            areas=vocabularies["area"],
+            modalities=vocabularies["modality"],
+            shifts=vocabularies["shift"],
+            provinces=vocabularies["province"],
+            institutions=institutions,
+            positions={program_id: i for i, program_id in enumerate(ids)},
+            _vocabularies={
+                column: {value: code for code, value in enumerate(values)}
+                for column, values in vocabularies.items()
+            },
+        )
+
+    @classmethod
+    def from_db(cls, db: Session, version: int) -> "ProgramCatalog":
+        """Compila el catálogo leyendo solo las columnas necesarias (sin hidratar ORM)."""
+        institution_rows = db.execute(
+            select(
+                Institution.id,
+                Institution.name,
+                Institution.short_name,
+                Institution.province,
+            )
+        ).all()
+        program_rows = db.execute(
+            select(
+                Program.id,
+                Program.name,
+                Program.area,
+                Program.modality,
+                Program.shift,
+                Program.duration_years,
+                Program.work_compatible,
+                Program.institution_id,
+            )
+        ).all()
+        program_rows = sorted(program_rows, key=lambda row: row.id)
+
+        provinces = StringTable()
+        institutions: list[CatalogInstitution] = []
+        institution_positions: dict[UUID, int] = {}
+        institution_province: list[int] = []
+        for row in institution_rows:
+            institution_positions[row.id] = len(institutions)
+            institution_province.append(provinces.encode(row.province))
+            institutions.append(
+                CatalogInstitution(
+                    id=row.id,
+                    name=row.name,
+                    short_name=row.short_name,
+                    province=sys.intern(row.province),
+                )
+            )
+
+        size = len(program_rows)
+        area = np.empty(size, dtype=np.int16)
+        modality = np.empty(size, dtype=np.int16)
+        shift = np.empty(size, dtype=np.int16)
+        duration = np.empty(size, dtype=np.float64)
+        work_compatible = np.empty(size, dtype=np.int8)
+        province = np.empty(size, dtype=np.int16)
+        institution = np.empty(size, dtype=np.int32)
+
+        areas, modalities, shifts = StringTable(), StringTable(), StringTable()
+        for i, row in enumerate(program_rows):
+            area[i] = areas.encode(row.area)
+            modality[i] = modalities.encode(row.modality)
+            shift[i] = shifts.encode(row.shift)
+            duration[i] = np.nan if row.duration_years is None else float(row.duration_years)
+            work_compatible[i] = (
+                NULL_CODE if row.work_compatible is None else int(row.work_compatible)
+            )
+            institution[i] = institution_positions[row.institution_id]
+            province[i] = institution_province[institution[i]]
+
+        for column in (area, modality, shift, duration, work_compatible, province, institution):
+            column.flags.writeable = False
+
+        ids = tuple(row.id for row in program_rows)
+        return cls(
+            version=version,
+            ids=ids,
+            names=tuple(row.name for row in program_rows),
+            area=area,
+            modality=modality,
+            shift=shift,
+            duration=duration,
+            work_compatible=work_compatible,
+            province=province,
+            institution=institution,
+            areas=areas.freeze(),
+            modalities=modalities.freeze(),
+            shifts=shifts.freeze(),
+            provinces=provinces.freeze(),
+            institutions=tuple(institutions),
+            positions={program_id: i for i, program_id in enumerate(ids)},
+            _vocabularies={
+                "area": areas.codes(),
+                "modality": modalities.codes(),
+                "shift": shifts.codes(),
+                "province": provinces.codes(),
+            },
+        )
+
+
+class CatalogStore:
+    """
+    Contenedor del snapshot vigente del catálogo.
+
+    Las lecturas no toman locks: el snapshot es inmutable y se reemplaza
+    asignando una nueva referencia. La reconstrucción se serializa con un lock
+    y se dispara de forma perezosa cuando el catálogo fue invalidado.
+
+    Además lleva la generación de los datos del catálogo: un contador que
+    aumenta con cada cambio (haya o no un snapshot cargado), junto con un
+    identificador del proceso para que no se repita entre reinicios.
+
+    Con varios workers, la versión global es la de la tabla `catalog_version`
+    (ver `src.services.catalog_sync`): `sync_version` invalida el snapshot
+    cuando cambia y `etag_version` la usa para que todos los workers
+    respondan el mismo ETag.
+    """
+
+    def __init__(self) -> None:
+        self._catalog: ProgramCatalog | None = None
+        self._stale = True
+        self._version = 0
+        self._generation = 0
+        self._changed_at = datetime.now(UTC)
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[], None]] = []
+        self._db_version: int | None = None
+        self._synced_generation = 0
+        self.epoch = uuid4().hex[:8]
+        # Compila el snapshot; `src.services.catalog_snapshot` lo reemplaza
+        # para compartirlo entre workers
+        self.loader: Callable[[Session, int], ProgramCatalog] = ProgramCatalog.from_db
+
+    @property
+    def generation(self) -> int:
+        """Cantidad de cambios del catálogo observados por este proceso."""
+        return self._generation
+
+    @property
+    def changed_at(self) -> datetime:
+        """Momento del último cambio observado (o del inicio del proceso)."""
+        return self._changed_at
+
+    @property
+    def db_version(self) -> int | None:
+        """Última versión de `catalog_version` observada (None si nunca se leyó)."""
+        return self._db_version
+
+    @property
+    def etag_version(self) -> str:
+        """
+        Identificador de los datos del catálogo para los ETag.
+
+        Es la versión de la BD, compartida por todos los workers, mientras no
+        haya cambios locales posteriores a la última sincronización; si no se
+        conoce, o hay cambios locales aún no sincronizados, se combina con la
+        época y la generación de este proceso.
+        """
+        if self._db_version is None:
+            return f"{self.epoch}-{self._generation}"
+        local = self._generation - self._synced_generation
+        if local == 0:
+            return str(self._db_version)
+        return f"{self._db_version}-{self.epoch}-{local}"
+
+    @property
+    def current(self) -> ProgramCatalog | None:
+        """Snapshot cargado actualmente (puede estar desactualizado)."""
+        return self._catalog
+
+    @property
+    def is_stale(self) -> bool:
+        """True si el catálogo debe reconstruirse antes de usarse."""
+        return self._stale or self._catalog is None
+
+    def get(self, db: Session) -> ProgramCatalog:
+        """Retorna el snapshot vigente, reconstruyéndolo si fue invalidado."""
+        catalog = self._catalog
+        if catalog is not None and not self._stale:
+            return catalog
+        return self.refresh(db)
+
+    async def get_async(self, db: AsyncSession) -> ProgramCatalog:
+        """Como `get`, sobre una `AsyncSession` (ver `build_lock`)."""
+        catalog = self._catalog
+        if catalog is not None and not self._stale:
+            return catalog
+        async with build_lock():
+            return await db.run_sync(self.refresh)
+
+    def refresh(self, db: Session, force: bool = False) -> ProgramCatalog:
+        """Reconstruye el snapshot y lo publica de forma atómica."""
+        with self._lock:
+            if not force and self._catalog is not None and not self._stale:
+                return self._catalog
+            # Se limpia antes de construir: una invalidación concurrente
+            # vuelve a marcarlo y fuerza otra reconstrucción.
+            self._stale = False
+            try:
+                catalog = self.loader(db, self._version + 1)
+            except Exception:
+                self._stale = True
+                raise
+            self._version = catalog.version
+            self._catalog = catalog
+            return catalog
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Registra una función a invocar cada vez que se invalida el catálogo."""
+        self._listeners.append(callback)
+
+    def invalidate(self) -> None:
+        """Marca el snapshot como desactualizado."""
+        self._stale = True
+        self._changed()
+
+    def sync_version(self, version: int, changed_at: datetime | None = None) -> bool:
+        """
+        Registra la versión del catálogo leída de la BD.
+
+        Invalida el snapshot si la versión cambió desde la última lectura (o
+        si es la primera y ya había un snapshot cargado, que pudo compilarse
+        antes del último cambio). Retorna True si invalidó.
+        """
+        if version == self._db_version:
+            return False
+        changed = self._db_version is not None or self._catalog is not None
+        self._db_version = version
+        if changed:
+            self.invalidate()
+        if changed_at is not None:
+            self._changed_at = changed_at
+        self._synced_generation = self._generation
+        return changed
+
+    def clear(self) -> None:
+        """Descarta el snapshot cargado y la versión de la BD observada."""
+        with self._lock:
+            self._catalog = None
+            self._stale = True
+            self._db_version = None
+        self._changed()
+
+    def _changed(self) -> None:
+        """Avanza la generación y notifica a los listeners."""
+        self._changed_at = datetime.now(UTC)
+        self._generation += 1
+        for callback in self._listeners:
+            callback()
+
+
+catalog_store = CatalogStore()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_catalog_changes(session: Session, _flush_context: Any) -> None:
+    """Marca la sesión si el flush modificó tablas del catálogo."""
+    if session.info.get(_DIRTY_KEY):
+        return
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, CATALOG_MODELS):
+            session.info[_DIRTY_KEY] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_catalog_statements(orm_execute_state: ORMExecuteState) -> None:
+    """Marca la sesión ante INSERT/UPDATE/DELETE masivos sobre el catálogo."""
+    if not (
+        orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+    ):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, CATALOG_MODELS):
+        orm_execute_state.session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    """Invalida el catálogo cuando se confirma un cambio sobre sus tablas."""
+    if session.info.pop(_DIRTY_KEY, False):
+        catalog_store.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    """Descarta las marcas de cambios revertidos."""
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,245 @@
+"""
+Snapshot del catálogo compartido entre workers.
+
+Con varios workers por nodo cada uno compilaba su propio catálogo: N
+consultas al arrancar (y ante cada cambio) y N copias de las columnas en
+memoria. `SharedCatalogFiles` guarda el catálogo compilado en un archivo por
+versión de `catalog_version` (por defecto en `/dev/shm`, memoria compartida)
+que los workers mapean en modo solo lectura:
+
+- Las columnas de NumPy son vistas sin copia sobre el mapeo, así que sus
+  páginas se comparten entre todos los procesos.
+- Los IDs, nombres, vocabularios e instituciones se guardan en el mismo
+  archivo y cada worker arma sus objetos de Python al mapearlo, sin consultar
+  la BD.
+- Solo un worker compila cada versión (lock de archivo); el resto espera y
+  mapea el archivo publicado. El archivo se escribe aparte y se publica con
+  `os.replace`, así que nadie lee uno a medio escribir.
+
+Como cada archivo corresponde a una versión, el cambio a una nueva es
+atómico: el `CatalogStore` reemplaza la referencia al snapshot y los mapeos
+viejos se liberan cuando dejan de usarse (borrar el archivo no los invalida).
+"""
+
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.services.catalog import CatalogInstitution, ProgramCatalog
+from src.services.catalog_sync import read_version
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"OPCATv1\n"
+_HEADER = struct.Struct("<8sQ")  # magic, largo de los metadatos
+_ALIGNMENT = 64
+
+# Columnas de `ProgramCatalog` guardadas como arrays
+COLUMNS = ("area", "modality", "shift", "duration", "work_compatible", "province", "institution")
+VOCABULARIES = {
+    "area": "areas",
+    "modality": "modalities",
+    "shift": "shifts",
+    "province": "provinces",
+}
+
+# Archivos de versiones anteriores que se conservan (workers aún sin migrar)
+KEEP_PREVIOUS = 2
+
+
+def default_directory() -> Path:
+    """`/dev/shm` si existe (tmpfs), si no el directorio temporal."""
+    base = Path("/dev/shm")
+    if not base.is_dir():
+        base = Path(tempfile.gettempdir())
+    return base / "orientation-catalog"
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_catalog(catalog: ProgramCatalog, path: Path) -> None:
+    """Serializa el catálogo en `path` (se publica de forma atómica)."""
+    arrays = {name: np.ascontiguousarray(getattr(catalog, name)) for name in COLUMNS}
+    sections = {
+        "ids": b"".join(program_id.bytes for program_id in catalog.ids),
+        **{name: array.tobytes() for name, array in arrays.items()},
+    }
+    # Offsets relativos al inicio de los datos, alineados para NumPy
+    layout, offset = {}, 0
+    for name, data in sections.items():
+        layout[name] = {"offset": offset, "length": len(data)}
+        if name in arrays:
+            layout[name]["dtype"] = arrays[name].dtype.str
+        offset = _aligned(offset + len(data))
+    metadata = json.dumps(
+        {
+            "size": len(catalog),
+            "names": catalog.names,
+            "vocabularies": {
+                column: getattr(catalog, attr) for column, attr in VOCABULARIES.items()
+            },
+            "institutions": [
+                [institution.id.hex, institution.name, institution.short_name, institution.province]
+                for institution in catalog.institutions
+            ],
+            "arrays": layout,
+        }
+    ).encode()
+    base = _aligned(_HEADER.size + len(metadata))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".catalog-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, len(metadata)))
+            file.write(metadata)
+            for name, data in sections.items():
+                file.seek(base + layout[name]["offset"])
+                file.write(data)
+            file.truncate(base + offset)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def map_catalog(path: Path, version: int) -> ProgramCatalog:
+    """Mapea un archivo de catálogo; las columnas son vistas de solo lectura."""
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, length = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} no es un snapshot del catálogo")
+    metadata = json.loads(buffer[_HEADER.size : _HEADER.size + length])
+    sections = metadata["arrays"]
+    base = _aligned(_HEADER.size + length)
+
+    ids_start = base + sections["ids"]["offset"]
+    raw_ids = buffer[ids_start : ids_start + sections["ids"]["length"]]
+    ids = tuple(UUID(bytes=raw_ids[i : i + 16]) for i in range(0, len(raw_ids), 16))
+    columns = {
+        name: np.frombuffer(
+            buffer,
+            dtype=np.dtype(sections[name]["dtype"]),
+            count=metadata["size"],
+            offset=base + sections[name]["offset"],
+        )
+        for name in COLUMNS
+    }
+    return ProgramCatalog.from_columns(
+        version=version,
+        ids=ids,
+        names=tuple(metadata["names"]),
+        columns=columns,
+        vocabularies={
+            column: tuple(sys.intern(value) for value in values)
+            for column, values in metadata["vocabularies"].items()
+        },
+        institutions=tuple(
+            CatalogInstitution(UUID(hex=id_hex), name, short_name, sys.intern(province))
+            for id_hex, name, short_name, province in metadata["institutions"]
+        ),
+    )
+
+
+class SharedCatalogFiles:
+    """Carga el catálogo desde archivos compartidos por versión de la BD."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.path: Path | None = None  # archivo del último snapshot cargado
+
+    def load(self, db: Session, version: int) -> ProgramCatalog:
+        """
+        Retorna el catálogo de la versión actual de la BD.
+
+        Mapea el archivo si otro worker ya lo publicó; si no, lo compila,
+        lo publica y lo mapea. Si no se conoce la versión de la BD compila
+        el catálogo en memoria del proceso, como sin snapshot compartido.
+        """
+        key = self._key(db)
+        if key is None:
+            self.path = None
+            return ProgramCatalog.from_db(db, version)
+
+        path = self.directory / f"catalog-{key}.bin"
+        catalog = self._map(path, version)
+        if catalog is not None:
+            return catalog
+        with self._exclusive():
+            # Otro worker pudo publicarlo mientras se esperaba el lock
+            catalog = self._map(path, version)
+            if catalog is not None:
+                return catalog
+            catalog = ProgramCatalog.from_db(db, version)
+            if self._key(db) != key:
+                # Cambió durante la compilación: no corresponde a `key`
+                self.path = None
+                return catalog
+            write_catalog(catalog, path)
+            self._prune()
+        logger.info("catalog snapshot published path=%s programs=%d", path, len(catalog))
+        return self._map(path, version) or catalog
+
+    def _key(self, db: Session) -> str | None:
+        """Versión de la BD y momento del cambio (distingue BD recreadas)."""
+        try:
+            # En un SAVEPOINT sobre la conexión de `db` (no se pide otra al
+            # pool): un error no aborta su transacción
+            with db.begin_nested():
+                row = read_version(db.connection())
+        except SQLAlchemyError as e:
+            logger.warning("catalog snapshot disabled error=%s", e.__class__.__name__)
+            return None
+        if row is None:
+            return None
+        return f"{row.version}-{int(row.updated_at.timestamp() * 1_000_000)}"
+
+    def _map(self, path: Path, version: int) -> ProgramCatalog | None:
+        try:
+            catalog = map_catalog(path, version)
+        except FileNotFoundError:
+            return None
+        self.path = path
+        return catalog
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Lock entre procesos sobre el directorio de snapshots."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _prune(self) -> None:
+        """Borra los archivos de versiones viejas (los mapeos siguen válidos)."""
+        files = sorted(self.directory.glob("catalog-*.bin"), key=lambda path: path.stat().st_mtime)
+        for path in files[: -(KEEP_PREVIOUS + 1)]:
+            path.unlink(missing_ok=True)
+
+
+settings = get_settings()
+
+shared_catalog = SharedCatalogFiles(
+    Path(settings.catalog_snapshot_dir) if settings.catalog_snapshot_dir else default_directory()
+)
@@ -0,0 +1,193 @@
+"""
+Sincronización del catálogo entre workers.
+
+Cada worker tiene su propio snapshot del catálogo (y los caches derivados:
+recomendaciones, respuestas HTTP); los eventos de sesión solo ven los cambios
+hechos por el mismo proceso. La tabla `catalog_version`, que avanzan los
+triggers de las tablas del catálogo, es la versión común a todos.
+
+`CatalogVersionWatcher` corre en un hilo de fondo por worker:
+
+- En Postgres (psycopg2) escucha el canal `catalog_changed` con una conexión
+  dedicada en autocommit; los triggers lo notifican al confirmar cada cambio,
+  así que la invalidación llega en milisegundos. Al (re)conectarse y cada
+  `LISTEN_RESYNC_INTERVAL` segundos lee la versión por si se perdió alguna
+  notificación.
+- En otros motores (SQLite en desarrollo y tests) consulta la versión cada
+  `poll_interval` segundos.
+
+Al detectar un cambio invalida el snapshot y, si había uno cargado y
+`eager_refresh` está activo, lo reconstruye enseguida para que el próximo
+request no pague la compilación.
+"""
+
+import logging
+import select
+import threading
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, cast
+
+from sqlalchemy import Connection, Engine, Row
+from sqlalchemy import select as sql_select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from src.config import get_settings
+from src.database import engine
+from src.metrics import registry
+from src.models.catalog_version import NOTIFY_CHANNEL, CatalogVersion
+from src.services.catalog import catalog_store
+
+if TYPE_CHECKING:
+    from psycopg2.extensions import connection as PsycopgConnection
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre lecturas de control mientras se escuchan notificaciones
+LISTEN_RESYNC_INTERVAL = 30.0
+
+catalog_version_changes = registry.counter(
+    "catalog_version_changes_total",
+    "Cambios de la versión del catálogo en la BD observados por el worker.",
+    labels=("source",),
+)
+
+
+def read_version(connection: Connection) -> Row | None:
+    """Lee la versión del catálogo y el momento del último cambio."""
+    return connection.execute(
+        sql_select(CatalogVersion.version, CatalogVersion.updated_at).where(CatalogVersion.id == 1)
+    ).first()
+
+
+def parse_payload(payload: str) -> tuple[int, datetime]:
+    """Interpreta el payload `<versión>,<epoch>` de una notificación."""
+    version, epoch = payload.split(",", 1)
+    return int(version), datetime.fromtimestamp(float(epoch), UTC)
+
+
+class CatalogVersionWatcher:
+    """Observa `catalog_version` e invalida el catálogo local cuando cambia."""
+
+    def __init__(self, engine: Engine, poll_interval: float, eager_refresh: bool = True):
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self.eager_refresh = eager_refresh
+        self.listening = False
+        self._session_factory = sessionmaker(bind=engine, autoflush=False)
+        self._last_error: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def uses_notify(self) -> bool:
+        """True si el engine admite LISTEN/NOTIFY (Postgres con psycopg2)."""
+        dialect = self.engine.dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+    def start(self) -> None:
+        """Inicia el hilo que escucha (o consulta) la versión del catálogo."""
+        self._stop.clear()
+        target = self._listen if self.uses_notify else self._poll
+        self._thread = threading.Thread(target=target, name="catalog-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo y espera a que termine."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self, source: str = "poll") -> bool:
+        """Lee la versión de la BD y la aplica; retorna True si invalidó el catálogo."""
+        try:
+            with self.engine.connect() as connection:
+                row = read_version(connection)
+        except SQLAlchemyError as e:
+            # P. ej. la migración 004 aún no se aplicó; se loguea una vez
+            error = e.__class__.__name__
+            if error != self._last_error:
+                logger.warning("catalog version check failed error=%s", error)
+            self._last_error = error
+            return False
+        self._last_error = None
+        if row is None:
+            return False
+        return self.apply(row.version, row.updated_at, source)
+
+    def apply(self, version: int, changed_at: datetime | None, source: str) -> bool:
+        """Sincroniza el catálogo local con una versión observada."""
+        if changed_at is not None and changed_at.tzinfo is None:
+            # SQLite guarda CURRENT_TIMESTAMP (UTC) sin zona horaria
+            changed_at = changed_at.replace(tzinfo=UTC)
+        loaded = catalog_store.current is not None
+        if not catalog_store.sync_version(version, changed_at):
+            return False
+        catalog_version_changes.labels(source).inc()
+        logger.info("catalog version changed version=%d source=%s", version, source)
+        if self.eager_refresh and loaded:
+            self._refresh()
+        return True
+
+    def _refresh(self) -> None:
+        try:
+            with self._session_factory() as db:
+                catalog_store.refresh(db)
+        except SQLAlchemyError as e:
+            # Queda invalidado: el próximo request lo reconstruye
+            logger.warning("catalog refresh failed error=%s", e.__class__.__name__)
+
+    def _poll(self) -> None:
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.poll_interval)
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen_once()
+            except Exception as e:
+                # Conexión caída: se reintenta y al reconectar se relee la versión
+                logger.warning("catalog listener disconnected error=%s", e.__class__.__name__)
+                self._stop.wait(self.poll_interval)
+
+    def _listen_once(self) -> None:
+        # Conexión dedicada fuera del pool: queda en autocommit y con LISTEN
+        raw = self.engine.raw_connection()
+        raw.detach()
+        try:
+            # Solo se escucha con Postgres (psycopg2), ver `uses_notify`
+            connection = cast("PsycopgConnection", raw.driver_connection)
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            self.listening = True
+            self.check("listen")
+            last_check = time.monotonic()
+            while not self._stop.is_set():
+                readable, _, _ = select.select([connection], [], [], self.poll_interval)
+                if readable:
+                    connection.poll()
+                    # Basta la última notificación: las versiones son crecientes
+                    latest = None
+                    while connection.notifies:
+                        latest = connection.notifies.pop(0)
+                    if latest is not None:
+                        self.apply(*parse_payload(latest.payload), source="notify")
+                elif time.monotonic() - last_check >= LISTEN_RESYNC_INTERVAL:
+                    self.check("listen")
+                    last_check = time.monotonic()
+        finally:
+            self.listening = False
+            raw.close()
+
+
+settings = get_settings()
+
+catalog_watcher = CatalogVersionWatcher(
+    engine,
+    poll_interval=settings.catalog_sync_poll_interval,
+    eager_refresh=settings.catalog_sync_eager_refresh,
+)
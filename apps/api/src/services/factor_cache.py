@@ -0,0 +1,206 @@
+"""
+Cache de factores de scoring por perfil.
+
+El wizard del frontend hace PATCH de un campo del perfil y enseguida pide
+recomendaciones, así que cada paso recalculaba los cinco factores sobre todo
+el catálogo aunque solo uno dependiera del campo modificado. Este cache
+guarda, por perfil, la contribución de cada factor (una fila por factor) y
+los campos con los que se calculó; al volver a puntuar solo se recalculan
+las filas de los factores afectados y el resto se reutiliza tal cual.
+
+Los campos modificados los registra `ProfileService.update`; además se
+comparan los campos guardados con los actuales, para no perder cambios
+hechos por otro worker. Las filas se vuelven a sumar en el orden de
+`FACTORS`, por lo que el score es idéntico al de un cálculo completo.
+
+Cada fila ocupa 8 bytes por programa del catálogo, así que el cache se
+limita por cantidad de perfiles y por bytes. Las filas de los factores que no
+dependen del perfil (la duración) se guardan una sola vez por versión del
+catálogo, no en cada entrada.
+"""
+
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+
+from src.config import get_settings
+from src.services.catalog import ProgramCatalog, catalog_store
+from src.services.scoring import (
+    FACTOR_FIELDS,
+    FACTORS,
+    ScoringInputs,
+    changed_factors,
+    encode_profile,
+    factor_row,
+    factors_for_fields,
+)
+
+# Factores que no dependen de ningún campo del perfil
+SHARED_FACTORS = frozenset(factor for factor in FACTORS if not FACTOR_FIELDS[factor])
+
+
+@dataclass
+class FactorCacheStats:
+    """Contadores del cache de factores."""
+
+    full: int = 0  # perfiles puntuados desde cero
+    incremental: int = 0  # perfiles puntuados reutilizando filas
+    recomputed: Counter[str] = field(default_factory=Counter)  # filas recalculadas por factor
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    """Filas de un perfil calculadas contra una versión del catálogo."""
+
+    catalog_version: int
+    inputs: ScoringInputs
+    rows: dict[str, np.ndarray]  # solo los factores que dependen del perfil
+    nbytes: int
+
+
+class ProfileFactorCache:
+    """Cache LRU de las filas de factores de cada perfil."""
+
+    def __init__(self, maxsize: int, max_bytes: int = 64 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.stats = FactorCacheStats()
+        self._entries: OrderedDict[UUID, _Entry] = OrderedDict()
+        self._pending: dict[UUID, set[str]] = {}
+        self._bytes = 0
+        # Filas de `SHARED_FACTORS` por (factor, peso) para `_shared_version`
+        self._shared: dict[tuple[str, float], np.ndarray] = {}
+        self._shared_version: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """True si el cache puede guardar factores."""
+        return self.maxsize > 0 and self.max_bytes > 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por las filas guardadas de los perfiles."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record_update(self, profile_id: UUID, fields: Iterable[str]) -> None:
+        """Registra los campos de scoring modificados de un perfil."""
+        fields = set(fields)
+        if not fields:
+            return
+        with self._lock:
+            if profile_id in self._entries:
+                self._pending.setdefault(profile_id, set()).update(fields)
+
+    def rows(
+        self,
+        profile_id: UUID,
+        catalog: ProgramCatalog,
+        inputs: ScoringInputs,
+        weights: Mapping[str, float],
+    ) -> tuple[np.ndarray, ...]:
+        """
+        Contribución de cada factor para un perfil, en el orden de `FACTORS`.
+
+        Recalcula solo los factores afectados por los campos registrados o
+        distintos de los guardados; sin entrada para el perfil (o si cambió
+        el catálogo) calcula todos, salvo los compartidos ya calculados.
+        """
+        with self._lock:
+            entry = self._entries.get(profile_id)
+            pending = self._pending.pop(profile_id, set())
+            if entry is not None and entry.catalog_version != catalog.version:
+                entry = None
+            if entry is None:
+                factors = set(FACTORS) - SHARED_FACTORS
+                self.stats.full += 1
+            else:
+                factors = factors_for_fields(pending) | changed_factors(entry.inputs, inputs)
+                self.stats.incremental += 1
+            self.stats.recomputed.update(factors)
+            if self._shared_version != catalog.version:
+                self._shared = {}
+                self._shared_version = catalog.version
+            shared = {
+                factor: self._shared.get((factor, weights[factor])) for factor in SHARED_FACTORS
+            }
+
+        encoded = encode_profile(catalog, inputs)
+        # Las filas no se modifican: las que no cambian se comparten entre entradas
+        own: dict[str, np.ndarray] = {}
+        computed: dict[str, np.ndarray] = {}
+        rows: list[np.ndarray] = []
+        for factor in FACTORS:
+            row = shared.get(factor) if factor in SHARED_FACTORS else None
+            if row is None and entry is not None and factor not in factors:
+                row = entry.rows.get(factor)
+            if row is None:
+                row = factor_row(catalog, encoded, weights, factor)
+                row.flags.writeable = False
+                if factor in SHARED_FACTORS:
+                    computed[factor] = row
+            if factor not in SHARED_FACTORS:
+                own[factor] = row
+            rows.append(row)
+
+        with self._lock:
+            self.stats.recomputed.update(computed.keys())
+            if self.enabled:
+                if self._shared_version == catalog.version:
+                    for factor, row in computed.items():
+                        self._shared[(factor, weights[factor])] = row
+                nbytes = sum(row.nbytes for row in own.values())
+                self._store(profile_id, _Entry(catalog.version, inputs, own, nbytes))
+        return tuple(rows)
+
+    def _store(self, profile_id: UUID, entry: _Entry) -> None:
+        """Guarda la entrada y desaloja las menos usadas (con el lock tomado)."""
+        previous = self._entries.pop(profile_id, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[profile_id] = entry
+        self._bytes += entry.nbytes
+        while self._entries and (len(self._entries) > self.maxsize or self._bytes > self.max_bytes):
+            evicted, old = self._entries.popitem(last=False)
+            self._bytes -= old.nbytes
+            self._pending.pop(evicted, None)
+
+    def clear(self) -> None:
+        """Descarta todas las filas (p. ej. al cambiar el catálogo)."""
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self._bytes = 0
+            self._shared = {}
+            self._shared_version = None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Estado actual del cache y sus contadores."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "full": self.stats.full,
+            "incremental": self.stats.incremental,
+            "recomputed": dict(self.stats.recomputed),
+        }
+
+
+settings = get_settings()
+
+profile_factor_cache = ProfileFactorCache(
+    maxsize=settings.profile_factor_cache_size,
+    max_bytes=settings.profile_factor_cache_max_bytes,
+)
+
+# Las filas dependen del catálogo: se descartan cuando cambia
+catalog_store.add_listener(profile_factor_cache.clear)
@@ -2,33 +2,80 @@
 Servicio para gestión de feedback.
 """
 
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from src.config import get_settings
 from src.models.feedback import Feedback
 from src.schemas.feedback import FeedbackCreate, FeedbackResponse
+from src.services.async_service import AsyncService
+from src.services.feedback_writer import (
+    FeedbackWriter,
+    WriteBehindFull,
+    feedback_writer,
+    missing_profiles,
+)
 
 
 class FeedbackService:
     """Servicio para operaciones de feedback."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, writer: FeedbackWriter | None = None):
         self.db = db
+        if writer is None and get_settings().feedback_write_behind:
+            writer = feedback_writer
+        self.writer = writer
 
     def create(self, data: FeedbackCreate) -> FeedbackResponse:
-        """Crea un nuevo feedback."""
-        feedback = Feedback(
-            profile_id=data.profile_id,
-            target_type=data.target_type.value,
-            target_id=data.target_id,
-            rating=data.rating,
-            comment=data.comment,
-        )
-        self.db.add(feedback)
-        self.db.commit()
-        self.db.refresh(feedback)
+        """
+        Registra un feedback.
+
+        El ID y `created_at` se generan de antemano: con la ingesta por lotes
+        la fila se inserta después, desde el hilo del escritor, que descarta
+        las de perfiles inexistentes. En línea, un perfil inexistente lanza
+        `ValueError`. El elemento evaluado (`target_id`) no se valida.
+        """
+        row = {
+            "id": uuid.uuid4(),
+            "profile_id": data.profile_id,
+            "target_type": data.target_type.value,
+            "target_id": data.target_id,
+            "rating": data.rating,
+            "comment": data.comment,
+            "created_at": datetime.now(UTC),
+        }
+        self._persist(row)
 
         return FeedbackResponse(
-            id=feedback.id,
-            created_at=feedback.created_at,
+            id=row["id"],
+            created_at=row["created_at"],
             message="¡Gracias por tu feedback!",
         )
+
+    def _persist(self, row: dict) -> None:
+        """Guarda el feedback, en lote o en línea según la configuración."""
+        if self.writer is not None:
+            try:
+                self.writer.submit(row)
+                return
+            except WriteBehindFull:
+                # Backpressure: con la cola llena se persiste en línea
+                pass
+
+        if missing_profiles(self.db, [row]):
+            raise ValueError("Perfil no encontrado")
+        self.db.execute(insert(Feedback), [row])
+        self.db.commit()
+
+
+class AsyncFeedbackService(AsyncService[FeedbackService]):
+    """Versión async de `FeedbackService`."""
+
+    service_class = FeedbackService
+
+    async def create(self, data: FeedbackCreate) -> FeedbackResponse:
+        """Registra un feedback."""
+        return await self._run(lambda service: service.create(data))
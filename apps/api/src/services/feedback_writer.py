@@ -0,0 +1,202 @@
+"""
+Ingesta de feedback por lotes.
+
+En una clase, cientos de estudiantes califican sus recomendaciones a la vez
+y cada calificación era un INSERT + COMMIT + SELECT propio. Con la ingesta
+por lotes el endpoint responde 202 con un ID y `created_at` generados de
+antemano, y las filas se encolan en una cola acotada que un hilo de fondo
+vacía en lotes (por tamaño o por tiempo):
+
+- En Postgres el lote se carga con `COPY ... FROM STDIN`.
+- En otros motores, con un único INSERT multi-fila.
+
+Antes de escribir un lote se descartan, con una sola consulta, las filas
+cuyo `profile_id` no existe: el endpoint no consulta la BD para validarlo.
+Si un lote falla por los datos de alguna fila (integridad o valores
+inválidos), sus filas se reintentan de a una para descartar solo las
+inválidas. Los errores transitorios (conexión caída, timeout del pool) los
+reintenta `WriteBehindQueue` con backoff, sin perder el lote. Al detenerse,
+la cola se drena por completo.
+"""
+
+import io
+import logging
+import threading
+from collections.abc import Callable, Sequence
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.database import SessionLocal
+from src.models.feedback import Feedback
+from src.models.profile import Profile
+from src.services.write_behind import WriteBehindFull, WriteBehindQueue
+
+__all__ = [
+    "FEEDBACK_COLUMNS",
+    "FeedbackWriter",
+    "WriteBehindFull",
+    "copy_rows",
+    "feedback_writer",
+    "missing_profiles",
+]
+
+logger = logging.getLogger(__name__)
+
+# Columnas que se cargan (en este orden) en cada fila de feedback
+FEEDBACK_COLUMNS = (
+    "id",
+    "profile_id",
+    "target_type",
+    "target_id",
+    "rating",
+    "comment",
+    "created_at",
+)
+
+
+def _copy_value(value: Any) -> str:
+    """Valor en el formato de texto de COPY (NULL como `\\N`)."""
+    if value is None:
+        return "\\N"
+    text = value.isoformat() if hasattr(value, "isoformat") else str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(rows: Sequence[dict[str, Any]], columns: Sequence[str] = FEEDBACK_COLUMNS) -> str:
+    """Filas en el formato de texto de COPY (separadas por tab, una por línea)."""
+    return "".join("\t".join(_copy_value(row[column]) for column in columns) + "\n" for row in rows)
+
+
+def missing_profiles(db: Session, rows: Sequence[dict[str, Any]]) -> set[UUID]:
+    """Perfiles referenciados por las filas que no existen (una consulta)."""
+    profile_ids = {row["profile_id"] for row in rows if row["profile_id"] is not None}
+    if not profile_ids:
+        return set()
+    return profile_ids - set(db.scalars(select(Profile.id).where(Profile.id.in_(profile_ids))))
+
+
+class FeedbackWriter:
+    """Escritor por lotes de filas de feedback."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        maxsize: int = 50_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        put_timeout: float = 0.05,
+    ):
+        self.session_factory = session_factory
+        self.rejected = 0  # filas descartadas por datos inválidos
+        self._lock = threading.Lock()
+        self.queue: WriteBehindQueue[dict[str, Any]] = WriteBehindQueue(
+            "feedback-writer",
+            write=self._write,
+            maxsize=maxsize,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            put_timeout=put_timeout,
+        )
+
+    def submit(self, row: dict[str, Any]) -> None:
+        """
+        Encola una fila de feedback para persistirla.
+
+        Lanza `WriteBehindFull` si la cola sigue llena tras la espera.
+        """
+        self.queue.submit(row)
+
+    def start(self) -> None:
+        """Inicia el hilo de escritura."""
+        self.queue.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Detiene el hilo drenando el feedback pendiente."""
+        self.queue.stop(timeout)
+
+    def flush(self) -> int:
+        """Persiste sincrónicamente todo lo pendiente."""
+        return self.queue.flush()
+
+    def snapshot(self) -> dict[str, int]:
+        """Estado de la cola y sus contadores."""
+        return {
+            "pending": self.queue.pending,
+            "written": self.queue.written,
+            "failed": self.queue.failed,
+            "rejected": self.rejected,
+        }
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        """
+        Persiste el lote completo; ante un error en los datos, fila por fila.
+
+        Los demás errores se propagan para que la cola reintente el lote.
+        """
+        db = self.session_factory()
+        try:
+            missing = missing_profiles(db, batch)
+            if missing:
+                for row in batch:
+                    if row["profile_id"] in missing:
+                        self._reject(row, "perfil inexistente")
+                batch = [row for row in batch if row["profile_id"] not in missing]
+                if not batch:
+                    return
+            try:
+                self._write_rows(db, batch)
+                db.commit()
+            except (IntegrityError, DataError):
+                db.rollback()
+                self._write_each(db, batch)
+        finally:
+            db.close()
+
+    def _write_rows(self, db: Session, rows: list[dict[str, Any]]) -> None:
+        if db.get_bind().dialect.name == "postgresql":
+            # COPY evita armar y parsear el INSERT con todos los parámetros
+            statement = f"COPY {Feedback.__tablename__} ({', '.join(FEEDBACK_COLUMNS)}) FROM STDIN"
+            dbapi = db.get_bind().dialect.dbapi
+            assert dbapi is not None
+            cursor = db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(statement, io.StringIO(copy_rows(rows)))
+            except dbapi.Error as e:
+                # El cursor crudo no pasa por SQLAlchemy: se traduce el error
+                # (IntegrityError, OperationalError, ...) como lo haría `execute`
+                raise DBAPIError.instance(statement, None, e, dbapi.Error) from e
+            finally:
+                cursor.close()
+        else:
+            db.execute(insert(Feedback), rows)
+
+    def _write_each(self, db: Session, batch: list[dict[str, Any]]) -> None:
+        """Reintenta las filas de a una y descarta las inválidas."""
+        for row in batch:
+            try:
+                db.execute(insert(Feedback), [row])
+                db.commit()
+            except (IntegrityError, DataError) as e:
+                db.rollback()
+                self._reject(row, e.orig)
+
+    def _reject(self, row: dict[str, Any], reason: Any) -> None:
+        with self._lock:
+            self.rejected += 1
+        logger.warning("Feedback %s descartado: %s", row["id"], reason)
+
+
+settings = get_settings()
+
+feedback_writer = FeedbackWriter(
+    SessionLocal,
+    maxsize=settings.feedback_queue_size,
+    batch_size=settings.feedback_batch_size,
+    flush_interval=settings.feedback_flush_interval,
+    put_timeout=settings.write_behind_put_timeout,
+)
@@ -0,0 +1,165 @@
+"""
+Paginación por cursor (keyset) y conteo del total.
+
+El cursor es opaco para el cliente: codifica en base64 la clave de orden y
+el ID de la última fila devuelta. La página siguiente se pide con
+`(clave, id) > (clave_cursor, id_cursor)`, que el índice resuelve sin
+recorrer ni descartar las filas anteriores como hace un OFFSET.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, text, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Query, Session
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Orden estable por una columna más el ID como desempate."""
+
+    sort_column: InstrumentedAttribute
+    id_column: InstrumentedAttribute
+    descending: bool = False
+
+    def order_by(self) -> list[ColumnElement]:
+        """Cláusulas ORDER BY del keyset."""
+        if self.descending:
+            return [self.sort_column.desc(), self.id_column.desc()]
+        return [self.sort_column.asc(), self.id_column.asc()]
+
+    def after(self, cursor: str) -> ColumnElement[bool]:
+        """Filtro de las filas posteriores al cursor."""
+        key, row_id = self.decode(cursor)
+        columns = tuple_(self.sort_column, self.id_column)
+        values = (key, row_id)
+        return columns < values if self.descending else columns > values
+
+    def encode(self, row: Any) -> str:
+        """Cursor que apunta a `row`."""
+        key = getattr(row, self.sort_column.key)
+        if isinstance(key, datetime):
+            key = key.isoformat()
+        payload = json.dumps([key, str(getattr(row, self.id_column.key))])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> tuple[Any, UUID]:
+        """Clave e ID codificados en el cursor; ValueError si es inválido."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            key, row_id = json.loads(base64.urlsafe_b64decode(padded))
+            return self._key(key), UUID(row_id)
+        except (binascii.Error, ValueError, TypeError, AttributeError) as e:
+            raise ValueError("Cursor de paginación inválido") from e
+
+    def _key(self, key: Any) -> Any:
+        """Valida la clave decodificada contra el tipo de la columna de orden."""
+        if key is None:
+            if not self.sort_column.expression.nullable:
+                raise ValueError("Clave nula para una columna no nula")
+            return None
+        python_type = self.sort_column.type.python_type
+        if python_type is datetime:
+            return datetime.fromisoformat(key)
+        if python_type is str and isinstance(key, str):
+            return key
+        # bool es subclase de int, pero no es una clave numérica válida
+        if python_type in (int, float, Decimal) and not isinstance(key, bool):
+            if python_type is int and isinstance(key, int):
+                return key
+            if python_type is not int and isinstance(key, int | float):
+                return python_type(str(key))
+        raise ValueError(f"Clave de tipo {type(key).__name__} para {self.sort_column.key}")
+
+
+def estimate_total(db: Session, query: Query, table: str, filtered: bool) -> int | None:
+    """
+    Estimación del total a partir de las estadísticas de Postgres.
+
+    Sin filtros usa `pg_class.reltuples`; con filtros, las filas que estima
+    el planner para la consulta. Retorna None si no hay estadísticas (o la
+    BD no es Postgres), en cuyo caso corresponde contar.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    if not filtered:
+        estimate = db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table},
+        ).scalar()
+    else:
+        compiled = query.order_by(None).statement.compile(dialect=bind.dialect)
+        params: Any = compiled.params
+        if compiled.positiontup is not None:
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+        plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]["Plan"]["Plan Rows"]
+
+    # reltuples es -1 en tablas que nunca se analizaron
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def paginate(
+    db: Session,
+    query: Query,
+    keyset: Keyset,
+    *,
+    table: str,
+    filtered: bool,
+    page: int = 1,
+    per_page: int = 20,
+    cursor: str | None = None,
+    include_total: bool | None = None,
+    estimate_total_rows: bool = False,
+) -> dict[str, Any]:
+    """
+    Pagina `query` por cursor o, sin cursor, por número de página.
+
+    Por compatibilidad, el total se calcula por defecto solo en la
+    paginación por página; con cursor hay que pedirlo (`include_total`).
+    En ambos modos se devuelve `next_cursor` si hay más resultados.
+    """
+    if include_total is None:
+        include_total = cursor is None
+
+    total: int | None = None
+    estimated = False
+    if include_total:
+        if estimate_total_rows:
+            total = estimate_total(db, query, table, filtered)
+            estimated = total is not None
+        if total is None:
+            total = query.order_by(None).count()
+
+    ordered = query.order_by(*keyset.order_by())
+    if cursor:
+        ordered = ordered.filter(keyset.after(cursor))
+    else:
+        ordered = ordered.offset((page - 1) * per_page)
+
+    # Una fila extra indica si existe una página siguiente
+    rows = ordered.limit(per_page + 1).all()
+    items = rows[:per_page]
+    has_more = len(rows) > per_page
+
+    return {
+        "items": items,
+        "total": total,
+        "page": None if cursor else page,
+        "per_page": per_page,
+        "pages": (total + per_page - 1) // per_page if total is not None else None,
+        "total_estimated": estimated,
+        "next_cursor": keyset.encode(items[-1]) if has_more else None,
+    }
@@ -8,13 +8,22 @@ from sqlalchemy.orm import Session
 
 from src.models.profile import Profile
 from src.schemas.profiles import ProfileCreate, ProfileResponse, ProfileUpdate
+from src.services.async_service import AsyncService
+from src.services.factor_cache import ProfileFactorCache, profile_factor_cache
+from src.services.scoring import ScoringInputs, changed_fields
+
+
+def profile_row(profile: Profile) -> dict:
+    """Fila de la tabla `profiles` para un perfil aún no persistido (inserts masivos)."""
+    return {column.key: getattr(profile, column.key) for column in Profile.__table__.columns}
 
 
 class ProfileService:
     """Servicio para operaciones CRUD de perfiles."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, factor_cache: ProfileFactorCache | None = profile_factor_cache):
         self.db = db
+        self.factor_cache = factor_cache
 
     def create(self, data: ProfileCreate) -> ProfileResponse:
         """Crea un nuevo perfil."""
@@ -46,6 +55,7 @@ class ProfileService:
             return None
 
         update_data = data.model_dump(exclude_unset=True)
+        before = ScoringInputs.from_profile(profile)
 
         for field, value in update_data.items():
             if field == "works_while_studying" and value:
@@ -58,4 +68,26 @@ class ProfileService:
 
         self.db.commit()
         self.db.refresh(profile)
+        # Las recomendaciones siguientes solo recalculan los factores afectados
+        if self.factor_cache is not None:
+            after = ScoringInputs.from_profile(profile)
+            self.factor_cache.record_update(profile.id, changed_fields(before, after))
         return ProfileResponse.model_validate(profile)
+
+
+class AsyncProfileService(AsyncService[ProfileService]):
+    """Versión async de `ProfileService`."""
+
+    service_class = ProfileService
+
+    async def create(self, data: ProfileCreate) -> ProfileResponse:
+        """Crea un nuevo perfil."""
+        return await self._run(lambda service: service.create(data))
+
+    async def get_by_id(self, profile_id: UUID) -> ProfileResponse | None:
+        """Obtiene un perfil por ID."""
+        return await self._run(lambda service: service.get_by_id(profile_id))
+
+    async def update(self, profile_id: UUID, data: ProfileUpdate) -> ProfileResponse | None:
+        """Actualiza un perfil existente."""
+        return await self._run(lambda service: service.update(profile_id, data))
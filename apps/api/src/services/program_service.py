@@ -4,10 +4,16 @@ Servicio para gestión de programas.
 
 from uuid import UUID
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 
 from src.models.program import Program
 from src.schemas.programs import ProgramFilters, ProgramListResponse, ProgramResponse
+from src.services.async_service import AsyncService
+from src.services.pagination import Keyset, paginate
+from src.services.query_builder import program_conditions, programs_query
+
+# Orden de los listados: alfabético por nombre
+PROGRAM_KEYSET = Keyset(Program.name, Program.id)
 
 
 class ProgramService:
@@ -21,53 +27,62 @@ class ProgramService:
         filters: ProgramFilters | None = None,
         page: int = 1,
         per_page: int = 20,
+        cursor: str | None = None,
+        include_total: bool | None = None,
+        estimate_total: bool = False,
     ) -> ProgramListResponse:
-        """Lista programas con filtros y paginación."""
-        query = self.db.query(Program).options(joinedload(Program.institution))
-
-        # Aplicar filtros
-        if filters:
-            if filters.area:
-                query = query.filter(Program.area == filters.area)
-            if filters.type:
-                query = query.filter(Program.type == filters.type)
-            if filters.modality:
-                query = query.filter(Program.modality == filters.modality)
-            if filters.work_compatible is not None:
-                query = query.filter(Program.work_compatible == filters.work_compatible)
-            if filters.max_duration:
-                query = query.filter(Program.duration_years <= filters.max_duration)
-            if filters.province:
-                query = query.join(Program.institution).filter(
-                    Program.institution.has(province=filters.province)
-                )
-
-        # Contar total
-        total = query.count()
-
-        # Paginación
-        offset = (page - 1) * per_page
-        programs = query.offset(offset).limit(per_page).all()
-
-        # Calcular páginas
-        pages = (total + per_page - 1) // per_page
+        """
+        Lista programas con filtros y paginación.
+
+        Ordena por nombre (e ID). Con `cursor` pagina por keyset en lugar de
+        por número de página; ver `paginate`.
+        """
+        query = programs_query(self.db, filters)
 
         return ProgramListResponse(
-            items=programs,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
+            **paginate(
+                self.db,
+                query,
+                PROGRAM_KEYSET,
+                table=Program.__tablename__,
+                filtered=bool(program_conditions(filters)),
+                page=page,
+                per_page=per_page,
+                cursor=cursor,
+                include_total=include_total,
+                estimate_total_rows=estimate_total,
+            )
         )
 
     def get_by_id(self, program_id: UUID) -> ProgramResponse | None:
         """Obtiene un programa por ID."""
-        program = (
-            self.db.query(Program)
-            .options(joinedload(Program.institution))
-            .filter(Program.id == program_id)
-            .first()
-        )
+        program = programs_query(self.db).filter(Program.id == program_id).first()
         if not program:
             return None
         return ProgramResponse.model_validate(program)
+
+
+class AsyncProgramService(AsyncService[ProgramService]):
+    """Versión async de `ProgramService`."""
+
+    service_class = ProgramService
+
+    async def list(
+        self,
+        filters: ProgramFilters | None = None,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: str | None = None,
+        include_total: bool | None = None,
+        estimate_total: bool = False,
+    ) -> ProgramListResponse:
+        """Lista programas con filtros y paginación."""
+        return await self._run(
+            lambda service: service.list(
+                filters, page, per_page, cursor, include_total, estimate_total
+            )
+        )
+
+    async def get_by_id(self, program_id: UUID) -> ProgramResponse | None:
+        """Obtiene un programa por ID."""
+        return await self._run(lambda service: service.get_by_id(program_id))
@@ -0,0 +1,87 @@
+"""
+Consultas de listado del catálogo.
+
+Cada relación que se filtra o se devuelve se une una sola vez: el mismo
+JOIN sirve para filtrar (p. ej. por provincia de la institución) y para
+poblar la relación con `contains_eager`, en lugar de sumar un `joinedload`
+y un `EXISTS` correlacionado por `has()`.
+"""
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.orm import Query, Session, contains_eager
+
+from src.models.institution import Institution
+from src.models.program import Program
+from src.models.trajectory import Trajectory
+from src.schemas.programs import ProgramFilters
+from src.schemas.trajectories import TrajectoryFilters
+
+
+def program_conditions(filters: ProgramFilters | None) -> list[ColumnElement[bool]]:
+    """Condiciones WHERE para los filtros de programas."""
+    if filters is None:
+        return []
+    conditions: list[ColumnElement[bool]] = []
+    if filters.area:
+        conditions.append(Program.area == filters.area)
+    if filters.type:
+        conditions.append(Program.type == filters.type)
+    if filters.modality:
+        conditions.append(Program.modality == filters.modality)
+    if filters.work_compatible is not None:
+        conditions.append(Program.work_compatible == filters.work_compatible)
+    if filters.max_duration:
+        conditions.append(Program.duration_years <= filters.max_duration)
+    if filters.province:
+        conditions.append(Institution.province == filters.province)
+    return conditions
+
+
+def programs_query(db: Session, filters: ProgramFilters | None = None) -> Query[Program]:
+    """Programas con su institución (un JOIN) y los filtros aplicados."""
+    return (
+        db.query(Program)
+        .join(Program.institution)
+        .options(contains_eager(Program.institution))
+        .filter(*program_conditions(filters))
+    )
+
+
+def trajectory_conditions(filters: TrajectoryFilters | None) -> list[ColumnElement[bool]]:
+    """Condiciones WHERE para los filtros de trayectorias."""
+    if filters is None:
+        return []
+    conditions: list[ColumnElement[bool]] = []
+    if filters.outcome:
+        conditions.append(Trajectory.outcome == filters.outcome)
+    if filters.tags:
+        # Al menos uno de los tags debe coincidir
+        conditions.append(Trajectory.tags.overlap(filters.tags))
+    if filters.area:
+        conditions.append(Program.area == filters.area)
+    return conditions
+
+
+def trajectories_query(
+    db: Session,
+    filters: TrajectoryFilters | None = None,
+    verified_only: bool = True,
+) -> Query[Trajectory]:
+    """
+    Trayectorias con su programa e institución (un JOIN por relación).
+
+    Los JOIN son externos porque una trayectoria puede no tener programa;
+    filtrar por área descarta esas filas igual que un JOIN interno.
+    """
+    query = (
+        db.query(Trajectory)
+        .outerjoin(Trajectory.program)
+        .outerjoin(Program.institution)
+        .options(
+            contains_eager(Trajectory.program).contains_eager(Program.institution),
+        )
+    )
+    if verified_only:
+        # Mismo predicado que el índice parcial idx_trajectories_verified_program
+        query = query.filter(Trajectory.is_verified)
+    return query.filter(*trajectory_conditions(filters))
@@ -0,0 +1,161 @@
+"""
+Cache de resultados del motor de recomendaciones.
+
+Muchos perfiles comparten exactamente los mismos datos relevantes para el
+scoring. Los rankings se guardan en un cache LRU con TTL indexado por la
+huella canónica del perfil, la versión del catálogo y el límite pedido.
+Cada entrada guarda además el JSON del ranking, serializado una sola vez,
+para que los aciertos no vuelvan a serializar los programas.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from src.config import get_settings
+from src.models.profile import Profile
+from src.schemas.recommendations import RecommendedProgram
+from src.services.catalog import catalog_store
+
+# Clave: (huella del perfil, versión del catálogo, límite)
+CacheKey = tuple[str, int, int]
+
+_programs_adapter = TypeAdapter(list[RecommendedProgram])
+
+
+def profile_fingerprint(profile: Profile) -> str:
+    """
+    Huella canónica de los campos del perfil que afectan la recomendación.
+
+    Normaliza los valores equivalentes para el motor (vacíos como None,
+    'no_preference' como sin preferencia, intereses como conjunto ordenado).
+    """
+    modality = profile.preferred_modality
+    canonical = {
+        "province": profile.province or None,
+        "works_while_studying": profile.works_while_studying or None,
+        "preferred_modality": modality if modality and modality != "no_preference" else None,
+        "interest_areas": sorted({area for area in profile.interest_areas or [] if area}),
+    }
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Contadores del cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Proporción de aciertos sobre el total de consultas."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    """Ranking guardado, con su JSON calculado al primer uso."""
+
+    expires_at: float
+    programs: list[RecommendedProgram]
+    programs_json: bytes | None = None
+
+
+class RecommendationCache:
+    """Cache LRU acotado con expiración por TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """True si el cache puede guardar resultados."""
+        return self.maxsize > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> list[RecommendedProgram] | None:
+        """Retorna el ranking guardado o None si no está o expiró."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                    self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.programs
+
+    def programs_json(self, key: CacheKey, programs: list[RecommendedProgram]) -> bytes | None:
+        """
+        JSON del ranking guardado en `key`, serializado una sola vez.
+
+        Retorna None si la entrada ya no está o guarda otro ranking.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.programs is not programs:
+            return None
+        # Se serializa fuera del lock; dos hilos a lo sumo repiten el trabajo
+        if entry.programs_json is None:
+            entry.programs_json = _programs_adapter.dump_json(programs)
+        return entry.programs_json
+
+    def put(self, key: CacheKey, programs: list[RecommendedProgram]) -> None:
+        """Guarda un ranking, desalojando los menos usados si hace falta."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = _Entry(time.monotonic() + self.ttl, programs)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Descarta todos los resultados (p. ej. al cambiar el catálogo)."""
+        with self._lock:
+            if self._entries:
+                self.stats.invalidations += 1
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Estado actual del cache y sus contadores."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "invalidations": self.stats.invalidations,
+            "hit_ratio": round(self.stats.hit_ratio, 4),
+        }
+
+
+settings = get_settings()
+
+recommendation_cache = RecommendationCache(
+    maxsize=settings.recommendation_cache_size,
+    ttl=settings.recommendation_cache_ttl,
+)
+
+# Un cambio en programas, instituciones o trayectorias invalida los rankings
+catalog_store.add_listener(recommendation_cache.clear)
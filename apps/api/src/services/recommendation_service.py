@@ -4,22 +4,65 @@ Servicio de recomendaciones.
 Motor de recomendaciones v1 basado en reglas explicables.
 """
 
-from uuid import UUID
-
+import heapq
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Row, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
+from src.config import get_settings
+from src.metrics import registry
 from src.models.profile import Profile
 from src.models.program import Program
 from src.models.recommendation import Recommendation
 from src.models.trajectory import Trajectory
+from src.schemas.profiles import ProfileCreate
+from src.schemas.programs import InstitutionBrief
 from src.schemas.recommendations import (
+    BulkRecommendationError,
     MatchedTrajectory,
     ReasonDetail,
     RecommendationResponse,
     RecommendedProgram,
     RecommendedProgramBrief,
 )
-from src.schemas.programs import InstitutionBrief
+from src.services.async_service import AsyncService
+from src.services.bulk_scoring import bulk_scorer
+from src.services.catalog import CatalogProgram, ProgramCatalog, catalog_store
+from src.services.factor_cache import ProfileFactorCache, profile_factor_cache
+from src.services.profile_service import profile_row
+from src.services.recommendation_cache import (
+    CacheKey,
+    RecommendationCache,
+    profile_fingerprint,
+    recommendation_cache,
+)
+from src.services.recommendation_writer import (
+    RecommendationWriter,
+    WriteBehindFull,
+    recommendation_row,
+    recommendation_writer,
+)
+from src.services.scoring import ScoringInputs, rank_catalog, rank_scores, total_scores
+
+# Programa seleccionado con su score y sus razones
+ScoredProgram = tuple[CatalogProgram, float, list[ReasonDetail]]
+
+# Duración de cada fase de `generate`: cargar perfil y catálogo, puntuar,
+# seleccionar (trayectorias y armado de la respuesta) y persistir
+recommendation_phase_duration = registry.histogram(
+    "recommendation_phase_duration_seconds",
+    "Duración de cada fase de la generación de recomendaciones.",
+    labels=("phase",),
+)
+_load_phase = recommendation_phase_duration.labels("load")
+_score_phase = recommendation_phase_duration.labels("score")
+_select_phase = recommendation_phase_duration.labels("select")
+_persist_phase = recommendation_phase_duration.labels("persist")
 
 
 class RecommendationService:
@@ -32,6 +75,10 @@ class RecommendationService:
     - modality_match: Coincidencia de modalidad (0.15)
     - location: Disponibilidad en la provincia (0.1)
     - duration: Preferencia por duraciones menores (0.1)
+
+    Motores de scoring (ver `Settings.recommendation_engine`):
+    - rules: evalúa `_calculate_score` programa por programa (referencia)
+    - vectorized: evalúa todo el catálogo con NumPy; mismos scores y razones
     """
 
     # Pesos de cada factor
@@ -43,86 +90,285 @@ class RecommendationService:
         "duration": 0.10,
     }
 
-    def __init__(self, db: Session):
+    # Máximo de trayectorias similares por programa recomendado
+    MAX_MATCHED_TRAJECTORIES = 3
+
+    def __init__(
+        self,
+        db: Session,
+        engine: str | None = None,
+        cache: RecommendationCache | None = recommendation_cache,
+        writer: RecommendationWriter | None = None,
+        factor_cache: ProfileFactorCache | None = profile_factor_cache,
+    ):
+        settings = get_settings()
         self.db = db
+        self.engine = engine or settings.recommendation_engine
+        self.cache = cache
+        self.factor_cache = factor_cache
+        if writer is None and settings.recommendation_write_behind:
+            writer = recommendation_writer
+        self.writer = writer
 
     def generate(self, profile_id: UUID, limit: int = 10) -> RecommendationResponse:
         """Genera recomendaciones para un perfil."""
-        # Obtener perfil
+        with _load_phase.time():
+            profile = self._load_profile(profile_id)
+
+            # Obtener el catálogo compilado (sin hidratar modelos ORM)
+            catalog = catalog_store.get(self.db)
+
+        # Perfiles equivalentes comparten el ranking mientras no cambie el catálogo
+        cache_key = self._cache_key(profile, catalog, limit)
+        recommended_programs = self.cache.get(cache_key) if self.cache is not None else None
+        if recommended_programs is None:
+            recommended_programs = self._recommend(profile, catalog, limit)
+            if self.cache is not None:
+                self.cache.put(cache_key, recommended_programs)
+
+        recommendation = self._response(profile_id, cache_key, recommended_programs)
+        with _persist_phase.time():
+            self._persist(recommendation)
+
+        return recommendation
+
+    def _load_profile(self, profile_id: UUID) -> Profile:
+        """Obtiene el perfil o lanza `ValueError` si no existe."""
         profile = self.db.query(Profile).filter(Profile.id == profile_id).first()
         if not profile:
             raise ValueError("Perfil no encontrado")
+        return profile
+
+    def _response(
+        self, profile_id: UUID, cache_key: CacheKey, programs: list[RecommendedProgram]
+    ) -> RecommendationResponse:
+        """Arma la recomendación a guardar y devolver."""
+        recommendation = RecommendationResponse(
+            id=uuid4(),
+            profile_id=profile_id,
+            created_at=datetime.now(UTC),
+            programs=programs,
+        )
+        # Los aciertos del cache reutilizan el JSON ya serializado del ranking
+        if self.cache is not None:
+            programs_json = self.cache.programs_json(cache_key, programs)
+            if programs_json is not None:
+                recommendation.set_serialized("programs", programs_json)
+        return recommendation
+
+    def rank(self, profile: Profile, limit: int = 10) -> list[RecommendedProgram]:
+        """Calcula el ranking para un perfil sin guardarlo ni usar el cache."""
+        return self._recommend(profile, catalog_store.get(self.db), limit)
+
+    def _persist(self, recommendation: RecommendationResponse) -> None:
+        """Guarda la recomendación, en línea o diferida según la configuración."""
+        # En modo write-behind la fila se inserta luego, en lote
+        if self.writer is not None:
+            try:
+                self.writer.submit(recommendation)
+                return
+            except WriteBehindFull:
+                # Backpressure: con la cola llena se persiste en línea
+                pass
+
+        # Guardar recomendación
+        self.db.add(Recommendation(**recommendation_row(recommendation)))
+        self.db.commit()
+
+    def generate_bulk(
+        self,
+        profile_ids: list[UUID],
+        profiles: list[ProfileCreate],
+        limit: int = 10,
+    ) -> Iterator[RecommendationResponse | BulkRecommendationError]:
+        """
+        Genera recomendaciones para un lote de perfiles.
+
+        Todos los perfiles se puntúan contra el mismo snapshot del catálogo
+        (en un pool de procesos si el lote es grande) y cada resultado se
+        produce apenas está listo. Los perfiles nuevos se insertan antes de
+        empezar y las recomendaciones de cada bloque se confirman (un INSERT
+        masivo por bloque) antes de producirlo: todo ID entregado ya está
+        guardado, aunque el cliente corte el stream.
+        """
+        settings = get_settings()
+        now = datetime.now(UTC)
 
-        # Obtener todos los programas
-        programs = (
-            self.db.query(Program)
-            .options(joinedload(Program.institution))
-            .all()
+        existing = (
+            self.db.query(Profile).filter(Profile.id.in_(profile_ids)).all() if profile_ids else []
         )
+        by_id = {profile.id: profile for profile in existing}
+        for profile_id in profile_ids:
+            if profile_id not in by_id:
+                yield BulkRecommendationError(profile_id=profile_id, error="Perfil no encontrado")
+
+        created = [
+            Profile(id=uuid4(), created_at=now, **data.model_dump(mode="json")) for data in profiles
+        ]
+        if created:
+            self.db.execute(insert(Profile), [profile_row(profile) for profile in created])
+            self.db.commit()
+        targets = [by_id[profile_id] for profile_id in profile_ids if profile_id in by_id]
+        targets += created
+
+        catalog = catalog_store.get(self.db)
+
+        def respond(profile: Profile, programs: list[RecommendedProgram]):
+            return RecommendationResponse(
+                id=uuid4(),
+                profile_id=profile.id,
+                created_at=now,
+                programs=programs,
+            )
 
-        # Calcular scores
-        scored_programs = []
-        for program in programs:
-            score, reasons = self._calculate_score(profile, program)
-            if score > 0:
-                matched_trajectories = self._find_matching_trajectories(profile, program)
-                scored_programs.append({
-                    "program": program,
-                    "score": score,
-                    "reasons": reasons,
-                    "matched_trajectories": matched_trajectories,
-                })
-
-        # Ordenar por score y limitar
-        scored_programs.sort(key=lambda x: x["score"], reverse=True)
-        top_programs = scored_programs[:limit]
-
-        # Crear respuesta
-        recommended_programs = [
+        # Los rankings ya cacheados se devuelven primero
+        cached_results: list[RecommendationResponse] = []
+        pending: list[tuple[int, ScoringInputs]] = []
+        for index, profile in enumerate(targets):
+            cached = (
+                self.cache.get(self._cache_key(profile, catalog, limit))
+                if self.cache is not None
+                else None
+            )
+            if cached is not None:
+                cached_results.append(respond(profile, cached))
+            else:
+                pending.append((index, ScoringInputs.from_profile(profile)))
+        yield from self._persist_bulk(cached_results)
+
+        chunks = bulk_scorer.rank(
+            catalog,
+            self.WEIGHTS,
+            pending,
+            limit,
+            use_pool=len(pending) >= settings.bulk_process_pool_threshold,
+        )
+        for chunk in chunks:
+            top_programs = {
+                index: self._with_reasons(targets[index], catalog, positions, scores)
+                for index, positions, scores in chunk
+            }
+            # Una consulta de trayectorias por bloque de perfiles
+            trajectories = self._load_trajectories(
+                {program.id for top in top_programs.values() for program, _, _ in top}
+            )
+            results = []
+            for index, top in top_programs.items():
+                profile = targets[index]
+                programs = self._build_recommended(profile, top, trajectories)
+                if self.cache is not None:
+                    self.cache.put(self._cache_key(profile, catalog, limit), programs)
+                results.append(respond(profile, programs))
+            yield from self._persist_bulk(results)
+
+    def _persist_bulk(
+        self, results: list[RecommendationResponse]
+    ) -> Iterator[RecommendationResponse]:
+        """Guarda un bloque de recomendaciones y luego lo produce."""
+        if results:
+            self.db.execute(insert(Recommendation), [recommendation_row(r) for r in results])
+            self.db.commit()
+        yield from results
+
+    @staticmethod
+    def _cache_key(profile: Profile, catalog: ProgramCatalog, limit: int) -> CacheKey:
+        """Clave del cache de rankings para un perfil."""
+        return (profile_fingerprint(profile), catalog.version, limit)
+
+    def _recommend(
+        self, profile: Profile, catalog: ProgramCatalog, limit: int
+    ) -> list[RecommendedProgram]:
+        """Calcula el ranking de programas recomendados para un perfil."""
+        with _score_phase.time():
+            top_programs = self._score(profile, catalog, limit)
+
+        # Trayectorias solo para los programas seleccionados, en una consulta
+        with _select_phase.time():
+            trajectories = self._load_trajectories({program.id for program, _, _ in top_programs})
+            return self._build_recommended(profile, top_programs, trajectories)
+
+    def _score(self, profile: Profile, catalog: ProgramCatalog, limit: int) -> list[ScoredProgram]:
+        """Calcula scores y se queda con los mejores (solo CPU, sin consultar la BD)."""
+        if self.engine == "rules":
+            return self._rank_with_rules(profile, catalog, limit)
+        return self._rank_vectorized(profile, catalog, limit)
+
+    def _build_recommended(
+        self,
+        profile: Profile,
+        top_programs: list[ScoredProgram],
+        trajectories: dict[UUID, list[Row]],
+    ) -> list[RecommendedProgram]:
+        """Arma los programas recomendados con sus trayectorias similares."""
+        return [
             RecommendedProgram(
-                program_id=p["program"].id,
-                program=RecommendedProgramBrief(
-                    id=p["program"].id,
-                    name=p["program"].name,
-                    institution=InstitutionBrief(
-                        id=p["program"].institution.id,
-                        name=p["program"].institution.name,
-                        short_name=p["program"].institution.short_name,
-                    ),
+                program_id=program.id,
+                program=self._program_brief(program),
+                score=round(score, 3),
+                reasons=reasons,
+                matched_trajectories=self._match_trajectories(
+                    profile, trajectories.get(program.id, [])
                 ),
-                score=round(p["score"], 3),
-                reasons=p["reasons"],
-                matched_trajectories=p["matched_trajectories"],
             )
-            for p in top_programs
+            for program, score, reasons in top_programs
         ]
 
-        # Guardar recomendación
-        recommendation = Recommendation(
-            profile_id=profile_id,
-            programs=[
-                {
-                    "program_id": str(rp.program_id),
-                    "score": rp.score,
-                    "reasons": [r.model_dump(mode='json') for r in rp.reasons],
-                    "matched_trajectories": [mt.model_dump(mode='json') for mt in rp.matched_trajectories],
-                }
-                for rp in recommended_programs
-            ],
-        )
-        self.db.add(recommendation)
-        self.db.commit()
-        self.db.refresh(recommendation)
+    def _rank_with_rules(
+        self, profile: Profile, catalog: ProgramCatalog, limit: int
+    ) -> list[ScoredProgram]:
+        """
+        Evalúa las reglas programa por programa (motor de referencia).
 
-        return RecommendationResponse(
-            id=recommendation.id,
-            profile_id=profile_id,
-            created_at=recommendation.created_at,
-            programs=recommended_programs,
-        )
+        Mantiene solo los `limit` mejores en un heap acotado; a igual score
+        desempata por ID de programa (posición en el catálogo).
+        """
+
+        def scored_programs():
+            for position in range(len(catalog)):
+                program = catalog.program(position)
+                score, reasons = self._calculate_score(profile, program)
+                if score > 0:
+                    yield position, program, score, reasons
+
+        top_programs = heapq.nsmallest(limit, scored_programs(), key=lambda x: (-x[2], x[0]))
+        return [(program, score, reasons) for _, program, score, reasons in top_programs]
+
+    def _rank_vectorized(
+        self, profile: Profile, catalog: ProgramCatalog, limit: int
+    ) -> list[ScoredProgram]:
+        """
+        Calcula los scores de todo el catálogo con NumPy.
+
+        Con el cache de factores, un perfil ya puntuado solo recalcula los
+        factores que dependen de los campos modificados. Las razones se
+        construyen solo para los programas seleccionados.
+        """
+        if self.factor_cache is not None and profile.id is not None:
+            rows = self.factor_cache.rows(
+                profile.id, catalog, ScoringInputs.from_profile(profile), self.WEIGHTS
+            )
+            positions, scores = rank_scores(total_scores(rows), limit)
+        else:
+            positions, scores = rank_catalog(catalog, profile, self.WEIGHTS, limit)
+        return self._with_reasons(profile, catalog, positions, scores)
+
+    def _with_reasons(
+        self,
+        profile: Profile,
+        catalog: ProgramCatalog,
+        positions: list[int],
+        scores: list[float],
+    ) -> list[ScoredProgram]:
+        """Materializa los programas ganadores y construye sus razones."""
+        top_programs = []
+        for position, score in zip(positions, scores, strict=True):
+            program = catalog.program(position)
+            _, reasons = self._calculate_score(profile, program)
+            top_programs.append((program, score, reasons))
+        return top_programs
 
     def _calculate_score(
-        self, profile: Profile, program: Program
+        self, profile: Profile, program: Program | CatalogProgram
     ) -> tuple[float, list[ReasonDetail]]:
         """
         Calcula el score de un programa para un perfil.
@@ -253,18 +499,50 @@ class RecommendationService:
 
         return score, reasons
 
-    def _find_matching_trajectories(
-        self, profile: Profile, program: Program
-    ) -> list[MatchedTrajectory]:
-        """Encuentra trayectorias que coinciden con el perfil y programa."""
-        trajectories = (
-            self.db.query(Trajectory)
-            .filter(Trajectory.program_id == program.id)
-            .filter(Trajectory.is_verified == True)
-            .limit(3)
-            .all()
+    def _load_trajectories(self, program_ids: set[UUID]) -> dict[UUID, list[Row]]:
+        """
+        Carga las trayectorias verificadas de varios programas.
+
+        Resuelve todos los programas con una única consulta, tomando hasta
+        `MAX_MATCHED_TRAJECTORIES` trayectorias por programa.
+        """
+        loaded: dict[UUID, list[Row]] = {}
+        if not program_ids:
+            return loaded
+
+        ranked = (
+            select(
+                Trajectory.id,
+                Trajectory.program_id,
+                Trajectory.title,
+                Trajectory.tags,
+                Trajectory.context,
+                func.row_number()
+                .over(
+                    partition_by=Trajectory.program_id,
+                    order_by=(Trajectory.created_at, Trajectory.id),
+                )
+                .label("position"),
+            )
+            .where(Trajectory.program_id.in_(program_ids))
+            # Mismo predicado que el índice parcial idx_trajectories_verified_program
+            .where(Trajectory.is_verified)
+            .subquery()
         )
+        trajectories = self.db.execute(
+            select(ranked)
+            .where(ranked.c.position <= self.MAX_MATCHED_TRAJECTORIES)
+            .order_by(ranked.c.program_id, ranked.c.position)
+        ).all()
 
+        for traj in trajectories:
+            loaded.setdefault(traj.program_id, []).append(traj)
+        return loaded
+
+    def _match_trajectories(
+        self, profile: Profile, trajectories: list[Row]
+    ) -> list[MatchedTrajectory]:
+        """Encuentra las trayectorias que coinciden con el perfil."""
         matched = []
         for traj in trajectories:
             match_reason = self._get_trajectory_match_reason(profile, traj)
@@ -279,7 +557,9 @@ class RecommendationService:
 
         return matched
 
-    def _get_trajectory_match_reason(self, profile: Profile, trajectory: Trajectory) -> str | None:
+    def _get_trajectory_match_reason(
+        self, profile: Profile, trajectory: Trajectory | Row
+    ) -> str | None:
         """Determina por qué una trayectoria coincide con el perfil."""
         context = trajectory.context or {}
 
@@ -303,40 +583,34 @@ class RecommendationService:
 
     def get_by_id(self, recommendation_id: UUID) -> RecommendationResponse | None:
         """Obtiene una recomendación por ID."""
+        # Recomendación generada pero aún no persistida
+        if self.writer is not None:
+            pending = self.writer.get(recommendation_id)
+            if pending is not None:
+                return pending
+
         recommendation = (
-            self.db.query(Recommendation)
-            .filter(Recommendation.id == recommendation_id)
-            .first()
+            self.db.query(Recommendation).filter(Recommendation.id == recommendation_id).first()
         )
         if not recommendation:
             return None
 
         # Reconstruir la respuesta desde el JSON guardado
-        programs = []
-        for p in recommendation.programs:
-            # Cargar el programa completo desde la BD
-            program = self.db.query(Program).filter(Program.id == p["program_id"]).first()
-            program_brief = None
-            if program:
-                program_brief = RecommendedProgramBrief(
-                    id=program.id,
-                    name=program.name,
-                    type=program.type,
-                    duration_years=program.duration_years,
-                    modality=program.modality,
-                    area=program.area,
-                    institution_name=program.institution.short_name if program.institution else None,
-                )
-            
-            programs.append(
-                RecommendedProgram(
-                    program_id=p["program_id"],
-                    program=program_brief,
-                    score=p["score"],
-                    reasons=[ReasonDetail(**r) for r in p["reasons"]],
-                    matched_trajectories=[MatchedTrajectory(**mt) for mt in p.get("matched_trajectories", [])],
-                )
+        briefs = self._load_program_briefs([UUID(p["program_id"]) for p in recommendation.programs])
+        programs = [
+            RecommendedProgram(
+                program_id=p["program_id"],
+                program=briefs[UUID(p["program_id"])],
+                score=p["score"],
+                reasons=[ReasonDetail(**r) for r in p["reasons"]],
+                matched_trajectories=[
+                    MatchedTrajectory(**mt) for mt in p.get("matched_trajectories", [])
+                ],
             )
+            for p in recommendation.programs
+            # Los programas eliminados del catálogo se omiten
+            if UUID(p["program_id"]) in briefs
+        ]
 
         return RecommendationResponse(
             id=recommendation.id,
@@ -345,6 +619,48 @@ class RecommendationService:
             programs=programs,
         )
 
+    def _load_program_briefs(self, program_ids: list[UUID]) -> dict[UUID, RecommendedProgramBrief]:
+        """
+        Resuelve los datos breves de varios programas.
+
+        Usa el catálogo compilado si está vigente; los programas que no estén
+        en él se cargan con una única consulta `IN (...)` junto a su institución.
+        """
+        catalog = None if catalog_store.is_stale else catalog_store.current
+        briefs: dict[UUID, RecommendedProgramBrief] = {}
+        missing: list[UUID] = []
+        for program_id in program_ids:
+            position = catalog.position(program_id) if catalog is not None else None
+            if catalog is not None and position is not None:
+                briefs[program_id] = self._program_brief(catalog.program(position))
+            else:
+                missing.append(program_id)
+
+        if missing:
+            programs = (
+                self.db.query(Program)
+                .options(joinedload(Program.institution))
+                .filter(Program.id.in_(missing))
+                .all()
+            )
+            for program in programs:
+                briefs[program.id] = self._program_brief(program)
+
+        return briefs
+
+    @staticmethod
+    def _program_brief(program: Program | CatalogProgram) -> RecommendedProgramBrief:
+        """Construye el programa breve de una recomendación."""
+        return RecommendedProgramBrief(
+            id=program.id,
+            name=program.name,
+            institution=InstitutionBrief(
+                id=program.institution.id,
+                name=program.institution.name,
+                short_name=program.institution.short_name,
+            ),
+        )
+
     @staticmethod
     def _area_display_name(area: str) -> str:
         """Convierte el código de área a nombre legible."""
@@ -384,3 +700,70 @@ class RecommendationService:
             "flexible": "horario flexible",
         }
         return names.get(shift, shift)
+
+
+class AsyncRecommendationService(AsyncService[RecommendationService]):
+    """
+    Versión async de `RecommendationService`.
+
+    Los lotes (`generate_bulk`) no tienen versión async: son trabajo de CPU
+    que se emite en streaming y corren con la sesión sincrónica.
+    """
+
+    service_class = RecommendationService
+
+    def __init__(
+        self,
+        db: AsyncSession | Session,
+        engine: str | None = None,
+        cache: RecommendationCache | None = recommendation_cache,
+        writer: RecommendationWriter | None = None,
+        factor_cache: ProfileFactorCache | None = profile_factor_cache,
+    ):
+        super().__init__(db)
+        self.engine = engine
+        self.cache = cache
+        self.writer = writer
+        self.factor_cache = factor_cache
+
+    def _service(self, session: Session) -> RecommendationService:
+        return RecommendationService(
+            session, self.engine, self.cache, self.writer, self.factor_cache
+        )
+
+    async def generate(self, profile_id: UUID, limit: int = 10) -> RecommendationResponse:
+        """
+        Genera recomendaciones para un perfil.
+
+        Con una `AsyncSession` las consultas corren sobre ella y solo el
+        scoring va al threadpool (ver `src.services.async_service`).
+        """
+        db = self.db
+        if not isinstance(db, AsyncSession):
+            return await self._run(lambda service: service.generate(profile_id, limit))
+
+        service = self._service(db.sync_session)
+        with _load_phase.time():
+            profile = await db.run_sync(lambda _: service._load_profile(profile_id))
+            catalog = await catalog_store.get_async(db)
+
+        cache_key = service._cache_key(profile, catalog, limit)
+        programs = self.cache.get(cache_key) if self.cache is not None else None
+        if programs is None:
+            with _score_phase.time():
+                top_programs = await run_in_threadpool(service._score, profile, catalog, limit)
+            with _select_phase.time():
+                program_ids = {program.id for program, _, _ in top_programs}
+                trajectories = await db.run_sync(lambda _: service._load_trajectories(program_ids))
+                programs = service._build_recommended(profile, top_programs, trajectories)
+            if self.cache is not None:
+                self.cache.put(cache_key, programs)
+
+        recommendation = service._response(profile_id, cache_key, programs)
+        with _persist_phase.time():
+            await db.run_sync(lambda _: service._persist(recommendation))
+        return recommendation
+
+    async def get_by_id(self, recommendation_id: UUID) -> RecommendationResponse | None:
+        """Obtiene una recomendación por ID."""
+        return await self._run(lambda service: service.get_by_id(recommendation_id))
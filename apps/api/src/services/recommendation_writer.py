@@ -0,0 +1,128 @@
+"""
+Persistencia diferida de recomendaciones.
+
+En modo write-behind la respuesta se devuelve con un ID y `created_at`
+generados de antemano y la fila `Recommendation` se inserta luego, en
+lotes, desde un hilo de fondo. Mientras tanto la recomendación queda en
+un buffer en memoria para que GET /recommendations/{id} pueda servirla.
+"""
+
+import threading
+from collections.abc import Callable
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.database import SessionLocal
+from src.models.recommendation import Recommendation
+from src.schemas.recommendations import RecommendationResponse
+from src.services.write_behind import WriteBehindFull, WriteBehindQueue
+
+__all__ = [
+    "RecommendationWriter",
+    "WriteBehindFull",
+    "recommendation_row",
+    "recommendation_writer",
+]
+
+
+def recommendation_row(recommendation: RecommendationResponse) -> dict:
+    """Fila de la tabla `recommendations` para una respuesta generada."""
+    return {
+        "id": recommendation.id,
+        "profile_id": recommendation.profile_id,
+        "created_at": recommendation.created_at,
+        "programs": [
+            {
+                "program_id": str(rp.program_id),
+                "score": rp.score,
+                "reasons": [r.model_dump(mode="json") for r in rp.reasons],
+                "matched_trajectories": [
+                    mt.model_dump(mode="json") for mt in rp.matched_trajectories
+                ],
+            }
+            for rp in recommendation.programs
+        ],
+    }
+
+
+class RecommendationWriter:
+    """Escritor write-behind de recomendaciones con buffer de lectura."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        maxsize: int = 10_000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        put_timeout: float = 0.05,
+    ):
+        self.session_factory = session_factory
+        self._in_flight: dict[UUID, RecommendationResponse] = {}
+        self._lock = threading.Lock()
+        self.queue: WriteBehindQueue[RecommendationResponse] = WriteBehindQueue(
+            "recommendation-writer",
+            write=self._write,
+            maxsize=maxsize,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            put_timeout=put_timeout,
+            on_done=self._release,
+        )
+
+    def submit(self, recommendation: RecommendationResponse) -> None:
+        """
+        Encola una recomendación para persistirla.
+
+        Lanza `WriteBehindFull` si la cola sigue llena tras la espera.
+        """
+        with self._lock:
+            self._in_flight[recommendation.id] = recommendation
+        try:
+            self.queue.submit(recommendation)
+        except WriteBehindFull:
+            self._release([recommendation])
+            raise
+
+    def get(self, recommendation_id: UUID) -> RecommendationResponse | None:
+        """Retorna una recomendación aún no persistida."""
+        return self._in_flight.get(recommendation_id)
+
+    def start(self) -> None:
+        """Inicia el hilo de escritura."""
+        self.queue.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Detiene el hilo drenando las recomendaciones pendientes."""
+        self.queue.stop(timeout)
+
+    def flush(self) -> int:
+        """Persiste sincrónicamente todo lo pendiente."""
+        return self.queue.flush()
+
+    def _write(self, batch: list[RecommendationResponse]) -> None:
+        """Inserta el lote con un único INSERT multi-fila."""
+        db = self.session_factory()
+        try:
+            db.execute(insert(Recommendation), [recommendation_row(r) for r in batch])
+            db.commit()
+        finally:
+            db.close()
+
+    def _release(self, batch: list[RecommendationResponse]) -> None:
+        with self._lock:
+            for recommendation in batch:
+                self._in_flight.pop(recommendation.id, None)
+
+
+settings = get_settings()
+
+recommendation_writer = RecommendationWriter(
+    SessionLocal,
+    maxsize=settings.write_behind_queue_size,
+    batch_size=settings.write_behind_batch_size,
+    flush_interval=settings.write_behind_flush_interval,
+    put_timeout=settings.write_behind_put_timeout,
+)
@@ -0,0 +1,259 @@
+"""
+Scoring vectorizado del motor de recomendaciones.
+
+Implementa las mismas reglas que `RecommendationService._calculate_score`,
+pero evaluadas con operaciones de NumPy sobre todas las columnas del
+catálogo compilado a la vez. El perfil se codifica una sola vez contra los
+vocabularios del catálogo.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+from src.models.profile import Profile
+from src.services.catalog import MISSING_CODE, ProgramCatalog
+
+# Orden de los factores (y de la suma del score, para obtener los mismos floats)
+FACTORS = (
+    "interest_match",
+    "work_compatible",
+    "modality_match",
+    "location",
+    "duration",
+)
+
+# Campos del perfil de los que depende cada factor
+FACTOR_FIELDS: dict[str, frozenset[str]] = {
+    "interest_match": frozenset({"interest_areas"}),
+    "work_compatible": frozenset({"works_while_studying"}),
+    "modality_match": frozenset({"preferred_modality"}),
+    "location": frozenset({"province"}),
+    "duration": frozenset(),
+}
+
+
+class ScoringInputs(NamedTuple):
+    """
+    Campos del perfil que intervienen en el scoring.
+
+    Permite puntuar sin un objeto ORM (p. ej. en otro proceso).
+    """
+
+    province: str | None
+    works_while_studying: str | None
+    preferred_modality: str | None
+    interest_areas: list[str] | None
+
+    @classmethod
+    def from_profile(cls, profile: Profile) -> "ScoringInputs":
+        """Extrae los campos relevantes de un perfil."""
+        return cls(
+            province=profile.province,
+            works_while_studying=profile.works_while_studying,
+            preferred_modality=profile.preferred_modality,
+            interest_areas=list(profile.interest_areas) if profile.interest_areas else None,
+        )
+
+
+@dataclass(frozen=True)
+class EncodedProfile:
+    """Perfil codificado contra los vocabularios de un catálogo."""
+
+    interest_codes: np.ndarray  # códigos de área de los intereses
+    works: bool  # trabaja o podría trabajar mientras estudia
+    modality_code: int | None  # None si no tiene preferencia
+    province_code: int | None  # None si no informó provincia
+
+
+def encode_profile(catalog: ProgramCatalog, profile: Profile | ScoringInputs) -> EncodedProfile:
+    """Codifica los campos del perfil que intervienen en el scoring."""
+    interest_codes = [catalog.code("area", area) for area in (profile.interest_areas or []) if area]
+    modality = profile.preferred_modality
+    return EncodedProfile(
+        interest_codes=np.array(
+            [code for code in interest_codes if code != MISSING_CODE], dtype=np.int16
+        ),
+        works=profile.works_while_studying in ["yes", "maybe"],
+        modality_code=(
+            catalog.code("modality", modality) if modality and modality != "no_preference" else None
+        ),
+        province_code=catalog.code("province", profile.province) if profile.province else None,
+    )
+
+
+def _interest_match(
+    catalog: ProgramCatalog, profile: EncodedProfile, weights: Mapping[str, float]
+) -> np.ndarray | None:
+    if not profile.interest_codes.size:
+        return None
+    return np.where(np.isin(catalog.area, profile.interest_codes), weights["interest_match"], 0.0)
+
+
+def _work_compatible(
+    catalog: ProgramCatalog, profile: EncodedProfile, weights: Mapping[str, float]
+) -> np.ndarray | None:
+    if not profile.works:
+        return None
+    weight = weights["work_compatible"]
+    compatible = catalog.work_compatible == 1
+    evening = catalog.shift == catalog.code("shift", "evening")
+    return np.where(compatible, weight, np.where(evening, weight * 0.7, 0.0))
+
+
+def _modality_match(
+    catalog: ProgramCatalog, profile: EncodedProfile, weights: Mapping[str, float]
+) -> np.ndarray | None:
+    if profile.modality_code is None:
+        return None
+    weight = weights["modality_match"]
+    same = catalog.modality == profile.modality_code
+    hybrid = catalog.modality == catalog.code("modality", "hybrid")
+    return np.where(same, weight, np.where(hybrid, weight * 0.5, 0.0))
+
+
+def _location(
+    catalog: ProgramCatalog, profile: EncodedProfile, weights: Mapping[str, float]
+) -> np.ndarray | None:
+    if profile.province_code is None:
+        return None
+    weight = weights["location"]
+    same = catalog.province == profile.province_code
+    remote = catalog.modality == catalog.code("modality", "remote")
+    return np.where(same, weight, np.where(remote, weight * 0.8, 0.0))
+
+
+def _duration(
+    catalog: ProgramCatalog, _profile: EncodedProfile, weights: Mapping[str, float]
+) -> np.ndarray:
+    # NaN y 0 no suman, igual que en el motor por reglas
+    weight = weights["duration"]
+    duration = catalog.duration
+    with np.errstate(invalid="ignore"):
+        has_duration = ~np.isnan(duration) & (duration != 0)
+        return np.where(
+            has_duration & (duration <= 3),
+            weight,
+            np.where(has_duration & (duration <= 5), weight * 0.5, 0.0),
+        )
+
+
+# Cálculo de cada factor; None equivale a una fila de ceros
+_FACTOR_ROWS = {
+    "interest_match": _interest_match,
+    "work_compatible": _work_compatible,
+    "modality_match": _modality_match,
+    "location": _location,
+    "duration": _duration,
+}
+
+
+def factor_row(
+    catalog: ProgramCatalog,
+    profile: EncodedProfile,
+    weights: Mapping[str, float],
+    factor: str,
+) -> np.ndarray:
+    """Contribución de un factor para todo el catálogo."""
+    row = _FACTOR_ROWS[factor](catalog, profile, weights) if len(catalog) else None
+    return np.zeros(len(catalog), dtype=np.float64) if row is None else row
+
+
+def factor_contributions(
+    catalog: ProgramCatalog,
+    profile: EncodedProfile,
+    weights: Mapping[str, float],
+) -> np.ndarray:
+    """
+    Calcula la contribución de cada factor para todo el catálogo.
+
+    Retorna una matriz de forma (len(FACTORS), len(catalog)).
+    """
+    contributions = np.zeros((len(FACTORS), len(catalog)), dtype=np.float64)
+    for i, factor in enumerate(FACTORS):
+        contributions[i] = factor_row(catalog, profile, weights, factor)
+    return contributions
+
+
+def changed_fields(before: ScoringInputs, after: ScoringInputs) -> set[str]:
+    """Campos de scoring que difieren entre dos versiones de un perfil."""
+    return {
+        field
+        for field, old, new in zip(ScoringInputs._fields, before, after, strict=True)
+        if old != new
+    }
+
+
+def changed_factors(before: ScoringInputs, after: ScoringInputs) -> set[str]:
+    """Factores afectados por las diferencias entre dos versiones de un perfil."""
+    return factors_for_fields(changed_fields(before, after))
+
+
+def factors_for_fields(fields: Iterable[str]) -> set[str]:
+    """Factores que dependen de alguno de los campos del perfil indicados."""
+    fields = set(fields)
+    return {factor for factor, depends_on in FACTOR_FIELDS.items() if depends_on & fields}
+
+
+def total_scores(contributions: np.ndarray | Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Suma las contribuciones en el mismo orden que el motor por reglas.
+
+    Sumar factor por factor (y no con `sum(axis=0)`) garantiza resultados
+    idénticos bit a bit a la acumulación secuencial de `_calculate_score`.
+    Acepta la matriz de `factor_contributions` o una fila por factor.
+    """
+    scores = np.zeros(len(contributions[0]), dtype=np.float64)
+    for row in contributions:
+        scores += row
+    return scores
+
+
+def score_catalog(
+    catalog: ProgramCatalog,
+    profile: Profile | ScoringInputs,
+    weights: Mapping[str, float],
+) -> np.ndarray:
+    """Calcula el score de todos los programas del catálogo para un perfil."""
+    encoded = encode_profile(catalog, profile)
+    return total_scores(factor_contributions(catalog, encoded, weights))
+
+
+def select_top(scores: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Selecciona las posiciones de los `limit` mejores scores positivos.
+
+    Usa una selección parcial (O(n)) en lugar de ordenar todo el catálogo y
+    ordena solo los candidatos: por score descendente y, a igual score, por
+    posición en el catálogo (es decir, por ID de programa), de modo que el
+    resultado es determinístico.
+    """
+    candidates = np.flatnonzero(scores > 0)
+    if limit <= 0:
+        return candidates[:0]
+    if candidates.size > limit:
+        candidate_scores = scores[candidates]
+        kth = candidates.size - limit
+        # Umbral del k-ésimo mejor score; se conservan todos los empates
+        threshold = candidate_scores[np.argpartition(candidate_scores, kth)[kth]]
+        candidates = candidates[candidate_scores >= threshold]
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order][:limit]
+
+
+def rank_catalog(
+    catalog: ProgramCatalog,
+    profile: Profile | ScoringInputs,
+    weights: Mapping[str, float],
+    limit: int,
+) -> tuple[list[int], list[float]]:
+    """Posiciones y scores de los `limit` mejores programas para un perfil."""
+    return rank_scores(score_catalog(catalog, profile, weights), limit)
+
+
+def rank_scores(scores: np.ndarray, limit: int) -> tuple[list[int], list[float]]:
+    """Posiciones y scores de los `limit` mejores scores ya calculados."""
+    top = select_top(scores, limit)
+    return top.tolist(), scores[top].tolist()
@@ -0,0 +1,209 @@
+"""
+Servicio de búsqueda de texto sobre programas y trayectorias.
+
+En Postgres usa las columnas `search_vector` (tsvector con la configuración
+`es_unaccent`: español sin acentos) y sus índices GIN, ordenando por
+`ts_rank_cd`. Si una búsqueda de programas no encuentra nada, reintenta por
+similitud de trigramas (pg_trgm) sobre el nombre, lo que tolera errores de
+tipeo como "ingeneria sistemas". Las columnas y los índices los crea la
+migración 003 y no están mapeados en los modelos.
+
+En otras bases (SQLite, tests) usa el índice en memoria de `text_search`.
+"""
+
+from typing import NamedTuple
+from uuid import UUID
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.models.program import Program
+from src.models.trajectory import Trajectory
+from src.schemas.programs import ProgramBrief
+from src.schemas.search import (
+    ProgramSearchHit,
+    SearchResponse,
+    SearchScope,
+    TrajectorySearchHit,
+)
+from src.schemas.trajectories import TrajectoryBrief
+from src.services.async_service import AsyncService
+from src.services.query_builder import programs_query, trajectories_query
+from src.services.text_search import CatalogSearchIndex, Ranked, search_index_store
+
+# Configuración de text search creada por la migración 003
+SEARCH_CONFIG = "es_unaccent"
+
+_PROGRAMS_FULL_TEXT = text(
+    f"""
+    SELECT p.id, ts_rank_cd(p.search_vector, q) AS score
+    FROM programs AS p, websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS q
+    WHERE p.search_vector @@ q
+    ORDER BY score DESC, p.id
+    LIMIT :limit
+    """
+)
+
+# Usa el índice GIN de trigramas sobre f_unaccent(lower(name))
+_PROGRAMS_FUZZY = text(
+    """
+    SELECT id, word_similarity(f_unaccent(lower(:query)), f_unaccent(lower(name))) AS score
+    FROM programs
+    WHERE f_unaccent(lower(:query)) <% f_unaccent(lower(name))
+    ORDER BY score DESC, id
+    LIMIT :limit
+    """
+)
+
+_TRAJECTORIES_FULL_TEXT = text(
+    f"""
+    SELECT t.id, ts_rank_cd(t.search_vector, q) AS score
+    FROM trajectories AS t, websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS q
+    WHERE t.is_verified AND t.search_vector @@ q
+    ORDER BY score DESC, t.id
+    LIMIT :limit
+    """
+)
+
+
+class SearchRanking(NamedTuple):
+    """IDs encontrados por relevancia, antes de cargar los resultados."""
+
+    programs: Ranked | None  # None si no se buscaron programas
+    fuzzy: bool
+    trajectories: Ranked | None  # None si no se buscaron trayectorias
+
+
+class SearchService:
+    """Servicio de búsqueda de texto."""
+
+    def __init__(self, db: Session, backend: str | None = None):
+        self.db = db
+        settings = get_settings()
+        backend = backend or settings.search_backend
+        if backend == "auto":
+            backend = "postgres" if db.get_bind().dialect.name == "postgresql" else "memory"
+        self.backend = backend
+        self.fuzzy_threshold = settings.search_fuzzy_threshold
+
+    def search(
+        self,
+        query: str,
+        scope: SearchScope = SearchScope.ALL,
+        limit: int = 20,
+    ) -> SearchResponse:
+        """Busca programas y/o trayectorias, ordenados por relevancia."""
+        index = search_index_store.get(self.db) if self.backend != "postgres" else None
+        return self._respond(query, self._rank(query, scope, limit, index))
+
+    def _rank(
+        self, query: str, scope: SearchScope, limit: int, index: CatalogSearchIndex | None
+    ) -> SearchRanking:
+        """Rankea los resultados; con el índice en memoria no consulta la BD."""
+        programs, fuzzy, trajectories = None, False, None
+        if scope in (SearchScope.ALL, SearchScope.PROGRAMS):
+            programs, fuzzy = self._rank_programs(query, limit, index)
+        if scope in (SearchScope.ALL, SearchScope.TRAJECTORIES):
+            trajectories = self._rank_trajectories(query, limit, index)
+        return SearchRanking(programs, fuzzy, trajectories)
+
+    def _respond(self, query: str, ranking: SearchRanking) -> SearchResponse:
+        """Carga los resultados rankeados."""
+        response = SearchResponse(query=query, fuzzy=ranking.fuzzy)
+        if ranking.programs is not None:
+            response.programs = self._program_hits(ranking.programs)
+        if ranking.trajectories is not None:
+            response.trajectories = self._trajectory_hits(ranking.trajectories)
+        return response
+
+    def _rank_programs(
+        self, query: str, limit: int, index: CatalogSearchIndex | None
+    ) -> tuple[Ranked, bool]:
+        """IDs de programas por relevancia y si se usó el fallback por trigramas."""
+        if index is not None:
+            return index.programs.search(query, limit)
+        params = {"query": query, "limit": limit}
+        ranked = self._ranked(_PROGRAMS_FULL_TEXT, params)
+        if ranked:
+            return ranked, False
+        # Umbral de word_similarity solo para esta transacción
+        self.db.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+            {"threshold": str(self.fuzzy_threshold)},
+        )
+        return self._ranked(_PROGRAMS_FUZZY, params), True
+
+    def _rank_trajectories(
+        self, query: str, limit: int, index: CatalogSearchIndex | None
+    ) -> Ranked:
+        """IDs de trayectorias verificadas por relevancia."""
+        if index is not None:
+            ranked, _ = index.trajectories.search(query, limit, fuzzy=False)
+            return ranked
+        return self._ranked(_TRAJECTORIES_FULL_TEXT, {"query": query, "limit": limit})
+
+    def _ranked(self, statement, params: dict) -> Ranked:
+        return [(row.id, round(float(row.score), 4)) for row in self.db.execute(statement, params)]
+
+    def _program_hits(self, ranked: Ranked) -> list[ProgramSearchHit]:
+        """Carga los programas encontrados (una consulta) respetando el orden."""
+        if not ranked:
+            return []
+        ids = [program_id for program_id, _ in ranked]
+        by_id: dict[UUID, Program] = {
+            program.id: program for program in programs_query(self.db).filter(Program.id.in_(ids))
+        }
+        return [
+            ProgramSearchHit(program=ProgramBrief.model_validate(by_id[program_id]), score=score)
+            for program_id, score in ranked
+            if program_id in by_id
+        ]
+
+    def _trajectory_hits(self, ranked: Ranked) -> list[TrajectorySearchHit]:
+        """Carga las trayectorias encontradas (una consulta) respetando el orden."""
+        if not ranked:
+            return []
+        ids = [trajectory_id for trajectory_id, _ in ranked]
+        by_id: dict[UUID, Trajectory] = {
+            trajectory.id: trajectory
+            for trajectory in trajectories_query(self.db).filter(Trajectory.id.in_(ids))
+        }
+        return [
+            TrajectorySearchHit(
+                trajectory=TrajectoryBrief.model_validate(by_id[trajectory_id]), score=score
+            )
+            for trajectory_id, score in ranked
+            if trajectory_id in by_id
+        ]
+
+
+class AsyncSearchService(AsyncService[SearchService]):
+    """Versión async de `SearchService`."""
+
+    service_class = SearchService
+
+    async def search(
+        self,
+        query: str,
+        scope: SearchScope = SearchScope.ALL,
+        limit: int = 20,
+    ) -> SearchResponse:
+        """
+        Busca programas y/o trayectorias, ordenados por relevancia.
+
+        Con una `AsyncSession` y el índice en memoria, solo la búsqueda en el
+        índice va al threadpool (ver `src.services.async_service`).
+        """
+        db = self.db
+        if not isinstance(db, AsyncSession):
+            return await self._run(lambda service: service.search(query, scope, limit))
+        service = self._service(db.sync_session)
+        if service.backend == "postgres":
+            return await db.run_sync(lambda _: service.search(query, scope, limit))
+
+        index = await search_index_store.get_async(db)
+        ranking = await run_in_threadpool(service._rank, query, scope, limit, index)
+        return await db.run_sync(lambda _: service._respond(query, ranking))
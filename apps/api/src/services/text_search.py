@@ -0,0 +1,264 @@
+"""
+Búsqueda de texto en memoria sobre el catálogo.
+
+Alternativa a la búsqueda de Postgres (tsvector + pg_trgm) para SQLite y los
+tests: un índice invertido por proceso con una normalización equivalente
+(minúsculas, sin acentos ni stopwords y un stemming liviano de plurales y
+género) y pesos por campo. Si ningún documento contiene todos los términos,
+cada término se expande a las palabras de los nombres con trigramas
+parecidos, como el fallback por similitud de pg_trgm.
+
+El índice se construye la primera vez que se usa y se descarta cuando cambia
+el catálogo.
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+from src.models.program import Program
+from src.models.trajectory import Trajectory
+from src.services.async_service import build_lock
+from src.services.catalog import catalog_store
+
+# Palabras vacías del español que no se indexan
+STOPWORDS = frozenset(
+    "a al como con de del e el en es la las lo los o para por se sin su sus u un una y".split()  # noqa: SIM905
+)
+
+# Pesos por campo, equivalentes a los pesos A/B/C de setweight en Postgres
+WEIGHT_A = 1.0
+WEIGHT_B = 0.4
+WEIGHT_C = 0.2
+
+# Saturación de la frecuencia de un término (como k1 en BM25)
+TF_SATURATION = 1.2
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Documento a indexar: (id, [(texto, peso), ...])
+Document = tuple[UUID, Sequence[tuple[str | None, float]]]
+
+# Resultado: (id, score) ordenado por relevancia
+Ranked = list[tuple[UUID, float]]
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y sin acentos ('Ingeniería' -> 'ingenieria')."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def stem(word: str) -> str:
+    """Stemming liviano: quita el plural y la vocal final de género."""
+    if len(word) > 4 and word.endswith("es") and word[-3] not in "aeiou":
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith("s"):
+        word = word[:-1]
+    if len(word) > 4 and word[-1] in "aeo":
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Términos indexables de un texto."""
+    return [stem(word) for word in _WORD.findall(normalize(text)) if word not in STOPWORDS]
+
+
+def trigrams(term: str) -> frozenset[str]:
+    """Trigramas de un término, con el mismo relleno que pg_trgm."""
+    padded = f"  {term} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class InvertedIndex:
+    """
+    Índice invertido con pesos por campo.
+
+    Cada término guarda sus documentos y su frecuencia saturada en arrays de
+    NumPy. Una búsqueda devuelve los documentos que contienen todos los
+    términos de la consulta, ordenados por la suma de idf × frecuencia.
+    """
+
+    def __init__(self, documents: Iterable[Document], fuzzy_threshold: float = 0.4):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.ids: list[UUID] = []
+        frequencies: defaultdict[str, dict[int, float]] = defaultdict(dict)
+        name_terms: set[str] = set()
+        for position, (doc_id, fields) in enumerate(documents):
+            self.ids.append(doc_id)
+            for text, weight in fields:
+                if not text:
+                    continue
+                for term in tokenize(text):
+                    row = frequencies[term]
+                    row[position] = row.get(position, 0.0) + weight
+                    if weight == WEIGHT_A:
+                        name_terms.add(term)
+
+        total = len(self.ids)
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._idf: dict[str, float] = {}
+        for term, row in frequencies.items():
+            docs = np.fromiter(row.keys(), dtype=np.int32, count=len(row))
+            weights = np.fromiter(row.values(), dtype=np.float64, count=len(row))
+            self._postings[term] = (docs, weights / (weights + TF_SATURATION))
+            self._idf[term] = math.log(1 + total / len(row))
+
+        # Vocabulario de los nombres indexado por trigramas (para el fallback)
+        self._term_trigrams = {term: trigrams(term) for term in name_terms}
+        by_trigram: defaultdict[str, set[str]] = defaultdict(set)
+        for term, grams in self._term_trigrams.items():
+            for gram in grams:
+                by_trigram[gram].add(term)
+        self._by_trigram = dict(by_trigram)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: str, limit: int, fuzzy: bool = True) -> tuple[Ranked, bool]:
+        """
+        Busca los documentos más relevantes.
+
+        Retorna los resultados y si se usó la expansión por trigramas.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], False
+        ranked = self._top(self._match([[(term, 1.0)] for term in terms]), limit)
+        if ranked or not fuzzy:
+            return ranked, False
+        expansions = [self._similar_terms(term) for term in terms]
+        return self._top(self._match(expansions), limit), True
+
+    def _similar_terms(self, term: str) -> list[tuple[str, float]]:
+        """Términos de los nombres parecidos a `term`, con su similitud."""
+        grams = trigrams(term)
+        candidates: set[str] = set()
+        for gram in grams:
+            candidates |= self._by_trigram.get(gram, set())
+        similar = []
+        for candidate in candidates:
+            other = self._term_trigrams[candidate]
+            similarity = len(grams & other) / len(grams | other)
+            if similarity >= self.fuzzy_threshold:
+                similar.append((candidate, similarity))
+        return similar
+
+    def _match(self, expansions: list[list[tuple[str, float]]]) -> np.ndarray:
+        """
+        Score por documento; 0 si le falta alguno de los términos.
+
+        Cada término de la consulta aporta el score de la mejor de sus
+        variantes (el propio término, o los parecidos en el fallback).
+        """
+        total = np.zeros(len(self.ids))
+        matched = np.ones(len(self.ids), dtype=bool)
+        for variants in expansions:
+            scores = np.zeros(len(self.ids))
+            for term, similarity in variants:
+                posting = self._postings.get(term)
+                if posting is None:
+                    continue
+                docs, saturated = posting
+                scores[docs] = np.maximum(scores[docs], self._idf[term] * similarity * saturated)
+            matched &= scores > 0
+            total += scores
+        return np.where(matched, total, 0.0)
+
+    def _top(self, scores: np.ndarray, limit: int) -> Ranked:
+        """Los `limit` documentos con mayor score (a igual score, el primero indexado)."""
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [(self.ids[doc], round(float(scores[doc]), 4)) for doc in candidates[order].tolist()]
+
+
+@dataclass(frozen=True)
+class CatalogSearchIndex:
+    """Índices de búsqueda de programas y trayectorias verificadas."""
+
+    programs: InvertedIndex
+    trajectories: InvertedIndex
+
+    @classmethod
+    def from_db(cls, db: Session, fuzzy_threshold: float) -> "CatalogSearchIndex":
+        """Construye los índices leyendo solo las columnas de texto."""
+        # Cada resultado se consume antes de ejecutar la consulta siguiente
+        programs = InvertedIndex(
+            (
+                (id_, ((name, WEIGHT_A), (description, WEIGHT_B)))
+                for id_, name, description in db.execute(
+                    select(Program.id, Program.name, Program.description)
+                )
+            ),
+            fuzzy_threshold,
+        )
+        trajectories = InvertedIndex(
+            (
+                (id_, ((title, WEIGHT_A), (summary, WEIGHT_B), (story, WEIGHT_C)))
+                for id_, title, summary, story in db.execute(
+                    select(
+                        Trajectory.id, Trajectory.title, Trajectory.summary, Trajectory.story
+                    ).where(Trajectory.is_verified)
+                )
+            ),
+            fuzzy_threshold,
+        )
+        return cls(programs=programs, trajectories=trajectories)
+
+
+class SearchIndexStore:
+    """Contenedor del índice vigente, reconstruido tras cada cambio del catálogo."""
+
+    def __init__(self, fuzzy_threshold: float):
+        self.fuzzy_threshold = fuzzy_threshold
+        self._index: CatalogSearchIndex | None = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> CatalogSearchIndex:
+        """Retorna el índice, construyéndolo si hace falta."""
+        index = self._index
+        if index is not None:
+            return index
+        with self._lock:
+            if self._index is not None:
+                return self._index
+            generation = catalog_store.generation
+            index = CatalogSearchIndex.from_db(db, self.fuzzy_threshold)
+            # Si el catálogo cambió mientras se construía, no se publica
+            if catalog_store.generation == generation:
+                self._index = index
+            return index
+
+    async def get_async(self, db: AsyncSession) -> CatalogSearchIndex:
+        """Como `get`, sobre una `AsyncSession` (ver `build_lock`)."""
+        index = self._index
+        if index is not None:
+            return index
+        async with build_lock():
+            return await db.run_sync(self.get)
+
+    def clear(self) -> None:
+        """Descarta el índice (p. ej. al cambiar el catálogo)."""
+        self._index = None
+
+
+settings = get_settings()
+
+search_index_store = SearchIndexStore(fuzzy_threshold=settings.search_fuzzy_threshold)
+
+# Un cambio en programas o trayectorias obliga a reindexar
+catalog_store.add_listener(search_index_store.clear)
@@ -4,7 +4,7 @@ Servicio para gestión de trayectorias.
 
 from uuid import UUID
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 
 from src.models.trajectory import Trajectory
 from src.schemas.trajectories import (
@@ -12,6 +12,12 @@ from src.schemas.trajectories import (
     TrajectoryListResponse,
     TrajectoryResponse,
 )
+from src.services.async_service import AsyncService
+from src.services.pagination import Keyset, paginate
+from src.services.query_builder import trajectories_query
+
+# Orden de los listados: más recientes primero
+TRAJECTORY_KEYSET = Keyset(Trajectory.created_at, Trajectory.id, descending=True)
 
 
 class TrajectoryService:
@@ -25,52 +31,67 @@ class TrajectoryService:
         filters: TrajectoryFilters | None = None,
         page: int = 1,
         per_page: int = 20,
+        cursor: str | None = None,
+        include_total: bool | None = None,
+        estimate_total: bool = False,
     ) -> TrajectoryListResponse:
-        """Lista trayectorias con filtros y paginación."""
-        query = (
-            self.db.query(Trajectory)
-            .options(joinedload(Trajectory.program))
-            .filter(Trajectory.is_verified == True)  # Solo verificadas
-        )
-
-        # Aplicar filtros
-        if filters:
-            if filters.outcome:
-                query = query.filter(Trajectory.outcome == filters.outcome)
-            if filters.tags:
-                # Filtrar por tags (al menos uno debe coincidir)
-                query = query.filter(Trajectory.tags.overlap(filters.tags))
-            if filters.area:
-                query = query.join(Trajectory.program).filter(
-                    Trajectory.program.has(area=filters.area)
-                )
-
-        # Contar total
-        total = query.count()
+        """
+        Lista trayectorias con filtros y paginación.
 
-        # Paginación
-        offset = (page - 1) * per_page
-        trajectories = query.offset(offset).limit(per_page).all()
-
-        # Calcular páginas
-        pages = (total + per_page - 1) // per_page
+        Ordena de la más reciente a la más antigua. Con `cursor` pagina por
+        keyset en lugar de por número de página; ver `paginate`.
+        """
+        query = trajectories_query(self.db, filters)
 
         return TrajectoryListResponse(
-            items=trajectories,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
+            **paginate(
+                self.db,
+                query,
+                TRAJECTORY_KEYSET,
+                table=Trajectory.__tablename__,
+                # Siempre filtra por verificadas: se estima con el planner
+                filtered=True,
+                page=page,
+                per_page=per_page,
+                cursor=cursor,
+                include_total=include_total,
+                estimate_total_rows=estimate_total,
+            )
         )
 
     def get_by_id(self, trajectory_id: UUID) -> TrajectoryResponse | None:
         """Obtiene una trayectoria por ID."""
         trajectory = (
-            self.db.query(Trajectory)
-            .options(joinedload(Trajectory.program))
+            trajectories_query(self.db, verified_only=False)
             .filter(Trajectory.id == trajectory_id)
             .first()
         )
         if not trajectory:
             return None
         return TrajectoryResponse.model_validate(trajectory)
+
+
+class AsyncTrajectoryService(AsyncService[TrajectoryService]):
+    """Versión async de `TrajectoryService`."""
+
+    service_class = TrajectoryService
+
+    async def list(
+        self,
+        filters: TrajectoryFilters | None = None,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: str | None = None,
+        include_total: bool | None = None,
+        estimate_total: bool = False,
+    ) -> TrajectoryListResponse:
+        """Lista trayectorias con filtros y paginación."""
+        return await self._run(
+            lambda service: service.list(
+                filters, page, per_page, cursor, include_total, estimate_total
+            )
+        )
+
+    async def get_by_id(self, trajectory_id: UUID) -> TrajectoryResponse | None:
+        """Obtiene una trayectoria por ID."""
+        return await self._run(lambda service: service.get_by_id(trajectory_id))
@@ -0,0 +1,187 @@
+"""
+Calentamiento de la instancia antes de recibir tráfico.
+
+Al arrancar, la primera recomendación pagaba abrir las conexiones, compilar
+el catálogo y los primeros usos de NumPy y Pydantic. El warmup lo hace antes,
+en un hilo de fondo, y `/ready` no reporta la instancia como lista hasta que
+termina (`/health` sigue respondiendo mientras tanto):
+
+1. `pool`: abre tantas conexiones como `db_pool_size` (una en SQLite).
+2. `catalog`: compila el snapshot del catálogo (salvo que ya esté vigente).
+3. `recommendation`: calcula un ranking para un perfil sintético, sin
+   persistirlo.
+
+Si falla (p. ej. la BD no está disponible) se reintenta periódicamente.
+`check_database` es la verificación de conectividad que hace `/ready` en
+cada consulta.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Generator
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import Connection, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from src.models.profile import Profile
+from src.services.catalog import catalog_store
+from src.services.recommendation_service import RecommendationService
+
+logger = logging.getLogger(__name__)
+
+# Perfil sintético del warmup: recorre todos los factores del scoring
+WARMUP_PROFILE = {
+    "province": "Buenos Aires",
+    "works_while_studying": "yes",
+    "preferred_modality": "hybrid",
+    "max_weekly_hours": 20,
+    "has_technical_degree": False,
+    "interest_areas": ["technology", "health", "education"],
+}
+
+
+def check_database(db: Session) -> dict[str, Any]:
+    """Ejecuta `SELECT 1` y reporta si la BD responde y cuánto tarda."""
+    start = time.perf_counter()
+    try:
+        db.execute(text("SELECT 1"))
+    except SQLAlchemyError as e:
+        db.rollback()
+        return {"ok": False, "error": e.__class__.__name__}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+class WarmupStatus(str, Enum):
+    """Estado del warmup."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class Warmup:
+    """Ejecuta los pasos del warmup y expone su estado."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Generator[Session, None, None]],
+        pool_size: int,
+        retry_interval: float,
+    ):
+        self.session_factory = session_factory
+        self.pool_size = pool_size
+        self.retry_interval = retry_interval
+        self.status = WarmupStatus.PENDING
+        self.attempts = 0
+        self.steps: dict[str, float] = {}
+        self.error: str | None = None
+        self.finished_at: datetime | None = None
+        self._done = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def ready(self) -> bool:
+        """True si el warmup terminó con éxito."""
+        return self.status == WarmupStatus.READY
+
+    def run(self) -> bool:
+        """Ejecuta todos los pasos una vez; retorna True si terminaron bien."""
+        self.status = WarmupStatus.RUNNING
+        self.attempts += 1
+        self.steps = {}
+        sessions = self.session_factory()
+        db = next(sessions)
+        try:
+            self._step("pool", lambda: self._prime_pool(db))
+            # Reutiliza el catálogo vigente (p. ej. el heredado del proceso
+            # principal en `src.server`)
+            catalog = self._step("catalog", lambda: catalog_store.get(db))
+            self._step("recommendation", lambda: self._synthetic_recommendation(db))
+        except Exception as e:
+            self.status = WarmupStatus.FAILED
+            self.error = e.__class__.__name__
+            # Sin BD disponible basta el nombre del error; otro fallo es un bug
+            logger.warning(
+                "warmup failed attempt=%d error=%s",
+                self.attempts,
+                self.error,
+                exc_info=not isinstance(e, SQLAlchemyError),
+            )
+            return False
+        finally:
+            sessions.close()
+        self.status = WarmupStatus.READY
+        self.error = None
+        self.finished_at = datetime.now(UTC)
+        print(
+            f"🔥 Warmup completo: {len(catalog)} programas (v{catalog.version}), "
+            + ", ".join(f"{name} {duration * 1000:.0f} ms" for name, duration in self.steps.items())
+        )
+        return True
+
+    def start(self) -> None:
+        """Ejecuta el warmup en un hilo de fondo, reintentando hasta lograrlo."""
+        self._thread = threading.Thread(target=self._run_until_ready, name="warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Espera a que el warmup termine con éxito (o se detenga)."""
+        self._done.wait(timeout)
+        return self.ready
+
+    def stop(self) -> None:
+        """Detiene los reintentos y espera al hilo."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Estado del warmup para `/ready`."""
+        return {
+            "status": self.status.value,
+            "attempts": self.attempts,
+            "steps_ms": {name: round(duration * 1000, 1) for name, duration in self.steps.items()},
+            "error": self.error,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def _run_until_ready(self) -> None:
+        try:
+            while not self._stop.is_set():
+                if self.run():
+                    break
+                self._stop.wait(self.retry_interval)
+        finally:
+            self._done.set()
+
+    def _step(self, name: str, call: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = call()
+        self.steps[name] = time.perf_counter() - start
+        return result
+
+    def _prime_pool(self, db: Session) -> None:
+        """Abre las conexiones del pool para que el primer request no las pague."""
+        bind = db.get_bind()
+        # Una sesión ligada a una conexión se precalienta sobre su engine
+        engine = bind.engine if isinstance(bind, Connection) else bind
+        size = self.pool_size if isinstance(engine.pool, QueuePool) else 1
+        connections = [engine.connect() for _ in range(size)]
+        try:
+            for connection in connections:
+                connection.execute(text("SELECT 1"))
+        finally:
+            for connection in connections:
+                connection.close()
+
+    def _synthetic_recommendation(self, db: Session) -> None:
+        """Ranking para un perfil que no se guarda en la BD."""
+        RecommendationService(db, cache=None).rank(Profile(**WARMUP_PROFILE))
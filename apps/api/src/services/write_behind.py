@@ -0,0 +1,206 @@
+"""
+Persistencia diferida (write-behind) por lotes.
+
+Una cola acotada recibe los elementos a persistir y un hilo de fondo los
+vacía en lotes, por tamaño o por tiempo. Los errores transitorios de la BD
+(conexión caída, timeout del pool) se reintentan con backoff; solo se
+descarta un lote ante un error no recuperable. Al detenerse, la cola se
+drena por completo antes de terminar.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WriteBehindFull(Exception):
+    """La cola está llena y no se liberó lugar dentro del tiempo de espera."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """True si el error de escritura puede resolverse reintentando."""
+    if isinstance(error, (OperationalError, InterfaceError, PoolTimeoutError, ConnectionError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+class WriteBehindQueue(Generic[T]):
+    """
+    Cola acotada con escritura por lotes en un hilo de fondo.
+
+    - `submit` aplica backpressure: espera hasta `put_timeout` segundos si la
+      cola está llena y luego lanza `WriteBehindFull`.
+    - Un lote se escribe al juntar `batch_size` elementos o al pasar
+      `flush_interval` segundos desde el primero.
+    - Un lote que falla por un error transitorio se reintenta con backoff
+      exponencial (sin límite mientras la cola está activa; hasta
+      `stop_retries` veces al detenerse). Hasta escribirse o descartarse, el
+      lote no pasa por `on_done`.
+    - `stop` deja de aceptar elementos, espera los `submit` en curso y
+      escribe todo lo pendiente.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write: Callable[[list[T]], None],
+        maxsize: int = 10_000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        put_timeout: float = 0.05,
+        on_done: Callable[[list[T]], None] | None = None,
+        retry_backoff: float = 0.1,
+        max_backoff: float = 5.0,
+        stop_retries: int = 3,
+    ):
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.stop_retries = stop_retries
+        self.written = 0
+        self.retried = 0
+        self.failed = 0
+        self._write = write
+        self._on_done = on_done
+        self._queue: queue.Queue[T] = queue.Queue(maxsize=maxsize)
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._write_lock = threading.Lock()
+        # `submit` en curso: `stop` los espera antes del último flush
+        self._submitting = 0
+        self._submit_done = threading.Condition()
+
+    @property
+    def running(self) -> bool:
+        """True si el hilo de fondo está activo."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        """Cantidad aproximada de elementos en cola."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Inicia el hilo de fondo."""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Detiene el hilo de fondo drenando la cola."""
+        with self._submit_done:
+            self._stopping.set()
+            self._submit_done.wait_for(lambda: self._submitting == 0)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        # Lo que haya quedado (o todo, si nunca se inició) se escribe aquí
+        self.flush()
+
+    def submit(self, item: T) -> None:
+        """Encola un elemento para persistirlo más tarde."""
+        with self._submit_done:
+            if self._stopping.is_set():
+                raise WriteBehindFull(f"{self.name} se está deteniendo")
+            self._submitting += 1
+        try:
+            self._queue.put(item, timeout=self.put_timeout)
+        except queue.Full as e:
+            raise WriteBehindFull(f"{self.name}: cola llena") from e
+        finally:
+            with self._submit_done:
+                self._submitting -= 1
+                self._submit_done.notify_all()
+
+    def flush(self) -> int:
+        """Escribe sincrónicamente todo lo que está en cola."""
+        total = 0
+        while batch := self._take(self.batch_size):
+            self._write_batch(batch)
+            total += len(batch)
+        return total
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._write_batch(batch)
+
+    def _next_batch(self) -> list[T]:
+        """Espera el primer elemento y junta el lote hasta llenarlo o vencer el plazo."""
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _take(self, limit: int) -> list[T]:
+        """Toma hasta `limit` elementos sin esperar."""
+        batch: list[T] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch: list[T]) -> None:
+        """
+        Escribe un lote reintentando los errores transitorios.
+
+        `on_done` se invoca al escribirlo o al descartarlo.
+        """
+        attempt = 0
+        with self._write_lock:
+            while True:
+                try:
+                    self._write(batch)
+                    self.written += len(batch)
+                    break
+                except Exception as e:
+                    # Al detenerse los reintentos son acotados, para poder terminar
+                    exhausted = self._stopping.is_set() and attempt >= self.stop_retries
+                    if not is_transient(e) or exhausted:
+                        self.failed += len(batch)
+                        logger.exception(
+                            "%s: no se pudo escribir un lote de %d", self.name, len(batch)
+                        )
+                        break
+                    delay = min(self.retry_backoff * 2**attempt, self.max_backoff)
+                    attempt += 1
+                    self.retried += 1
+                    logger.warning(
+                        "%s: error transitorio escribiendo un lote de %d (%s); reintento en %.2f s",
+                        self.name,
+                        len(batch),
+                        e,
+                        delay,
+                    )
+                    time.sleep(delay)
+        if self._on_done is not None:
+            self._on_done(batch)
@@ -2,20 +2,29 @@
 Configuración de fixtures para tests.
 """
 
-from collections.abc import Generator
+import tempfile
+from collections.abc import AsyncGenerator, Generator
+from contextlib import contextmanager
+from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from src.database import Base, get_db
+from src.config import get_settings
+from src.database import Base, async_database_url, get_db, get_session
 from src.main import app
+from src.services.catalog import catalog_store
+from src.services.factor_cache import FactorCacheStats, profile_factor_cache
+from src.services.recommendation_cache import CacheStats, recommendation_cache
 
-
-# Crear engine de SQLite en memoria para tests
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# SQLite en un archivo temporal, compartido por el engine sincrónico y el
+# async (aiosqlite) para poder correr los endpoints por ambos caminos
+_TEST_DIR = tempfile.TemporaryDirectory(prefix="orientation-tests-")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{Path(_TEST_DIR.name) / 'test.db'}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -23,7 +32,37 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
+# WAL: las lecturas de una conexión no bloquean las escrituras de la otra
+with engine.connect() as connection:
+    connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+async_engine = create_async_engine(
+    async_database_url(SQLALCHEMY_DATABASE_URL),
+    poolclass=NullPool,
+)
+
+# El watcher de `catalog_version` usa el engine de la aplicación, no el de
+# tests; los tests de sincronización lo crean sobre su propia BD. Los
+# snapshots compartidos se prueban en un directorio propio: la BD de tests se
+# recrea en cada test y repetiría versiones. El escritor de feedback también
+# usa las sesiones de la aplicación: en los tests el feedback se inserta en
+# línea.
+get_settings().catalog_sync_enabled = False
+get_settings().catalog_shared_snapshot = False
+get_settings().feedback_write_behind = False
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+
+@pytest.fixture(autouse=True)
+def reset_catalog() -> Generator[None, None, None]:
+    """Descarta el catálogo compilado (y los resultados cacheados) entre tests."""
+    catalog_store.clear()
+    recommendation_cache.stats = CacheStats()
+    profile_factor_cache.stats = FactorCacheStats()
+    yield
+    catalog_store.clear()
 
 
 @pytest.fixture(scope="function")
@@ -41,9 +80,14 @@ def db() -> Generator[Session, None, None]:
         Base.metadata.drop_all(bind=engine)
 
 
-@pytest.fixture(scope="function")
-def client(db: Session) -> Generator[TestClient, None, None]:
-    """Provee un cliente de test con la BD mockeada."""
+@pytest.fixture(scope="function", params=["sync", "async"])
+def client(request: pytest.FixtureRequest, db: Session) -> Generator[TestClient, None, None]:
+    """
+    Provee un cliente de test con la BD mockeada.
+
+    Se parametriza por modo de sesión: 'sync' sirve los endpoints con la
+    sesión del test en el threadpool y 'async' con una AsyncSession.
+    """
 
     def override_get_db():
         try:
@@ -51,9 +95,35 @@ def client(db: Session) -> Generator[TestClient, None, None]:
         finally:
             pass
 
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with AsyncTestingSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    if request.param == "async":
+        app.dependency_overrides[get_session] = override_get_async_db
 
     with TestClient(app) as test_client:
+        # Como el balanceador, espera a que la instancia esté lista
+        app.state.warmup.wait(timeout=10)
         yield test_client
 
     app.dependency_overrides.clear()
+
+
+@contextmanager
+def count_queries() -> Generator[list[str], None, None]:
+    """Registra las sentencias SQL ejecutadas contra los engines de tests."""
+    statements: list[str] = []
+
+    def before_cursor_execute(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    engines = (engine, async_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,178 @@
+"""
+Tests para las versiones async de los servicios.
+"""
+
+import asyncio
+import faulthandler
+
+import pytest
+
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.schemas.feedback import FeedbackCreate
+from src.schemas.profiles import ProfileCreate, ProfileUpdate
+from src.services.catalog import catalog_store
+from src.services.feedback_service import AsyncFeedbackService
+from src.services.profile_service import AsyncProfileService
+from src.services.program_service import AsyncProgramService
+from src.services.recommendation_service import AsyncRecommendationService
+from src.services.search_service import AsyncSearchService
+from tests.conftest import AsyncTestingSessionLocal
+
+
+@pytest.mark.usefixtures("db")
+async def test_profile_roundtrip_with_async_session():
+    """Test que el servicio async de perfiles funciona sobre una AsyncSession."""
+    async with AsyncTestingSessionLocal() as session:
+        service = AsyncProfileService(session)
+        created = await service.create(ProfileCreate(province="Salta", interest_areas=["arts"]))
+        updated = await service.update(created.id, ProfileUpdate(locality="Cafayate"))
+        fetched = await service.get_by_id(created.id)
+
+    assert updated.locality == "Cafayate"
+    assert fetched == updated
+
+
+async def test_same_results_with_sync_and_async_sessions(db):
+    """Test que ambos tipos de sesión producen el mismo resultado."""
+    institution = Institution(name="UNSa", type="university", province="Salta")
+    db.add(institution)
+    db.commit()
+    db.add(
+        Program(
+            institution_id=institution.id,
+            name="Turismo",
+            type="degree",
+            modality="in_person",
+            area="social_sciences",
+        )
+    )
+    db.commit()
+
+    async with AsyncTestingSessionLocal() as session:
+        from_async = await AsyncProgramService(session).list()
+    from_sync = await AsyncProgramService(db).list()
+
+    assert from_async == from_sync
+    assert from_async.total == 1
+
+
+@pytest.mark.usefixtures("db")
+async def test_recommendation_and_feedback_with_async_session():
+    """Test que se generan recomendaciones y feedback sobre una AsyncSession."""
+    async with AsyncTestingSessionLocal() as session:
+        profile = await AsyncProfileService(session).create(ProfileCreate(province="Jujuy"))
+        service = AsyncRecommendationService(session, cache=None)
+        created = await service.generate(profile.id)
+        fetched = await service.get_by_id(created.id)
+        feedback = await AsyncFeedbackService(session).create(
+            FeedbackCreate(
+                profile_id=profile.id,
+                target_type="recommendation",
+                target_id=created.id,
+                rating=5,
+            )
+        )
+
+    assert fetched.id == created.id
+    assert fetched.profile_id == profile.id
+    assert feedback.id is not None
+
+
+async def test_concurrent_generates_on_cold_catalog(db):
+    """Test que varias recomendaciones concurrentes con el catálogo frío no se bloquean."""
+    institution = Institution(name="UNT", type="university", province="Tucumán")
+    db.add(institution)
+    db.commit()
+    db.add_all(
+        Program(
+            institution_id=institution.id,
+            name=f"Programa {i}",
+            type="degree",
+            modality="in_person",
+            area="technology",
+        )
+        for i in range(20)
+    )
+    db.commit()
+    async with AsyncTestingSessionLocal() as session:
+        profile = await AsyncProfileService(session).create(
+            ProfileCreate(interest_areas=["technology"])
+        )
+    catalog_store.clear()
+
+    async def generate():
+        async with AsyncTestingSessionLocal() as session:
+            return await AsyncRecommendationService(session, cache=None).generate(profile.id, 5)
+
+    # Un deadlock bloquea el event loop (y con él `wait_for`): el watchdog
+    # corta el proceso mostrando dónde quedó cada hilo
+    faulthandler.dump_traceback_later(60, exit=True)
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*(generate() for _ in range(4))), timeout=20
+        )
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+
+    assert all(len(result.programs) == 5 for result in results)
+    assert len({result.id for result in results}) == 4
+
+
+async def test_generate_sees_uncommitted_profile(db):
+    """Test que la recomendación async consulta sobre la propia AsyncSession."""
+    institution = Institution(name="UNCa", type="university", province="Catamarca")
+    db.add(institution)
+    db.commit()
+    db.add(
+        Program(
+            institution_id=institution.id,
+            name="Geología",
+            type="degree",
+            modality="in_person",
+            area="natural_sciences",
+        )
+    )
+    db.commit()
+
+    async with AsyncTestingSessionLocal() as session:
+        profile = Profile(province="Catamarca", interest_areas=["natural_sciences"])
+        session.add(profile)
+        await session.flush()
+        profile_id = profile.id
+        result = await AsyncRecommendationService(session, cache=None).generate(profile_id)
+
+    assert result.profile_id == profile_id
+    assert [p.program.name for p in result.programs] == ["Geología"]
+
+
+async def test_concurrent_searches_on_cold_index(db):
+    """Test que varias búsquedas async concurrentes con el índice frío no se bloquean."""
+    institution = Institution(name="UNL", type="university", province="Santa Fe")
+    db.add(institution)
+    db.commit()
+    db.add_all(
+        Program(
+            institution_id=institution.id,
+            name=f"Ingeniería Química {i}",
+            type="degree",
+            modality="in_person",
+            area="engineering",
+        )
+        for i in range(20)
+    )
+    db.commit()
+    catalog_store.clear()
+
+    async def search():
+        async with AsyncTestingSessionLocal() as session:
+            return await AsyncSearchService(session).search("quimica", limit=5)
+
+    faulthandler.dump_traceback_later(60, exit=True)
+    try:
+        results = await asyncio.wait_for(asyncio.gather(*(search() for _ in range(4))), timeout=20)
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+
+    assert all(len(result.programs) == 5 for result in results)
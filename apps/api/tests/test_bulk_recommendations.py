@@ -0,0 +1,150 @@
+"""
+Tests para las recomendaciones en lote.
+"""
+
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.models.recommendation import Recommendation
+from src.schemas.profiles import ProfileCreate
+from src.services.bulk_scoring import BulkScorer
+from src.services.catalog import catalog_store
+from src.services.recommendation_service import RecommendationService
+from src.services.scoring import ScoringInputs
+
+
+def _create_catalog(db):
+    institution = Institution(name="UNR", type="university", province="Santa Fe")
+    db.add(institution)
+    db.commit()
+    for i, area in enumerate(["technology", "health", "arts", "business"] * 5):
+        db.add(
+            Program(
+                institution_id=institution.id,
+                name=f"Programa {i}",
+                type="degree",
+                modality=["in_person", "remote", "hybrid"][i % 3],
+                area=area,
+                duration_years=2 + i % 5,
+            )
+        )
+    db.commit()
+
+
+def _read_ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_bulk_streams_one_line_per_profile(client: TestClient, db):
+    """Test que el lote devuelve una línea NDJSON por perfil y persiste todo."""
+    _create_catalog(db)
+    existing = Profile(interest_areas=["technology"], province="Santa Fe")
+    db.add(existing)
+    db.commit()
+    missing_id = uuid.uuid4()
+
+    response = client.post(
+        "/api/v1/recommendations/bulk",
+        json={
+            "profile_ids": [str(existing.id), str(missing_id)],
+            "profiles": [
+                {"interest_areas": ["health"], "preferred_modality": "remote"},
+                {"interest_areas": ["arts"], "works_while_studying": "yes"},
+            ],
+            "limit": 3,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _read_ndjson(response)
+    assert len(lines) == 4
+    errors = [line for line in lines if "error" in line]
+    assert errors == [{"profile_id": str(missing_id), "error": "Perfil no encontrado"}]
+
+    recommendations = [line for line in lines if "programs" in line]
+    assert all(len(r["programs"]) == 3 for r in recommendations)
+    assert db.query(Recommendation).count() == 3
+    assert db.query(Profile).count() == 3
+
+    # Cada resultado del lote se puede consultar luego por ID
+    stored = client.get(f"/api/v1/recommendations/{recommendations[0]['id']}")
+    assert stored.status_code == 200
+    assert stored.json()["programs"] == recommendations[0]["programs"]
+
+
+def test_bulk_matches_single_generation(db):
+    """Test que el lote produce lo mismo que generar perfil por perfil."""
+    _create_catalog(db)
+    profiles = [
+        Profile(interest_areas=["technology"], works_while_studying="maybe"),
+        Profile(interest_areas=["business", "arts"], province="Santa Fe"),
+    ]
+    db.add_all(profiles)
+    db.commit()
+    service = RecommendationService(db, cache=None)
+
+    bulk = list(service.generate_bulk([p.id for p in profiles], [], limit=5))
+
+    for profile, result in zip(profiles, bulk, strict=True):
+        single = service.generate(profile.id, limit=5)
+        assert result.profile_id == profile.id
+        assert result.programs == single.programs
+
+
+def test_bulk_persists_each_result_before_yielding(db):
+    """Test que lo ya entregado queda guardado aunque el stream se corte."""
+    _create_catalog(db)
+    service = RecommendationService(db, cache=None)
+    results = service.generate_bulk(
+        [],
+        [
+            ProfileCreate(interest_areas=["health"]),
+            ProfileCreate(interest_areas=["arts"], province="Santa Fe"),
+        ],
+        limit=3,
+    )
+
+    first = next(results)
+    results.close()
+
+    assert db.query(Profile).count() == 2
+    assert db.get(Recommendation, first.id) is not None
+    assert service.get_by_id(first.id).programs == first.programs
+
+
+def test_bulk_requires_profiles(client: TestClient):
+    """Test que un lote vacío es inválido."""
+    response = client.post("/api/v1/recommendations/bulk", json={"limit": 5})
+
+    assert response.status_code == 422
+
+
+def test_process_pool_matches_in_process(db):
+    """Test que el pool de procesos puntúa igual que el proceso actual."""
+    _create_catalog(db)
+    catalog = catalog_store.get(db)
+    profiles = [
+        (i, ScoringInputs("Santa Fe", works, modality, [area]))
+        for i, (works, modality, area) in enumerate(
+            [
+                ("yes", "remote", "technology"),
+                (None, "hybrid", "health"),
+                ("maybe", None, "arts"),
+            ]
+        )
+    ]
+    scorer = BulkScorer(max_workers=2, chunk_size=1)
+    weights = RecommendationService.WEIGHTS
+    try:
+        pooled = [r for chunk in scorer.rank(catalog, weights, profiles, 5, True) for r in chunk]
+    finally:
+        scorer.shutdown()
+    local = [r for chunk in scorer.rank(catalog, weights, profiles, 5) for r in chunk]
+
+    assert sorted(pooled) == sorted(local)
@@ -0,0 +1,141 @@
+"""
+Tests para el catálogo compilado de programas.
+"""
+
+import math
+
+from src.models.institution import Institution
+from src.models.program import Program
+from src.services.catalog import MISSING_CODE, NULL_CODE, catalog_store
+
+
+def _create_programs(db):
+    """Crea una institución con dos programas."""
+    institution = Institution(
+        name="Universidad Nacional de Córdoba",
+        short_name="UNC",
+        type="university",
+        province="Córdoba",
+        is_public=True,
+    )
+    db.add(institution)
+    db.commit()
+
+    programs = [
+        Program(
+            institution_id=institution.id,
+            name="Medicina",
+            type="degree",
+            modality="in_person",
+            area="health",
+            duration_years=6,
+            shift="morning",
+            work_compatible=False,
+        ),
+        Program(
+            institution_id=institution.id,
+            name="Tecnicatura en Programación",
+            type="technical",
+            modality="remote",
+            area="technology",
+        ),
+    ]
+    db.add_all(programs)
+    db.commit()
+    return institution, programs
+
+
+class TestProgramCatalog:
+    """Tests para la compilación del catálogo."""
+
+    def test_compiles_columns(self, db):
+        """Test que el catálogo guarda las columnas codificadas."""
+        institution, programs = _create_programs(db)
+
+        catalog = catalog_store.get(db)
+
+        assert len(catalog) == 2
+        assert list(catalog.ids) == sorted(p.id for p in programs)
+        assert set(catalog.areas) == {"health", "technology"}
+        assert catalog.provinces == ("Córdoba",)
+        assert catalog.area.dtype.itemsize == 2
+        assert not catalog.area.flags.writeable
+
+    def test_program_view_matches_model(self, db):
+        """Test que la vista del catálogo expone los mismos valores que el modelo."""
+        institution, programs = _create_programs(db)
+
+        catalog = catalog_store.get(db)
+        medicine = catalog.program(catalog.position(programs[0].id))
+        programming = catalog.program(catalog.position(programs[1].id))
+
+        assert medicine.name == "Medicina"
+        assert medicine.modality == "in_person"
+        assert medicine.shift == "morning"
+        assert medicine.duration_years == 6
+        assert medicine.work_compatible is False
+        assert medicine.institution.province == "Córdoba"
+        assert medicine.institution.short_name == "UNC"
+        assert programming.shift is None
+        assert programming.duration_years is None
+        assert programming.work_compatible is None
+
+    def test_encodes_missing_values(self, db):
+        """Test de los códigos especiales para nulos y valores desconocidos."""
+        _, programs = _create_programs(db)
+
+        catalog = catalog_store.get(db)
+        position = catalog.position(programs[1].id)
+
+        assert catalog.shift[position] == NULL_CODE
+        assert math.isnan(catalog.duration[position])
+        assert catalog.code("province", "Jujuy") == MISSING_CODE
+        assert catalog.code("province", None) == NULL_CODE
+
+
+class TestCatalogStore:
+    """Tests para la publicación e invalidación del snapshot."""
+
+    def test_get_reuses_snapshot(self, db):
+        """Test que el snapshot se reutiliza mientras no cambie el catálogo."""
+        _create_programs(db)
+
+        first = catalog_store.get(db)
+        second = catalog_store.get(db)
+
+        assert first is second
+
+    def test_commit_on_catalog_tables_invalidates(self, db):
+        """Test que confirmar cambios en programas reconstruye el snapshot."""
+        institution, _ = _create_programs(db)
+        before = catalog_store.get(db)
+
+        db.add(
+            Program(
+                institution_id=institution.id,
+                name="Enfermería",
+                type="degree",
+                modality="hybrid",
+                area="health",
+            )
+        )
+        db.commit()
+
+        assert catalog_store.is_stale
+        after = catalog_store.get(db)
+        assert after is not before
+        assert after.version == before.version + 1
+        assert len(after) == 3
+        # El snapshot anterior sigue siendo válido para quien lo tenga
+        assert len(before) == 2
+
+    def test_rollback_does_not_invalidate(self, db):
+        """Test que los cambios revertidos no invalidan el snapshot."""
+        institution, _ = _create_programs(db)
+        catalog_store.get(db)
+
+        institution.province = "Mendoza"
+        db.flush()
+        db.rollback()
+
+        assert not catalog_store.is_stale
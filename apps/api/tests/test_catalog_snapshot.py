@@ -0,0 +1,173 @@
+"""
+Tests para el snapshot del catálogo compartido entre workers.
+"""
+
+from collections.abc import Generator
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.database import Base
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.services.catalog import ProgramCatalog
+from src.services.catalog_snapshot import SharedCatalogFiles, map_catalog, write_catalog
+from src.services.recommendation_service import RecommendationService
+from src.services.scoring import rank_catalog
+
+
+@pytest.fixture
+def file_engine(tmp_path: Path) -> Generator[Engine, None, None]:
+    """BD en un archivo, con la tabla `catalog_version` y sus triggers."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'catalog.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(file_engine: Engine) -> Generator[Session, None, None]:
+    """Sesión con un catálogo chico cargado."""
+    with sessionmaker(bind=file_engine, autoflush=False)() as session:
+        uns = Institution(name="UNS", type="university", province="Buenos Aires")
+        utn = Institution(name="UTN", short_name="UTN", type="university", province="Córdoba")
+        session.add_all([uns, utn])
+        session.flush()
+        session.add_all(
+            [
+                Program(
+                    institution_id=uns.id,
+                    name="Geología",
+                    type="degree",
+                    modality="in_person",
+                    area="exact_sciences",
+                    duration_years=5,
+                ),
+                Program(
+                    institution_id=utn.id,
+                    name="Tecnicatura en Programación",
+                    type="technical",
+                    modality="hybrid",
+                    area="technology",
+                    shift="evening",
+                    work_compatible=True,
+                ),
+            ]
+        )
+        session.commit()
+        yield session
+
+
+def _add_program(session: Session, name: str) -> None:
+    institution = session.query(Institution).first()
+    session.add(
+        Program(
+            institution_id=institution.id,
+            name=name,
+            type="course",
+            modality="remote",
+            area="technology",
+        )
+    )
+    session.commit()
+
+
+def test_write_and_map_round_trip(session: Session, tmp_path: Path):
+    """Test que el catálogo mapeado es equivalente al compilado y de solo lectura."""
+    compiled = ProgramCatalog.from_db(session, version=1)
+    path = tmp_path / "catalog.bin"
+
+    write_catalog(compiled, path)
+    mapped = map_catalog(path, version=7)
+
+    assert mapped.version == 7
+    assert mapped.ids == compiled.ids
+    assert mapped.names == compiled.names
+    assert mapped.institutions == compiled.institutions
+    assert mapped.positions == compiled.positions
+    for position in range(len(compiled)):
+        assert mapped.program(position) == compiled.program(position)
+    for column in ("area", "modality", "shift", "duration", "province", "institution"):
+        values = getattr(mapped, column)
+        np.testing.assert_array_equal(values, getattr(compiled, column))
+        assert not values.flags.writeable
+        assert not values.flags.owndata  # vista sobre el archivo, sin copia
+    assert mapped.code("shift", "evening") == compiled.code("shift", "evening")
+
+    profile = Profile(interest_areas=["technology"], preferred_modality="hybrid")
+    weights = RecommendationService.WEIGHTS
+    expected = rank_catalog(compiled, profile, weights, 10)
+    assert rank_catalog(mapped, profile, weights, 10) == expected
+
+
+def test_workers_share_published_snapshot(session: Session, file_engine: Engine, tmp_path: Path):
+    """Test que un segundo worker mapea el archivo sin compilar el catálogo."""
+    directory = tmp_path / "snapshots"
+    first = SharedCatalogFiles(directory)
+    catalog = first.load(session, version=1)
+
+    assert first.path is not None and first.path.exists()
+    assert len(catalog) == 2
+
+    statements: list[str] = []
+    event.listen(file_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    second = SharedCatalogFiles(directory)
+    shared = second.load(session, version=1)
+
+    assert second.path == first.path
+    assert shared.ids == catalog.ids
+    # Solo se leyó la versión (dentro de un SAVEPOINT), no las tablas del catálogo
+    queries = [s for s in statements if "SAVEPOINT" not in s]
+    assert len(queries) == 1
+    assert "catalog_version" in queries[0]
+
+
+def test_version_read_uses_session_connection(tmp_path: Path):
+    """Test que la versión se lee sin pedir otra conexión al pool."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=0, pool_timeout=0.1
+    )
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        # La sesión ocupa la única conexión del pool
+        session.execute(text("SELECT 1"))
+        shared = SharedCatalogFiles(tmp_path / "snapshots")
+
+        catalog = shared.load(session, version=1)
+
+        assert len(catalog) == 0
+        assert shared.path is not None
+    engine.dispose()
+
+
+def test_new_version_publishes_new_file_and_prunes_old(session: Session, tmp_path: Path):
+    """Test que cada versión tiene su archivo y se conservan solo las recientes."""
+    shared = SharedCatalogFiles(tmp_path)
+    paths = []
+    for i in range(5):
+        catalog = shared.load(session, version=i + 1)
+        assert len(catalog) == 2 + i
+        paths.append(shared.path)
+        _add_program(session, f"Curso {i}")
+
+    assert len(set(paths)) == 5
+    assert sorted(tmp_path.glob("catalog-*.bin")) == sorted(paths[-3:])
+
+
+def test_load_without_catalog_version_compiles_in_process(db: Session, tmp_path: Path):
+    """Test que sin versión de la BD (filas ausentes) se compila sin compartir."""
+    db.execute(Base.metadata.tables["catalog_version"].delete())
+    db.commit()
+    shared = SharedCatalogFiles(tmp_path)
+
+    catalog = shared.load(db, version=1)
+
+    assert len(catalog) == 0
+    assert shared.path is None
+    assert not list(tmp_path.iterdir())
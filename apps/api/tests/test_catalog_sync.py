@@ -0,0 +1,133 @@
+"""
+Tests para la versión del catálogo y la sincronización entre workers.
+"""
+
+import time
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, create_engine, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.database import Base
+from src.middleware.http_cache import catalog_etag
+from src.models.catalog_version import CatalogVersion
+from src.models.institution import Institution
+from src.models.program import Program
+from src.services.catalog import catalog_store
+from src.services.catalog_sync import CatalogVersionWatcher, parse_payload
+
+
+@pytest.fixture
+def sync_engine(tmp_path: Path) -> Generator[Engine, None, None]:
+    """BD propia en un archivo: el watcher la lee con otras conexiones."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'catalog.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(sync_engine: Engine) -> Generator[Session, None, None]:
+    """Sesión sobre la BD de la sincronización (como la de otro worker)."""
+    with sessionmaker(bind=sync_engine, autoflush=False)() as session:
+        yield session
+
+
+def _version(session: Session) -> int:
+    return session.scalar(select(CatalogVersion.version))
+
+
+def _add_program(session: Session, name: str = "Geología") -> Program:
+    institution = Institution(name="UNS", type="university", province="Buenos Aires")
+    session.add(institution)
+    session.flush()
+    program = Program(
+        institution_id=institution.id,
+        name=name,
+        type="degree",
+        modality="in_person",
+        area="exact_sciences",
+    )
+    session.add(program)
+    session.commit()
+    return program
+
+
+def test_triggers_bump_catalog_version(session: Session):
+    """Test que insertar, modificar y borrar en el catálogo avanza la versión."""
+    assert _version(session) == 0
+
+    program = _add_program(session)
+    after_insert = _version(session)
+    assert after_insert == 2  # institución y programa
+
+    session.execute(update(Program).values(name="Geología aplicada"))
+    session.commit()
+    assert _version(session) == after_insert + 1
+
+    session.delete(program)
+    session.commit()
+    assert _version(session) == after_insert + 2
+
+
+def test_check_invalidates_and_refreshes_catalog(sync_engine: Engine, session: Session):
+    """Test que un cambio de versión invalida el snapshot y lo reconstruye."""
+    watcher = CatalogVersionWatcher(sync_engine, poll_interval=0.05)
+    _add_program(session)
+    catalog_store.refresh(session)
+
+    # Primera lectura con un snapshot cargado: no se sabe si está al día
+    assert watcher.check()
+    assert not catalog_store.is_stale
+    assert catalog_etag() == f'W/"{_version(session)}"'
+    assert not watcher.check()
+
+    _add_program(session, name="Física")
+    compiled = catalog_store.current.version
+    assert watcher.check()
+    assert catalog_store.current.version == compiled + 1
+    assert len(catalog_store.current) == 2
+    assert catalog_etag() == f'W/"{_version(session)}"'
+
+
+def test_etag_includes_local_changes_until_synced(sync_engine: Engine, session: Session):
+    """Test que los cambios locales sin sincronizar cambian el ETag."""
+    watcher = CatalogVersionWatcher(sync_engine, poll_interval=0.05, eager_refresh=False)
+    watcher.check()
+    synced = catalog_etag()
+
+    catalog_store.invalidate()
+
+    assert catalog_etag() not in (synced, f'W/"{_version(session)}"')
+    assert catalog_etag().startswith(f'W/"{_version(session)}-{catalog_store.epoch}-')
+
+
+def test_watcher_polls_changes_from_other_connections(sync_engine: Engine, session: Session):
+    """Test que el hilo de fondo detecta cambios hechos por otra conexión."""
+    watcher = CatalogVersionWatcher(sync_engine, poll_interval=0.02)
+    watcher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while catalog_store.db_version is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        _add_program(session)
+
+        while catalog_store.db_version != _version(session) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+
+    assert catalog_store.db_version == _version(session)
+    assert catalog_store.changed_at.tzinfo is not None
+
+
+def test_parse_payload():
+    """Test del payload de las notificaciones de Postgres."""
+    version, changed_at = parse_payload("42,1760745600.123456")
+
+    assert version == 42
+    assert changed_at.timestamp() == pytest.approx(1760745600.123456)
@@ -0,0 +1,95 @@
+"""
+Tests para la configuración y las métricas del pool de conexiones.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+from src import database
+from src.db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_status
+from src.metrics import Histogram
+
+
+@pytest.fixture
+def small_pool_engine(tmp_path):
+    """Engine con una sola conexión y sin overflow."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_checkout_timeout_is_counted(small_pool_engine):
+    """Test que se registran las esperas y los timeouts del pool."""
+    with small_pool_engine.connect():
+        status = pool_status(small_pool_engine)
+        assert status["checked_out"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            small_pool_engine.connect()
+
+    status = pool_status(small_pool_engine)
+    assert status["checked_out"] == 0
+    assert status["checkout_timeouts"] == 1
+    assert status["checkout_wait_seconds"]["count"] == 2
+    assert status["checkout_wait_seconds"]["sum"] >= 0.05
+
+
+def test_metrics_survive_dispose(small_pool_engine):
+    """Test que recrear el pool conserva las métricas."""
+    with small_pool_engine.connect():
+        pass
+    small_pool_engine.dispose()
+
+    assert pool_status(small_pool_engine)["checkout_wait_seconds"]["count"] == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test que los buckets acumulan las observaciones menores o iguales."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.65)
+
+
+def test_engine_options_from_settings(monkeypatch):
+    """Test que los parámetros del pool y los timeouts salen de Settings."""
+    monkeypatch.setattr(database.settings, "db_pool_size", 20)
+    monkeypatch.setattr(database.settings, "db_pool_pre_ping", False)
+    monkeypatch.setattr(database.settings, "db_statement_timeout_ms", 5000)
+    monkeypatch.setattr(database.settings, "db_lock_timeout_ms", 1000)
+
+    sync = database.engine_options("postgresql://u:p@localhost/db")
+    assert sync["poolclass"] is InstrumentedQueuePool
+    assert sync["pool_size"] == 20
+    assert sync["pool_pre_ping"] is False
+    assert sync["connect_args"] == {"options": "-c statement_timeout=5000 -c lock_timeout=1000"}
+
+    async_ = database.engine_options("postgresql+asyncpg://u:p@localhost/db")
+    assert async_["poolclass"] is InstrumentedAsyncQueuePool
+    assert async_["connect_args"] == {
+        "server_settings": {"statement_timeout": "5000", "lock_timeout": "1000"}
+    }
+
+    assert "poolclass" not in database.engine_options("sqlite:///./local.db")
+
+
+def test_internal_metrics_endpoint(client: TestClient):
+    """Test que el endpoint interno expone el estado de los pools."""
+    response = client.get("/internal/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pools"]["sync"]["class"] == "InstrumentedQueuePool"
+    assert "checkout_wait_seconds" in data["pools"]["sync"]
+    assert "hit_ratio" in data["recommendation_cache"]
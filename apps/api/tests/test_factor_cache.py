@@ -0,0 +1,199 @@
+"""
+Tests para el re-scoring incremental de perfiles modificados.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.schemas.profiles import ProfileUpdate
+from src.services.catalog import catalog_store
+from src.services.factor_cache import ProfileFactorCache, profile_factor_cache
+from src.services.profile_service import ProfileService
+from src.services.recommendation_service import RecommendationService
+from src.services.scoring import FACTORS, ScoringInputs, score_catalog, total_scores
+
+WEIGHTS = RecommendationService.WEIGHTS
+
+CHANGES = [
+    {"preferred_modality": "remote"},
+    {"province": "Córdoba"},
+    {"interest_areas": ["health", "technology"]},
+    {"works_while_studying": "yes"},
+    {"max_weekly_hours": 30},
+    {"preferred_modality": "hybrid", "province": "Mendoza"},
+    {"works_while_studying": "no", "interest_areas": ["arts"]},
+]
+
+
+@pytest.fixture
+def catalog_db(db):
+    """Catálogo sintético con programas de varias provincias y modalidades."""
+    rng = random.Random(24)
+    institutions = [
+        Institution(name=f"Institución {province}", type="university", province=province)
+        for province in ["Buenos Aires", "Córdoba", "Mendoza"]
+    ]
+    db.add_all(institutions)
+    db.commit()
+    db.add_all(
+        Program(
+            institution_id=rng.choice(institutions).id,
+            name=f"Programa {i}",
+            type="degree",
+            area=rng.choice(["technology", "health", "business", "arts"]),
+            modality=rng.choice(["in_person", "remote", "hybrid"]),
+            shift=rng.choice([None, "morning", "evening"]),
+            duration_years=rng.choice([None, 2, 4, 6]),
+            work_compatible=rng.choice([None, True, False]),
+        )
+        for i in range(120)
+    )
+    db.commit()
+    return db
+
+
+def _profile(db) -> Profile:
+    profile = Profile(
+        province="Buenos Aires",
+        works_while_studying="maybe",
+        preferred_modality="in_person",
+        interest_areas=["technology"],
+    )
+    db.add(profile)
+    db.commit()
+    return profile
+
+
+@pytest.fixture(autouse=True)
+def clear_factor_cache():
+    """Cada test arranca sin filas cacheadas."""
+    profile_factor_cache.clear()
+    yield
+    profile_factor_cache.clear()
+
+
+def test_patch_recomputes_only_affected_factor(catalog_db):
+    """Test que tras cambiar la modalidad solo se recalcula `modality_match`."""
+    profile = _profile(catalog_db)
+    service = RecommendationService(catalog_db, cache=None)
+    service.generate(profile.id)
+    assert profile_factor_cache.stats.full == 1
+
+    profile_factor_cache.stats.recomputed.clear()
+    ProfileService(catalog_db).update(profile.id, ProfileUpdate(preferred_modality="remote"))
+    incremental = service.generate(profile.id)
+
+    assert profile_factor_cache.stats.incremental == 1
+    assert dict(profile_factor_cache.stats.recomputed) == {"modality_match": 1}
+    full = RecommendationService(catalog_db, cache=None, factor_cache=None).generate(profile.id)
+    assert [p.model_dump() for p in incremental.programs] == [p.model_dump() for p in full.programs]
+
+
+def test_unrelated_patch_reuses_every_factor(catalog_db):
+    """Test que cambiar un campo que no puntúa no recalcula ningún factor."""
+    profile = _profile(catalog_db)
+    service = RecommendationService(catalog_db, cache=None)
+    service.generate(profile.id)
+
+    profile_factor_cache.stats.recomputed.clear()
+    ProfileService(catalog_db).update(profile.id, ProfileUpdate(max_weekly_hours=10))
+    service.generate(profile.id)
+
+    assert not profile_factor_cache.stats.recomputed
+
+
+def test_incremental_scores_identical_to_full_recompute(catalog_db):
+    """Test que cada paso incremental da los mismos floats que un cálculo completo."""
+    profile = _profile(catalog_db)
+    catalog = catalog_store.get(catalog_db)
+    cache = ProfileFactorCache(maxsize=4)
+    service = ProfileService(catalog_db, factor_cache=cache)
+
+    for i, change in enumerate(CHANGES):
+        if i % 2:
+            service.update(profile.id, ProfileUpdate(**change))
+        else:
+            # Cambio hecho por otro proceso: se detecta comparando los campos
+            for field, value in change.items():
+                setattr(profile, field, value)
+            catalog_db.commit()
+        inputs = ScoringInputs.from_profile(profile)
+
+        rows = cache.rows(profile.id, catalog, inputs, WEIGHTS)
+
+        assert len(rows) == len(FACTORS)
+        np.testing.assert_array_equal(
+            total_scores(rows), score_catalog(catalog, inputs, WEIGHTS), strict=True
+        )
+    assert cache.stats.full == 1
+    assert cache.stats.incremental == len(CHANGES) - 1
+
+
+def test_catalog_change_discards_rows(catalog_db):
+    """Test que con otra versión del catálogo se recalculan todos los factores."""
+    profile = _profile(catalog_db)
+    service = RecommendationService(catalog_db, cache=None)
+    service.generate(profile.id)
+    assert len(profile_factor_cache) == 1
+
+    catalog_store.invalidate()
+    service.generate(profile.id)
+
+    assert profile_factor_cache.stats.full == 2
+    assert profile_factor_cache.stats.incremental == 0
+
+
+def test_lru_eviction_and_disabled_cache(catalog_db):
+    """Test que el cache respeta su tamaño y que con 0 no guarda filas."""
+    catalog = catalog_store.get(catalog_db)
+    profiles = [_profile(catalog_db) for _ in range(3)]
+    cache = ProfileFactorCache(maxsize=2)
+    disabled = ProfileFactorCache(maxsize=0)
+
+    for profile in profiles:
+        inputs = ScoringInputs.from_profile(profile)
+        cache.rows(profile.id, catalog, inputs, WEIGHTS)
+        disabled.rows(profile.id, catalog, inputs, WEIGHTS)
+
+    assert len(cache) == 2
+    assert len(disabled) == 0
+    assert disabled.stats.full == 3
+
+
+def test_profile_independent_rows_are_shared(catalog_db):
+    """Test que la fila de duración se calcula y guarda una vez por catálogo."""
+    catalog = catalog_store.get(catalog_db)
+    profiles = [_profile(catalog_db) for _ in range(3)]
+    cache = ProfileFactorCache(maxsize=4)
+
+    rows = [
+        cache.rows(profile.id, catalog, ScoringInputs.from_profile(profile), WEIGHTS)
+        for profile in profiles
+    ]
+
+    duration = FACTORS.index("duration")
+    assert rows[0][duration] is rows[1][duration] is rows[2][duration]
+    assert cache.stats.recomputed["duration"] == 1
+    row_bytes = rows[0][duration].nbytes
+    assert cache.nbytes == 3 * (len(FACTORS) - 1) * row_bytes
+
+
+def test_byte_limit_evicts_oldest_profiles(catalog_db):
+    """Test que el cache desaloja perfiles al superar su límite de bytes."""
+    catalog = catalog_store.get(catalog_db)
+    profiles = [_profile(catalog_db) for _ in range(3)]
+    entry_bytes = (len(FACTORS) - 1) * len(catalog) * 8
+    cache = ProfileFactorCache(maxsize=10, max_bytes=2 * entry_bytes)
+
+    for profile in profiles:
+        cache.rows(profile.id, catalog, ScoringInputs.from_profile(profile), WEIGHTS)
+
+    assert len(cache) == 2
+    assert cache.nbytes == 2 * entry_bytes
+    cache.rows(profiles[0].id, catalog, ScoringInputs.from_profile(profiles[0]), WEIGHTS)
+    assert cache.stats.full == 4
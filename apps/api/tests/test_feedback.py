@@ -0,0 +1,208 @@
+"""
+Tests para la ingesta de feedback por lotes.
+"""
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.models.feedback import Feedback
+from src.models.profile import Profile
+from src.schemas.feedback import FeedbackCreate
+from src.services.feedback_service import FeedbackService
+from src.services.feedback_writer import FeedbackWriter, copy_rows
+from tests.conftest import TestingSessionLocal, count_queries
+
+
+def _feedback(rating: int = 4, **fields) -> FeedbackCreate:
+    return FeedbackCreate(
+        target_type="recommendation", target_id=uuid.uuid4(), rating=rating, **fields
+    )
+
+
+def _writer(**kwargs) -> FeedbackWriter:
+    return FeedbackWriter(TestingSessionLocal, **kwargs)
+
+
+def test_create_feedback_returns_accepted(client, db):
+    """Test que el endpoint acepta el feedback con un ID generado de antemano."""
+    payload = {
+        "target_type": "program",
+        "target_id": str(uuid.uuid4()),
+        "rating": 5,
+        "comment": "Muy útil",
+    }
+
+    response = client.post("/api/v1/feedback", json=payload)
+
+    assert response.status_code == 202
+    data = response.json()
+    stored = db.get(Feedback, uuid.UUID(data["id"]))
+    assert stored is not None
+    assert stored.rating == 5
+    assert stored.comment == "Muy útil"
+
+
+def test_unknown_profile_is_rejected_inline(client):
+    """Test que con la inserción en línea un perfil inexistente da 404."""
+    payload = {
+        "profile_id": str(uuid.uuid4()),
+        "target_type": "program",
+        "target_id": str(uuid.uuid4()),
+        "rating": 3,
+    }
+
+    response = client.post("/api/v1/feedback", json=payload)
+
+    assert response.status_code == 404
+
+
+class TestFeedbackWriter:
+    """Tests del escritor por lotes."""
+
+    def test_flush_inserts_batch_with_single_statement(self, db):
+        """Test que el feedback encolado se inserta con un único INSERT."""
+        service = FeedbackService(db, writer=_writer())
+        accepted = [service.create(_feedback(rating)) for rating in range(1, 6)]
+
+        assert db.query(Feedback).count() == 0
+
+        with count_queries() as statements:
+            assert service.writer.flush() == 5
+
+        inserts = [s for s in statements if s.startswith("INSERT INTO feedback")]
+        assert len(inserts) == 1
+        stored = {f.id: f for f in db.query(Feedback)}
+        assert [stored[f.id].rating for f in accepted] == [1, 2, 3, 4, 5]
+        assert all(stored[f.id].created_at is not None for f in accepted)
+
+    def test_stop_drains_queue_in_batches(self, db):
+        """Test que al detenerse se escribe todo lo pendiente, en lotes."""
+        writer = _writer(batch_size=10)
+        service = FeedbackService(db, writer=writer)
+        for _ in range(25):
+            service.create(_feedback())
+
+        with count_queries() as statements:
+            writer.stop()
+
+        inserts = [s for s in statements if s.startswith("INSERT INTO feedback")]
+        assert len(inserts) == 3
+        assert db.query(Feedback).count() == 25
+
+    def test_background_worker_flushes(self, db):
+        """Test que el hilo de fondo persiste el feedback."""
+        writer = _writer(flush_interval=0.01)
+        writer.start()
+        try:
+            accepted = FeedbackService(db, writer=writer).create(_feedback())
+        finally:
+            writer.stop(timeout=5)
+
+        assert db.get(Feedback, accepted.id) is not None
+        assert writer.snapshot()["written"] == 1
+
+    def test_backpressure_falls_back_to_inline_write(self, db):
+        """Test que con la cola llena el feedback se persiste en línea."""
+        service = FeedbackService(db, writer=_writer(maxsize=1, put_timeout=0))
+
+        queued = service.create(_feedback())
+        inline = service.create(_feedback())
+
+        assert db.get(Feedback, inline.id) is not None
+        assert db.get(Feedback, queued.id) is None
+
+    def test_transient_error_keeps_batch(self, db):
+        """Test que un corte de conexión se reintenta sin perder el feedback aceptado."""
+        writer = _writer()
+        writer.queue.retry_backoff = 0
+        write_rows = writer._write_rows
+        failures = [OperationalError("COPY", {}, Exception("conexión perdida"))]
+
+        def flaky(session, rows):
+            if failures:
+                raise failures.pop()
+            write_rows(session, rows)
+
+        writer._write_rows = flaky
+        service = FeedbackService(db, writer=writer)
+        accepted = [service.create(_feedback()) for _ in range(3)]
+
+        writer.flush()
+
+        assert writer.snapshot() == {"pending": 0, "written": 3, "failed": 0, "rejected": 0}
+        assert writer.queue.retried == 1
+        assert all(db.get(Feedback, f.id) is not None for f in accepted)
+
+    def test_submit_does_not_query(self, db):
+        """Test que encolar feedback con perfil no consulta la BD."""
+        service = FeedbackService(db, writer=_writer())
+
+        with count_queries() as statements:
+            service.create(_feedback(profile_id=uuid.uuid4()))
+
+        assert statements == []
+
+    def test_unknown_profile_rows_are_rejected(self, db):
+        """Test que el lote descarta, con una consulta, el feedback de perfiles inexistentes."""
+        profile = Profile(province="Salta")
+        db.add(profile)
+        db.commit()
+        writer = _writer()
+        service = FeedbackService(db, writer=writer)
+        valid = service.create(_feedback(profile_id=profile.id))
+        orphan = service.create(_feedback(profile_id=uuid.uuid4()))
+
+        with count_queries() as statements:
+            writer.flush()
+
+        assert writer.snapshot()["rejected"] == 1
+        assert len([s for s in statements if s.startswith("SELECT profiles.id")]) == 1
+        assert db.get(Feedback, valid.id) is not None
+        assert db.get(Feedback, orphan.id) is None
+
+    def test_invalid_row_does_not_drop_batch(self, db):
+        """Test que una fila inválida se descarta sin perder el resto del lote."""
+        existing = FeedbackService(db).create(_feedback())
+        writer = _writer()
+        service = FeedbackService(db, writer=writer)
+        valid = [service.create(_feedback()) for _ in range(3)]
+        writer.submit(
+            {
+                "id": existing.id,
+                "profile_id": None,
+                "target_type": "program",
+                "target_id": uuid.uuid4(),
+                "rating": 1,
+                "comment": None,
+                "created_at": datetime.now(UTC),
+            }
+        )
+
+        writer.flush()
+
+        assert writer.snapshot()["rejected"] == 1
+        assert all(db.get(Feedback, f.id) is not None for f in valid)
+        assert db.get(Feedback, existing.id).rating == 4
+
+
+@pytest.mark.parametrize(
+    ("comment", "expected"),
+    [
+        (None, "\\N"),
+        ("simple", "simple"),
+        ("tab\there", "tab\\there"),
+        ("línea\nnueva\r", "línea\\nnueva\\r"),
+        ("barra \\N", "barra \\\\N"),
+    ],
+)
+def test_copy_rows_escapes_values(comment, expected):
+    """Test que las filas de COPY escapan separadores y distinguen NULL."""
+    created_at = datetime(2026, 10, 18, 12, 30, tzinfo=UTC)
+    row = {"comment": comment, "rating": 3, "created_at": created_at}
+
+    assert copy_rows([row], ("rating", "comment", "created_at")) == (
+        f"3\t{expected}\t2026-10-18T12:30:00+00:00\n"
+    )
@@ -3,8 +3,12 @@ Tests para endpoints de health check y root.
 """
 
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
 from src import __version__
+from src.main import app
+from src.services.warmup import Warmup
 
 
 def test_health_check(client: TestClient):
@@ -36,3 +40,37 @@ def test_openapi_docs(client: TestClient):
     assert response.status_code == 200
     data = response.json()
     assert data["info"]["title"] == "Orientation Platform API"
+
+
+def test_ready_after_warmup(client: TestClient):
+    """Test que /ready reporta lista la instancia tras el warmup."""
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["checks"]["database"]["ok"] is True
+    assert data["checks"]["catalog"]["loaded"] is True
+    assert data["checks"]["warmup"]["status"] == "ready"
+    assert set(data["checks"]["warmup"]["steps_ms"]) == {"pool", "catalog", "recommendation"}
+
+
+def test_not_ready_until_warmup_succeeds(client: TestClient, monkeypatch, tmp_path):
+    """Test que sin BD el warmup falla y /ready responde 503."""
+    unreachable = sessionmaker(bind=create_engine(f"sqlite:///{tmp_path}/missing/db.sqlite"))
+
+    def session_factory():
+        db = unreachable()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    warmup = Warmup(session_factory, pool_size=1, retry_interval=0)
+    monkeypatch.setattr(app.state, "warmup", warmup)
+    assert client.get("/ready").status_code == 503
+
+    assert warmup.run() is False
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["warmup"]["error"] == "OperationalError"
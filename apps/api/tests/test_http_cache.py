@@ -0,0 +1,134 @@
+"""
+Tests para el cache HTTP de los endpoints del catálogo.
+"""
+
+import uuid
+from email.utils import formatdate
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.middleware.http_cache import catalog_response_cache
+from src.models.institution import Institution
+from src.models.program import Program
+from tests.conftest import count_queries
+
+
+@pytest.fixture
+def program(db) -> Program:
+    """Crea un programa del catálogo."""
+    institution = Institution(name="UNLP", type="university", province="Buenos Aires")
+    db.add(institution)
+    db.commit()
+    program = Program(
+        institution_id=institution.id,
+        name="Arquitectura",
+        type="degree",
+        modality="in_person",
+        area="arts",
+    )
+    db.add(program)
+    db.commit()
+    return program
+
+
+def test_catalog_responses_carry_cache_headers(client: TestClient, program):
+    """Test que las respuestas del catálogo incluyen ETag, Last-Modified y Cache-Control."""
+    for url in ("/api/v1/programs", f"/api/v1/programs/{program.id}", "/api/v1/trajectories"):
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('W/"')
+        assert "last-modified" in response.headers
+        assert response.headers["cache-control"] == "public, max-age=60"
+
+
+def test_if_none_match_returns_304(client: TestClient, program):
+    """Test que una copia vigente se valida sin consultar la BD."""
+    url = f"/api/v1/programs/{program.id}"
+    etag = client.get(url).headers["etag"]
+
+    with count_queries() as statements:
+        response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert statements == []
+
+
+@pytest.mark.usefixtures("program")
+def test_if_modified_since_returns_304(client: TestClient):
+    """Test que If-Modified-Since posterior al último cambio devuelve 304."""
+    later = formatdate(usegmt=True)
+
+    response = client.get("/api/v1/programs", headers={"If-Modified-Since": later})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.usefixtures("program")
+def test_rendered_response_served_from_cache(client: TestClient):
+    """Test que la misma combinación de filtros reutiliza los bytes renderizados."""
+    first = client.get("/api/v1/programs", params={"area": "arts", "per_page": 5})
+    hits = catalog_response_cache.hits
+
+    with count_queries() as statements:
+        # Mismos filtros en otro orden
+        second = client.get("/api/v1/programs", params={"per_page": 5, "area": "arts"})
+
+    assert statements == []
+    assert second.content == first.content
+    assert catalog_response_cache.hits == hits + 1
+
+
+def test_catalog_change_changes_etag(client: TestClient, db, program):
+    """Test que modificar el catálogo invalida el ETag y las respuestas guardadas."""
+    url = f"/api/v1/programs/{program.id}"
+    etag = client.get(url).headers["etag"]
+
+    program.name = "Arquitectura y Urbanismo"
+    db.commit()
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["name"] == "Arquitectura y Urbanismo"
+
+
+def test_errors_and_other_routes_are_not_cached(client: TestClient):
+    """Test que los 404 y las rutas fuera del catálogo no llevan ETag."""
+    missing = client.get(f"/api/v1/programs/{uuid.uuid4()}")
+    profile = client.post("/api/v1/profiles", json={"province": "Misiones"})
+
+    assert missing.status_code == 404
+    assert "etag" not in missing.headers
+    assert "etag" not in profile.headers
+
+
+def test_current_etag_does_not_hide_errors(client: TestClient, program):
+    """Test que un ETag vigente no convierte en 304 un 404 o un 422."""
+    etag = client.get(f"/api/v1/programs/{program.id}").headers["etag"]
+    headers = {"If-None-Match": etag}
+
+    missing = client.get(f"/api/v1/programs/{uuid.uuid4()}", headers=headers)
+    invalid = client.get("/api/v1/programs", params={"per_page": "muchos"}, headers=headers)
+
+    assert missing.status_code == 404
+    assert invalid.status_code == 422
+
+
+@pytest.mark.usefixtures("program")
+def test_uncached_url_is_validated_before_304(client: TestClient):
+    """Test que una URL aún no cacheada pasa por el endpoint y luego responde 304."""
+    etag = client.get("/api/v1/programs").headers["etag"]
+    url = "/api/v1/programs?area=arts"
+
+    first = client.get(url, headers={"If-None-Match": etag})
+    with count_queries() as statements:
+        second = client.get(url, headers={"If-None-Match": etag})
+
+    assert first.status_code == 304
+    assert first.content == b""
+    assert second.status_code == 304
+    assert statements == []
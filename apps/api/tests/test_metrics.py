@@ -0,0 +1,86 @@
+"""
+Tests para el registro de métricas y el endpoint /metrics.
+"""
+
+import threading
+
+from fastapi.testclient import TestClient
+
+from src.metrics import Histogram, Registry
+from src.models.profile import Profile
+
+
+def test_registry_renders_prometheus_text():
+    """Test del formato de texto de contadores, gauges, histogramas y callbacks."""
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.", labels=("route",))
+    in_flight = registry.gauge("in_flight", "En curso.")
+    latency = registry.histogram("latency_seconds", "Latencia.", buckets=(0.1, 1.0))
+    registry.register_callback("ratio", "Proporción.", lambda: [({"cache": 'a"b'}, 0.5)])
+
+    requests.labels("/items/{id}").inc()
+    requests.labels("/items/{id}").inc()
+    in_flight.inc()
+    latency.observe(0.05)
+    latency.observe(3.0)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/items/{id}"} 2' in lines
+    assert "in_flight 1" in lines
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in lines
+    assert "latency_seconds_count 2" in lines
+    assert "latency_seconds_sum 3.05" in lines
+    assert 'ratio{cache="a\\"b"} 0.5' in lines
+
+
+def test_gauge_decrements_from_other_threads():
+    """Test que un gauge suma los fragmentos de todos los hilos."""
+    registry = Registry()
+    gauge = registry.gauge("in_flight", "En curso.")
+    gauge.inc()
+    thread = threading.Thread(target=gauge.dec)
+    thread.start()
+    thread.join()
+
+    assert gauge.value == 0
+
+
+def test_histogram_time():
+    """Test que `time` observa la duración del bloque."""
+    histogram = Histogram()
+    with histogram.time():
+        pass
+
+    assert histogram.snapshot()["count"] == 1
+
+
+def test_metrics_endpoint(client: TestClient, db):
+    """Test que /metrics expone latencias por ruta, fases y caches."""
+    profile = Profile(interest_areas=["technology"])
+    db.add(profile)
+    db.commit()
+    client.post("/api/v1/recommendations", json={"profile_id": str(profile.id)})
+    client.get("/api/v1/programs/not-a-uuid")
+    client.get("/no-existe")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert (
+        'http_requests_total{method="GET",route="/api/v1/programs/{program_id}",status="422"}'
+        in body
+    )
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in body
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/v1/recommendations"}' in (
+        body
+    )
+    for phase in ("load", "score", "select", "persist"):
+        assert f'recommendation_phase_duration_seconds_count{{phase="{phase}"}}' in body
+    assert "http_requests_in_flight 1" in body
+    assert 'cache_requests_total{cache="recommendations",result="miss"}' in body
+    assert "db_statement_duration_seconds_count" in body
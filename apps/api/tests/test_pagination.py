@@ -0,0 +1,142 @@
+"""
+Tests para la paginación de listados (por página y por cursor).
+"""
+
+import base64
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.models.institution import Institution
+from src.models.program import Program
+from src.models.trajectory import Trajectory
+
+
+@pytest.fixture
+def programs(db) -> list[Program]:
+    """Crea 25 programas en dos instituciones."""
+    north = Institution(name="UNT", type="university", province="Tucumán")
+    south = Institution(name="UNPSJB", type="university", province="Chubut")
+    db.add_all([north, south])
+    db.commit()
+    programs = [
+        Program(
+            institution_id=(north if i % 2 else south).id,
+            name=f"Programa {i:02d}",
+            type="degree",
+            modality="in_person",
+            area="technology",
+        )
+        for i in range(25)
+    ]
+    db.add_all(programs)
+    db.commit()
+    return programs
+
+
+def _walk(client: TestClient, url: str, **params) -> list[dict]:
+    """Recorre todas las páginas siguiendo `next_cursor`."""
+    pages = []
+    cursor = None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        data = client.get(url, params=query).json()
+        pages.append(data)
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_walks_all_programs_in_order(client: TestClient, programs):
+    """Test que el cursor recorre todos los programas sin repetir ni saltear."""
+    pages = _walk(client, "/api/v1/programs", per_page=10)
+
+    names = [item["name"] for page in pages for item in page["items"]]
+    assert names == sorted(program.name for program in programs)
+    assert [len(page["items"]) for page in pages] == [10, 10, 5]
+    # Con cursor el total solo se calcula si se pide
+    assert pages[1]["total"] is None
+    assert pages[1]["page"] is None
+
+
+@pytest.mark.usefixtures("programs")
+def test_page_mode_is_backward_compatible(client: TestClient):
+    """Test que `page` sigue funcionando y coincide con el cursor."""
+    first = client.get("/api/v1/programs", params={"per_page": 10}).json()
+    second = client.get("/api/v1/programs", params={"per_page": 10, "page": 2}).json()
+    by_cursor = client.get(
+        "/api/v1/programs", params={"per_page": 10, "cursor": first["next_cursor"]}
+    ).json()
+
+    assert second["total"] == 25
+    assert second["pages"] == 3
+    assert second["page"] == 2
+    assert second["items"] == by_cursor["items"]
+
+
+@pytest.mark.usefixtures("programs")
+def test_cursor_with_filters_and_total(client: TestClient):
+    """Test que el cursor respeta los filtros y calcula el total a pedido."""
+    pages = _walk(client, "/api/v1/programs", per_page=5, province="Tucumán", include_total=True)
+
+    items = [item for page in pages for item in page["items"]]
+    assert len(items) == 12
+    assert all(page["total"] == 12 for page in pages)
+    assert not any(page["total_estimated"] for page in pages)
+
+
+@pytest.mark.usefixtures("programs")
+def test_estimated_total_falls_back_to_count(client: TestClient):
+    """Test que sin estadísticas de Postgres el total se cuenta."""
+    data = client.get("/api/v1/programs", params={"estimate_total": True}).json()
+
+    assert data["total"] == 25
+    assert data["total_estimated"] is False
+
+
+def test_invalid_cursor(client: TestClient):
+    """Test que un cursor inválido es un error del cliente."""
+    response = client.get("/api/v1/programs", params={"cursor": "no-es-un-cursor"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("key", [{"a": 1}, [1], None, 3, True])
+@pytest.mark.parametrize("path", ["/api/v1/programs", "/api/v1/trajectories"])
+def test_cursor_key_of_wrong_type(client: TestClient, path, key):
+    """Test que un cursor con una clave del tipo equivocado es un error del cliente."""
+    payload = json.dumps([key, str(uuid.uuid4())]).encode()
+    cursor = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    response = client.get(path, params={"cursor": cursor})
+
+    assert response.status_code == 400
+
+
+def test_trajectories_newest_first(client: TestClient, db, programs):
+    """Test que las trayectorias se paginan de la más reciente a la más antigua."""
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    for i in range(7):
+        db.add(
+            Trajectory(
+                program_id=programs[0].id,
+                title=f"Trayectoria {i}",
+                summary="Resumen",
+                story="Historia",
+                outcome="completed",
+                is_verified=True,
+                # Dos trayectorias por instante: el ID desempata
+                created_at=start + timedelta(days=i // 2),
+            )
+        )
+    db.commit()
+
+    pages = _walk(client, "/api/v1/trajectories", per_page=3)
+
+    titles = [item["title"] for page in pages for item in page["items"]]
+    assert len(titles) == len(set(titles)) == 7
+    assert titles[0] == "Trayectoria 6"
+    assert titles[-2:] in (["Trayectoria 1", "Trayectoria 0"], ["Trayectoria 0", "Trayectoria 1"])
@@ -0,0 +1,92 @@
+"""
+Tests de regresión de los planes de consulta de los listados.
+
+Capturan las sentencias que ejecutan los servicios y verifican el SQL
+generado (un JOIN por relación, sin EXISTS) y el plan que elige la BD de
+tests (EXPLAIN QUERY PLAN de SQLite) para que use los índices esperados.
+"""
+
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.schemas.programs import ProgramFilters
+from src.schemas.trajectories import TrajectoryFilters
+from src.services.program_service import ProgramService
+from src.services.recommendation_service import RecommendationService
+from src.services.trajectory_service import TrajectoryService
+from tests.conftest import engine
+
+
+def explain(db: Session, run: Callable[[], object]) -> list[tuple[str, str]]:
+    """Ejecuta `run` y retorna cada SELECT emitido junto con su plan."""
+    captured: list[tuple[str, tuple]] = []
+
+    def before_cursor_execute(_conn, _cursor, statement, parameters, *_):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    connection = db.connection()
+    plans = []
+    for statement, parameters in captured:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        plans.append((statement, "\n".join(row[-1] for row in rows)))
+    return plans
+
+
+def _joins(statement: str, table: str) -> int:
+    return statement.count(f"JOIN {table} ")
+
+
+def test_program_province_filter_uses_single_join(db):
+    """Test que filtrar por provincia reutiliza el JOIN de la institución."""
+    plans = explain(
+        db, lambda: ProgramService(db).list(ProgramFilters(province="Neuquén"), include_total=True)
+    )
+
+    assert len(plans) == 2  # total + página
+    for statement, plan in plans:
+        assert _joins(statement, "institutions") == 1
+        assert "EXISTS" not in statement
+        assert "idx_institutions_province" in plan
+
+
+def test_program_combined_filters_use_composite_index(db):
+    """Test que area + modalidad + tipo se resuelven con el índice compuesto."""
+    filters = ProgramFilters(area="health", modality="remote", type="degree")
+
+    [(statement, plan)] = explain(db, lambda: ProgramService(db).list(filters, include_total=False))
+
+    assert _joins(statement, "institutions") == 1
+    assert "idx_programs_area_modality_type (area=? AND modality=? AND type=?)" in plan
+
+
+def test_trajectory_area_filter_uses_one_join_per_relation(db):
+    """Test que el filtro por área no agrega un EXISTS ni un segundo JOIN."""
+    plans = explain(
+        db, lambda: TrajectoryService(db).list(TrajectoryFilters(area="arts"), include_total=True)
+    )
+
+    assert len(plans) == 2
+    for statement, plan in plans:
+        assert _joins(statement, "programs") == 1
+        assert _joins(statement, "institutions") == 1
+        assert "EXISTS" not in statement
+        assert "idx_trajectories_verified_program" in plan
+
+
+def test_matched_trajectories_use_partial_index(db):
+    """Test que el motor lee las trayectorias verificadas del índice parcial."""
+    service = RecommendationService(db)
+
+    [(_, plan)] = explain(db, lambda: service._load_trajectories({uuid.uuid4()}))
+
+    assert "idx_trajectories_verified_program" in plan
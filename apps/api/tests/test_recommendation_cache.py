@@ -0,0 +1,153 @@
+"""
+Tests para el cache de resultados de recomendaciones.
+"""
+
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.models.recommendation import Recommendation
+from src.models.trajectory import Trajectory
+from src.services.recommendation_cache import (
+    RecommendationCache,
+    profile_fingerprint,
+    recommendation_cache,
+)
+from src.services.recommendation_service import RecommendationService
+
+
+def _create_program(db, name: str = "Sistemas") -> Program:
+    institution = Institution(name="UTN", type="university", province="Buenos Aires")
+    db.add(institution)
+    db.commit()
+    program = Program(
+        institution_id=institution.id,
+        name=name,
+        type="degree",
+        modality="hybrid",
+        area="technology",
+    )
+    db.add(program)
+    db.commit()
+    return program
+
+
+def _create_profile(db, **fields) -> Profile:
+    profile = Profile(**fields)
+    db.add(profile)
+    db.commit()
+    return profile
+
+
+class TestProfileFingerprint:
+    """Tests para la huella canónica del perfil."""
+
+    def test_equivalent_profiles_share_fingerprint(self):
+        """Test que valores equivalentes para el motor producen la misma huella."""
+        first = Profile(
+            province="Córdoba",
+            interest_areas=["health", "technology"],
+            preferred_modality="no_preference",
+            locality="Villa María",
+        )
+        second = Profile(
+            province="Córdoba",
+            interest_areas=["technology", "health", "health"],
+            preferred_modality=None,
+            max_weekly_hours=20,
+        )
+
+        assert profile_fingerprint(first) == profile_fingerprint(second)
+
+    def test_scoring_fields_change_fingerprint(self):
+        """Test que cambiar un campo relevante cambia la huella."""
+        base = Profile(province="Córdoba", works_while_studying="yes")
+        other = Profile(province="Córdoba", works_while_studying="maybe")
+
+        assert profile_fingerprint(base) != profile_fingerprint(other)
+
+
+class TestRecommendationCache:
+    """Tests para el cache LRU con TTL."""
+
+    def test_lru_eviction(self):
+        """Test que se desaloja la entrada menos usada."""
+        cache = RecommendationCache(maxsize=2, ttl=60)
+        cache.put(("a", 1, 10), [])
+        cache.put(("b", 1, 10), [])
+        cache.get(("a", 1, 10))
+        cache.put(("c", 1, 10), [])
+
+        assert cache.get(("b", 1, 10)) is None
+        assert cache.get(("a", 1, 10)) == []
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiration(self):
+        """Test que las entradas expiradas no se devuelven."""
+        cache = RecommendationCache(maxsize=10, ttl=-1)
+        cache.put(("a", 1, 10), [])
+
+        assert cache.get(("a", 1, 10)) is None
+        assert len(cache) == 0
+
+    def test_disabled_cache(self):
+        """Test que un cache de tamaño 0 no guarda nada."""
+        cache = RecommendationCache(maxsize=0, ttl=60)
+        cache.put(("a", 1, 10), [])
+
+        assert cache.get(("a", 1, 10)) is None
+
+
+class TestCachedGeneration:
+    """Tests del cache integrado al motor de recomendaciones."""
+
+    def test_equivalent_profiles_hit_cache_and_persist(self, db):
+        """Test que un perfil equivalente reutiliza el ranking pero se persiste."""
+        _create_program(db)
+        first = _create_profile(db, interest_areas=["technology"], locality="Tandil")
+        second = _create_profile(db, interest_areas=["technology"], locality="Azul")
+        service = RecommendationService(db)
+
+        first_result = service.generate(first.id)
+        second_result = service.generate(second.id)
+
+        assert recommendation_cache.stats.misses == 1
+        assert recommendation_cache.stats.hits == 1
+        assert second_result.programs == first_result.programs
+        assert second_result.id != first_result.id
+        assert db.query(Recommendation).count() == 2
+
+    def test_limit_is_part_of_key(self, db):
+        """Test que distintos límites no comparten resultados."""
+        _create_program(db)
+        profile = _create_profile(db, interest_areas=["technology"])
+        service = RecommendationService(db)
+
+        service.generate(profile.id, limit=5)
+        service.generate(profile.id, limit=10)
+
+        assert recommendation_cache.stats.hits == 0
+
+    def test_catalog_change_invalidates(self, db):
+        """Test que cambios en programas o trayectorias invalidan el cache."""
+        program = _create_program(db)
+        profile = _create_profile(db, interest_areas=["technology"], works_while_studying="yes")
+        service = RecommendationService(db)
+        service.generate(profile.id)
+
+        db.add(
+            Trajectory(
+                program_id=program.id,
+                title="Trabajé y estudié",
+                summary="Resumen",
+                story="Historia",
+                outcome="completed",
+                context={"worked_while_studying": True},
+                is_verified=True,
+            )
+        )
+        db.commit()
+
+        assert len(recommendation_cache) == 0
+        result = service.generate(profile.id)
+        assert recommendation_cache.stats.hits == 0
+        assert result.programs[0].matched_trajectories[0].title == "Trabajé y estudié"
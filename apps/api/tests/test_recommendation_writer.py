@@ -0,0 +1,183 @@
+"""
+Tests para la persistencia diferida (write-behind) de recomendaciones.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.models.recommendation import Recommendation
+from src.services.recommendation_service import RecommendationService
+from src.services.recommendation_writer import RecommendationWriter
+from src.services.write_behind import WriteBehindFull, WriteBehindQueue
+from tests.conftest import TestingSessionLocal, count_queries
+
+
+@pytest.fixture
+def profile(db) -> Profile:
+    """Crea un programa y un perfil que lo recibe como recomendación."""
+    institution = Institution(name="UNCuyo", type="university", province="Mendoza")
+    db.add(institution)
+    db.commit()
+    db.add(
+        Program(
+            institution_id=institution.id,
+            name="Enología",
+            type="degree",
+            modality="in_person",
+            area="agriculture",
+        )
+    )
+    profile = Profile(interest_areas=["agriculture"], province="Mendoza")
+    db.add(profile)
+    db.commit()
+    return profile
+
+
+def _writer(**kwargs) -> RecommendationWriter:
+    return RecommendationWriter(TestingSessionLocal, **kwargs)
+
+
+class TestWriteBehind:
+    """Tests del modo write-behind."""
+
+    def test_response_served_from_buffer_until_flushed(self, db, profile):
+        """Test que la recomendación pendiente se lee del buffer en memoria."""
+        writer = _writer()
+        service = RecommendationService(db, writer=writer)
+
+        created = service.generate(profile.id)
+
+        assert db.query(Recommendation).count() == 0
+        assert service.get_by_id(created.id) == created
+
+        assert writer.flush() == 1
+        stored = db.get(Recommendation, created.id)
+        assert stored is not None
+        assert stored.profile_id == profile.id
+        fetched = service.get_by_id(created.id)
+        assert fetched.programs == created.programs
+
+    def test_backpressure_falls_back_to_inline_write(self, db, profile):
+        """Test que con la cola llena la recomendación se persiste en línea."""
+        writer = _writer(maxsize=1, put_timeout=0)
+        service = RecommendationService(db, writer=writer, cache=None)
+
+        queued = service.generate(profile.id)
+        inline = service.generate(profile.id)
+
+        assert db.get(Recommendation, inline.id) is not None
+        assert db.get(Recommendation, queued.id) is None
+        assert writer.get(inline.id) is None
+
+    def test_stop_drains_queue_in_batches(self, db, profile):
+        """Test que al detenerse se escribe todo lo pendiente, en lotes."""
+        writer = _writer(batch_size=10)
+        service = RecommendationService(db, writer=writer)
+        created = [service.generate(profile.id) for _ in range(25)]
+
+        with count_queries() as statements:
+            writer.stop()
+
+        inserts = [s for s in statements if s.startswith("INSERT INTO recommendations")]
+        assert len(inserts) == 3
+        assert db.query(Recommendation).count() == 25
+        assert all(writer.get(r.id) is None for r in created)
+
+    def test_background_worker_flushes(self, db, profile):
+        """Test que el hilo de fondo persiste las recomendaciones."""
+        writer = _writer(flush_interval=0.01)
+        writer.start()
+        try:
+            created = RecommendationService(db, writer=writer).generate(profile.id)
+        finally:
+            writer.stop(timeout=5)
+
+        assert db.get(Recommendation, created.id) is not None
+        assert writer.queue.written == 1
+
+
+class TestWriteBehindQueue:
+    """Tests de la cola genérica ante fallos y apagado."""
+
+    def test_transient_error_is_retried_and_kept_in_flight(self, db, profile):
+        """Test que un error transitorio se reintenta sin perder la recomendación."""
+        writer = _writer(batch_size=10)
+        writer.queue.retry_backoff = 0
+        write = writer.queue._write
+        calls: list[int] = []
+
+        def flaky(batch):
+            calls.append(len(batch))
+            if len(calls) <= 2:
+                # La recomendación sigue visible mientras no se escribe
+                assert all(writer.get(r.id) is not None for r in batch)
+                raise OperationalError("INSERT", {}, Exception("conexión perdida"))
+            write(batch)
+
+        writer.queue._write = flaky
+        created = RecommendationService(db, writer=writer).generate(profile.id)
+
+        writer.flush()
+
+        assert calls == [1, 1, 1]
+        assert writer.queue.retried == 2
+        assert writer.queue.failed == 0
+        assert db.get(Recommendation, created.id) is not None
+        assert writer.get(created.id) is None
+
+    def test_non_transient_error_drops_batch(self):
+        """Test que un error no recuperable descarta el lote sin reintentar."""
+        done: list[list[int]] = []
+
+        def write(_batch):
+            raise ValueError("fila inválida")
+
+        queue = WriteBehindQueue("test", write=write, on_done=done.append)
+        queue.submit(1)
+        queue.flush()
+
+        assert queue.failed == 1
+        assert queue.retried == 0
+        assert done == [[1]]
+
+    def test_stop_gives_up_after_bounded_retries(self):
+        """Test que al detenerse con la BD caída los reintentos son acotados."""
+
+        def write(_batch):
+            raise OperationalError("INSERT", {}, Exception("sin conexión"))
+
+        queue = WriteBehindQueue("test", write=write, retry_backoff=0, stop_retries=2)
+        queue.submit(1)
+        queue.stop()
+
+        assert queue.retried == 2
+        assert queue.failed == 1
+
+    def test_items_accepted_during_stop_are_written(self):
+        """Test que todo lo aceptado por `submit` se escribe aunque `stop` sea concurrente."""
+        written: list[int] = []
+        queue = WriteBehindQueue("test", write=written.extend, flush_interval=0.001)
+        queue.start()
+        accepted: list[int] = []
+
+        def producer(offset: int) -> None:
+            for i in range(offset, offset + 2000):
+                try:
+                    queue.submit(i)
+                except WriteBehindFull:
+                    return
+                accepted.append(i)
+
+        threads = [threading.Thread(target=producer, args=(n * 10_000,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        queue.stop()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(written) == sorted(accepted)
@@ -7,7 +7,10 @@ import pytest
 from src.models.institution import Institution
 from src.models.profile import Profile
 from src.models.program import Program
+from src.models.trajectory import Trajectory
+from src.services.catalog import catalog_store
 from src.services.recommendation_service import RecommendationService
+from tests.conftest import count_queries
 
 
 class TestRecommendationScoring:
@@ -311,3 +314,140 @@ class TestRecommendationGeneration:
             assert reason.description
             assert reason.weight >= 0
             assert reason.contribution >= 0
+
+
+class TestMatchedTrajectories:
+    """Tests para las trayectorias similares de cada recomendación."""
+
+    def _create_catalog(self, db, programs: int, trajectories_per_program: int):
+        institution = Institution(
+            name="UNLP",
+            type="university",
+            province="Buenos Aires",
+            is_public=True,
+        )
+        db.add(institution)
+        db.commit()
+
+        created = []
+        for i in range(programs):
+            program = Program(
+                institution_id=institution.id,
+                name=f"Programa {i}",
+                type="degree",
+                modality="in_person",
+                area="technology",
+                duration_years=2 + i % 4,
+            )
+            db.add(program)
+            created.append(program)
+        db.commit()
+
+        for program in created:
+            for j in range(trajectories_per_program):
+                db.add(
+                    Trajectory(
+                        program_id=program.id,
+                        title=f"Historia {j}",
+                        summary="Resumen",
+                        story="Historia completa",
+                        outcome="completed",
+                        context={"worked_while_studying": j == 0},
+                        is_verified=j != 1,
+                    )
+                )
+        db.commit()
+        return created
+
+    def test_trajectories_resolved_in_single_query(self, db):
+        """Test que las trayectorias se resuelven con una sola consulta."""
+        self._create_catalog(db, programs=20, trajectories_per_program=5)
+        profile = Profile(interest_areas=["technology"], works_while_studying="yes")
+        db.add(profile)
+        db.commit()
+        service = RecommendationService(db)
+        service.generate(profile.id)  # Compila el catálogo
+
+        with count_queries() as statements:
+            result = service.generate(profile.id, limit=5)
+
+        trajectory_queries = [s for s in statements if "FROM trajectories" in s]
+        assert len(trajectory_queries) == 1
+        assert len(result.programs) == 5
+
+    def test_at_most_three_verified_trajectories(self, db):
+        """Test que se incluyen hasta 3 trayectorias verificadas por programa."""
+        self._create_catalog(db, programs=2, trajectories_per_program=5)
+        profile = Profile(interest_areas=["technology"], works_while_studying="yes")
+        db.add(profile)
+        db.commit()
+
+        result = RecommendationService(db).generate(profile.id)
+
+        for recommended in result.programs:
+            titles = [t.title for t in recommended.matched_trajectories]
+            assert titles == ["Historia 0", "Historia 2", "Historia 3"]
+            assert (
+                recommended.matched_trajectories[0].match_reason
+                == "También trabajaba mientras estudiaba"
+            )
+
+
+class TestGetRecommendation:
+    """Tests para la lectura de recomendaciones guardadas."""
+
+    def _create_recommendation(self, db, limit: int):
+        institution = Institution(
+            name="UTN",
+            short_name="UTN",
+            type="university",
+            province="Buenos Aires",
+            is_public=True,
+        )
+        db.add(institution)
+        db.commit()
+        db.add_all(
+            Program(
+                institution_id=institution.id,
+                name=f"Programa {i}",
+                type="technical",
+                modality="in_person",
+                area="technology",
+            )
+            for i in range(limit)
+        )
+        profile = Profile(interest_areas=["technology"])
+        db.add(profile)
+        db.commit()
+        return RecommendationService(db).generate(profile.id, limit=limit)
+
+    def test_get_by_id_rebuilds_programs(self, db):
+        """Test que la recomendación guardada se reconstruye completa."""
+        created = self._create_recommendation(db, limit=3)
+
+        result = RecommendationService(db).get_by_id(created.id)
+
+        assert result is not None
+        assert [p.model_dump() for p in result.programs] == [
+            p.model_dump() for p in created.programs
+        ]
+        assert result.programs[0].program.institution.short_name == "UTN"
+
+    @pytest.mark.parametrize("use_catalog", [True, False])
+    def test_get_by_id_constant_query_count(self, db, use_catalog):
+        """Test que la cantidad de consultas no depende de `limit`."""
+        counts = []
+        for limit in (1, 5, 20):
+            created = self._create_recommendation(db, limit=limit)
+            if not use_catalog:
+                catalog_store.clear()
+            db.expire_all()
+
+            with count_queries() as statements:
+                result = RecommendationService(db).get_by_id(created.id)
+
+            assert len(result.programs) == limit
+            counts.append(len(statements))
+
+        assert counts[0] == counts[1] == counts[2]
+        assert counts[0] == (1 if use_catalog else 2)
@@ -0,0 +1,83 @@
+"""
+Tests para las respuestas pre-serializadas.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.responses import ModelResponse
+from src.schemas.recommendations import RecommendationResponse
+from src.services.recommendation_cache import recommendation_cache
+from src.services.recommendation_service import RecommendationService
+
+
+@pytest.fixture
+def profile(db) -> Profile:
+    """Crea un programa y un perfil interesado en su área."""
+    institution = Institution(name="UNR", type="university", province="Santa Fe")
+    db.add(institution)
+    db.commit()
+    db.add(
+        Program(
+            institution_id=institution.id,
+            name="Medicina",
+            type="degree",
+            modality="in_person",
+            area="health",
+            duration_years=6,
+        )
+    )
+    profile = Profile(interest_areas=["health"], province="Santa Fe")
+    db.add(profile)
+    db.commit()
+    return profile
+
+
+def test_model_response_matches_model_dump(db, profile):
+    """Test que el cuerpo es el mismo JSON que produce pydantic."""
+    recommendation = RecommendationService(db).generate(profile.id)
+
+    response = ModelResponse(recommendation, status_code=201)
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == json.loads(recommendation.model_dump_json())
+
+
+def test_cache_hit_reuses_serialized_ranking(db, profile):
+    """Test que un acierto del cache reutiliza el JSON del ranking."""
+    service = RecommendationService(db)
+    first = service.generate(profile.id)
+    second = service.generate(profile.id)
+
+    assert recommendation_cache.stats.hits == 1
+    assert "programs" in second._serialized
+    assert second.render_json() == second.model_dump_json().encode()
+    assert (
+        json.loads(second.render_json())["programs"] == json.loads(first.render_json())["programs"]
+    )
+
+
+def test_endpoints_serve_valid_responses(client: TestClient, profile):
+    """Test que los endpoints mantienen códigos de estado y cuerpos."""
+    created = client.post("/api/v1/recommendations", json={"profile_id": str(profile.id)})
+    assert created.status_code == 201
+    body = RecommendationResponse.model_validate(created.json())
+    assert body.programs[0].program.name == "Medicina"
+
+    fetched = client.get(f"/api/v1/recommendations/{body.id}")
+    assert fetched.status_code == 200
+    assert fetched.json()["id"] == str(body.id)
+
+    listed = client.get("/api/v1/programs")
+    assert listed.status_code == 200
+    assert listed.json()["items"][0]["name"] == "Medicina"
+
+    profile_created = client.post("/api/v1/profiles", json={"province": "Salta"})
+    assert profile_created.status_code == 201
+    assert profile_created.json()["province"] == "Salta"
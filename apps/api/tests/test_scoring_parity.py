@@ -0,0 +1,180 @@
+"""
+Tests de paridad entre el motor por reglas y el scoring vectorizado.
+"""
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from src.models.institution import Institution
+from src.models.profile import Profile
+from src.models.program import Program
+from src.services.catalog import catalog_store
+from src.services.recommendation_service import RecommendationService
+from src.services.scoring import (
+    FACTORS,
+    encode_profile,
+    factor_contributions,
+    score_catalog,
+    select_top,
+)
+
+PROVINCES = ["Buenos Aires", "Córdoba", "Mendoza"]
+AREAS = ["technology", "health", "business", "arts", "custom_area"]
+MODALITIES = ["in_person", "remote", "hybrid"]
+SHIFTS = [None, "morning", "afternoon", "evening", "flexible"]
+DURATIONS = [None, 0, 1, 1.5, 2, 3, 3.5, 4, 5, 5.5, 6]
+WORK_COMPATIBLE = [None, True, False]
+
+PROFILES = [
+    {
+        "interest_areas": interests,
+        "works_while_studying": works,
+        "preferred_modality": modality,
+        "province": province,
+    }
+    for interests, works, modality, province in itertools.product(
+        [None, [], ["technology"], ["health", "arts"], ["education"]],
+        [None, "yes", "no", "maybe"],
+        [None, "no_preference", "in_person", "remote", "hybrid"],
+        [None, "Córdoba", "Jujuy"],
+    )
+]
+
+
+@pytest.fixture
+def catalog_db(db):
+    """Crea un catálogo sintético que cubre todas las combinaciones de reglas."""
+    rng = random.Random(42)
+    institutions = [
+        Institution(name=f"Institución {province}", type="university", province=province)
+        for province in PROVINCES
+    ]
+    db.add_all(institutions)
+    db.commit()
+
+    db.add_all(
+        Program(
+            institution_id=rng.choice(institutions).id,
+            name=f"Programa {i}",
+            type="degree",
+            area=rng.choice(AREAS),
+            modality=rng.choice(MODALITIES),
+            shift=rng.choice(SHIFTS),
+            duration_years=rng.choice(DURATIONS),
+            work_compatible=rng.choice(WORK_COMPATIBLE),
+        )
+        for i in range(300)
+    )
+    db.commit()
+    return db
+
+
+def _profile(db, **fields) -> Profile:
+    profile = Profile(**fields)
+    db.add(profile)
+    db.commit()
+    return profile
+
+
+class TestScoringParity:
+    """El scoring vectorizado debe coincidir exactamente con las reglas."""
+
+    def test_scores_identical_for_every_program(self, catalog_db):
+        """Test que cada score vectorizado es idéntico al de `_calculate_score`."""
+        catalog = catalog_store.get(catalog_db)
+        service = RecommendationService(catalog_db, engine="rules")
+
+        for fields in PROFILES:
+            profile = Profile(**fields)
+            scores = score_catalog(catalog, profile, service.WEIGHTS)
+            for position in range(len(catalog)):
+                expected, _ = service._calculate_score(profile, catalog.program(position))
+                assert scores[position] == expected, (fields, catalog.program(position))
+
+    def test_factor_contributions_match_reasons(self, catalog_db):
+        """Test que cada contribución por factor coincide con su razón."""
+        catalog = catalog_store.get(catalog_db)
+        service = RecommendationService(catalog_db, engine="rules")
+
+        for fields in PROFILES[::7]:
+            profile = Profile(**fields)
+            contributions = factor_contributions(
+                catalog, encode_profile(catalog, profile), service.WEIGHTS
+            )
+            for position in range(len(catalog)):
+                _, reasons = service._calculate_score(profile, catalog.program(position))
+                by_factor = {reason.factor: reason.contribution for reason in reasons}
+                for row, factor in enumerate(FACTORS):
+                    value = contributions[row, position]
+                    if factor in by_factor:
+                        assert round(value, 3) == by_factor[factor]
+                    else:
+                        assert value == 0.0
+
+    @pytest.mark.parametrize("limit", [1, 10, 50])
+    def test_generate_returns_identical_recommendations(self, catalog_db, limit):
+        """Test que ambos motores generan las mismas recomendaciones y explicaciones."""
+        for fields in PROFILES[::11]:
+            profile = _profile(catalog_db, **fields)
+
+            rules = RecommendationService(catalog_db, engine="rules", cache=None).generate(
+                profile.id, limit
+            )
+            vectorized = RecommendationService(
+                catalog_db, engine="vectorized", cache=None
+            ).generate(profile.id, limit)
+
+            assert [p.model_dump() for p in vectorized.programs] == [
+                p.model_dump() for p in rules.programs
+            ]
+
+    def test_empty_catalog(self, db):
+        """Test que un catálogo vacío no genera recomendaciones."""
+        profile = _profile(db, interest_areas=["technology"], province="Córdoba")
+
+        result = RecommendationService(db, engine="vectorized").generate(profile.id)
+
+        assert result.programs == []
+
+
+class TestSelectTop:
+    """Tests para la selección acotada de los mejores programas."""
+
+    @pytest.mark.parametrize("limit", [1, 3, 10, 50, 500])
+    def test_matches_full_sort(self, limit):
+        """Test que coincide con ordenar todo por (score desc, posición)."""
+        rng = np.random.default_rng(7)
+        # Pocos valores distintos para forzar muchos empates
+        scores = rng.choice([0.0, 0.1, 0.25, 0.4, 0.65], size=200)
+
+        expected = sorted(
+            (position for position in range(len(scores)) if scores[position] > 0),
+            key=lambda position: (-scores[position], position),
+        )[:limit]
+
+        assert select_top(scores, limit).tolist() == expected
+
+    def test_ignores_non_positive_scores(self):
+        """Test que no selecciona programas sin score."""
+        scores = np.array([0.0, 0.3, 0.0, 0.1])
+
+        assert select_top(scores, 10).tolist() == [1, 3]
+
+    def test_ties_are_stable_between_engines(self, catalog_db):
+        """Test que ambos motores desempatan igual y de forma repetible."""
+        profile = _profile(catalog_db, interest_areas=["technology"])
+        vectorized = RecommendationService(catalog_db, engine="vectorized", cache=None)
+        first = vectorized.generate(profile.id, 5)
+        again = vectorized.generate(profile.id, 5)
+        rules = RecommendationService(catalog_db, engine="rules", cache=None).generate(
+            profile.id, 5
+        )
+
+        ids = [p.program_id for p in first.programs]
+        assert ids == [p.program_id for p in again.programs]
+        assert ids == [p.program_id for p in rules.programs]
+        for previous, current in itertools.pairwise(first.programs):
+            assert (previous.score, current.program_id) >= (current.score, previous.program_id)
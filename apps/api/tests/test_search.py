@@ -0,0 +1,174 @@
+"""
+Tests para la búsqueda de texto (índice en memoria).
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.models.institution import Institution
+from src.models.program import Program
+from src.models.trajectory import Trajectory
+from src.schemas.search import SearchScope
+from src.services.search_service import SearchService
+from src.services.text_search import WEIGHT_A, WEIGHT_B, InvertedIndex, tokenize
+
+
+@pytest.fixture
+def catalog(db) -> dict[str, Program]:
+    """Crea programas y trayectorias para buscar."""
+    institution = Institution(name="UTN", type="university", province="Córdoba")
+    db.add(institution)
+    db.commit()
+    programs = {
+        "sistemas": Program(
+            institution_id=institution.id,
+            name="Ingeniería en Sistemas de Información",
+            type="degree",
+            modality="in_person",
+            area="technology",
+        ),
+        "civil": Program(
+            institution_id=institution.id,
+            name="Ingeniería Civil",
+            type="degree",
+            modality="in_person",
+            area="engineering",
+            description="Estructuras, hidráulica y sistemas de transporte.",
+        ),
+        "enfermeria": Program(
+            institution_id=institution.id,
+            name="Licenciatura en Enfermería",
+            type="degree",
+            modality="hybrid",
+            area="health",
+        ),
+    }
+    db.add_all(programs.values())
+    db.commit()
+    db.add_all(
+        [
+            Trajectory(
+                program_id=programs["enfermeria"].id,
+                title="De cuidar a mi abuela a la enfermería",
+                summary="Cómo elegí la carrera",
+                story="Trabajaba de noche en una farmacia mientras cursaba.",
+                outcome="completed",
+                is_verified=True,
+            ),
+            Trajectory(
+                program_id=programs["enfermeria"].id,
+                title="Historia sin verificar",
+                summary="Farmacia",
+                story="Trabajaba en una farmacia.",
+                outcome="dropped",
+                is_verified=False,
+            ),
+        ]
+    )
+    db.commit()
+    return programs
+
+
+class TestTokenize:
+    """Tests para la normalización de términos."""
+
+    def test_accents_stopwords_plurals_and_gender(self):
+        """Test que se ignoran acentos, stopwords, plurales y género."""
+        assert tokenize("Ingeniería en Sistemas") == tokenize("ingenieria sistema")
+        assert tokenize("Enfermeras") == tokenize("enfermero")
+        assert tokenize("de la y en") == []
+
+
+class TestInvertedIndex:
+    """Tests para el índice invertido."""
+
+    def test_all_terms_required_and_name_weighs_more(self):
+        """Test que se exigen todos los términos y el nombre pesa más."""
+        in_name, in_description, partial = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        index = InvertedIndex(
+            [
+                (in_description, [("Tecnicatura", WEIGHT_A), ("Redes de datos", WEIGHT_B)]),
+                (in_name, [("Redes de datos", WEIGHT_A), (None, WEIGHT_B)]),
+                (partial, [("Base de datos", WEIGHT_A), (None, WEIGHT_B)]),
+            ]
+        )
+
+        ranked, fuzzy = index.search("redes datos", limit=10)
+
+        assert [doc_id for doc_id, _ in ranked] == [in_name, in_description]
+        assert not fuzzy
+
+    def test_typos_fall_back_to_trigrams(self):
+        """Test que con errores de tipeo se busca por similitud."""
+        program_id = uuid.uuid4()
+        index = InvertedIndex([(program_id, [("Ingeniería en Sistemas", WEIGHT_A)])])
+
+        ranked, fuzzy = index.search("ingeneria sistmas", limit=10)
+
+        assert [doc_id for doc_id, _ in ranked] == [program_id]
+        assert fuzzy
+        assert index.search("ingeneria sistmas", limit=10, fuzzy=False) == ([], False)
+
+
+class TestSearchService:
+    """Tests del servicio de búsqueda sobre la BD."""
+
+    @pytest.mark.usefixtures("catalog")
+    def test_programs_ranked_by_relevance(self, db):
+        """Test que el programa con las palabras en el nombre va primero."""
+        result = SearchService(db).search("ingenieria sistemas", SearchScope.PROGRAMS)
+
+        names = [hit.program.name for hit in result.programs]
+        assert names == ["Ingeniería en Sistemas de Información", "Ingeniería Civil"]
+        assert result.programs[0].score > result.programs[1].score
+        assert result.programs[0].program.institution.name == "UTN"
+        assert result.trajectories == []
+
+    @pytest.mark.usefixtures("catalog")
+    def test_trajectory_story_is_searchable(self, db):
+        """Test que se busca en la historia y solo en trayectorias verificadas."""
+        result = SearchService(db).search("farmacia", SearchScope.TRAJECTORIES)
+
+        assert [hit.trajectory.title for hit in result.trajectories] == [
+            "De cuidar a mi abuela a la enfermería"
+        ]
+
+    def test_index_refreshes_when_catalog_changes(self, db, catalog):
+        """Test que un programa nuevo aparece sin reiniciar."""
+        service = SearchService(db)
+        assert service.search("kinesiologia").programs == []
+
+        db.add(
+            Program(
+                institution_id=catalog["civil"].institution_id,
+                name="Licenciatura en Kinesiología",
+                type="degree",
+                modality="in_person",
+                area="health",
+            )
+        )
+        db.commit()
+
+        hits = service.search("kinesiologia").programs
+        assert [hit.program.name for hit in hits] == ["Licenciatura en Kinesiología"]
+
+
+@pytest.mark.usefixtures("catalog")
+def test_search_endpoint(client: TestClient):
+    """Test del endpoint de búsqueda."""
+    response = client.get("/api/v1/search", params={"q": "enfermeria"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["fuzzy"] is False
+    assert data["programs"][0]["program"]["name"] == "Licenciatura en Enfermería"
+    assert len(data["trajectories"]) == 1
+
+    fuzzy = client.get("/api/v1/search", params={"q": "enfermeira", "scope": "programs"}).json()
+    assert fuzzy["fuzzy"] is True
+    assert fuzzy["programs"][0]["program"]["name"] == "Licenciatura en Enfermería"
+    assert fuzzy["trajectories"] == []
+
+    assert client.get("/api/v1/search", params={"q": "a"}).status_code == 422
@@ -0,0 +1,95 @@
+"""
+Tests para el servidor multiproceso con precarga.
+"""
+
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+from src.database import Base
+from src.server import format_memory, memory_usage
+
+API_DIR = Path(__file__).resolve().parents[1]
+
+
+def _wait_for_line(process: subprocess.Popen, pattern: str, lines: list[str]) -> re.Match:
+    """Lee la salida del servidor hasta encontrar una línea que cumpla `pattern`."""
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        line = process.stdout.readline()
+        if not line:
+            break
+        lines.append(line)
+        if match := re.search(pattern, line):
+            return match
+    raise AssertionError(f"'{pattern}' no apareció en la salida:\n{''.join(lines)}")
+
+
+def test_memory_usage_reports_current_process():
+    """Test que se informa la memoria del proceso actual."""
+    usage = memory_usage()
+
+    assert usage["rss"] > 0
+    assert "rss=" in format_memory(usage)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requiere fork")
+def test_prefork_server_preloads_and_recycles_workers(tmp_path: Path):
+    """Test que el servidor precarga, atiende con varios workers y los recicla."""
+    database_url = f"sqlite:///{tmp_path / 'server.db'}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DEBUG": "false",
+        "CATALOG_SNAPSHOT_DIR": str(tmp_path / "snapshots"),
+        "PYTHONUNBUFFERED": "1",
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.server",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            "0",
+            "--workers",
+            "2",
+            "--max-requests",
+            "3",
+        ],
+        cwd=API_DIR,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    lines: list[str] = []
+    try:
+        port = _wait_for_line(process, r"listening on http://127\.0\.0\.1:(\d+)", lines).group(1)
+        _wait_for_line(process, r"Preload done in \d+ ms \(rss=", lines)
+        _wait_for_line(process, r"Worker \d \(pid \d+\) ready in \d+ ms \(rss=", lines)
+
+        for _ in range(8):
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=10) as response:
+                assert response.status == 200
+
+        _wait_for_line(process, r"Worker \d \(pid \d+\) recycled", lines)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        output, _ = process.communicate(timeout=30)
+        lines.append(output)
+
+    assert process.returncode == 0, "".join(lines)
+    assert "Prefork server stopped" in output
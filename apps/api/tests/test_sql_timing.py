@@ -0,0 +1,93 @@
+"""
+Tests para la instrumentación SQL por request.
+"""
+
+import logging
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import db_instrumentation
+from src.db_instrumentation import normalize_sql
+from src.models.institution import Institution
+from src.models.program import Program
+from tests.conftest import count_queries
+
+
+@pytest.fixture
+def program(db) -> Program:
+    """Crea un programa del catálogo."""
+    institution = Institution(name="UNS", type="university", province="Buenos Aires")
+    db.add(institution)
+    db.commit()
+    program = Program(
+        institution_id=institution.id,
+        name="Geología",
+        type="degree",
+        modality="in_person",
+        area="exact_sciences",
+    )
+    db.add(program)
+    db.commit()
+    return program
+
+
+def _db_timing(response) -> tuple[int, float]:
+    """Cantidad de sentencias y duración del Server-Timing `db`."""
+    match = re.search(r'db;dur=([\d.]+);desc="(\d+) queries"', response.headers["server-timing"])
+    assert match is not None
+    return int(match.group(2)), float(match.group(1))
+
+
+def test_normalize_sql():
+    """Test que se reemplazan literales y parámetros y se colapsan las listas."""
+    statement = """
+        SELECT programs.id FROM programs
+        WHERE programs.id IN (%(id_1)s, %(id_2)s, %(id_3)s) AND programs.area = 'health'
+        LIMIT 20 OFFSET ?
+    """
+
+    assert normalize_sql(statement) == (
+        "SELECT programs.id FROM programs WHERE programs.id IN (?...) "
+        "AND programs.area = ? LIMIT ? OFFSET ?"
+    )
+    assert normalize_sql("SELECT $1::text, anon_1.x") == "SELECT ?::text, anon_1.x"
+
+
+def test_server_timing_counts_request_statements(client: TestClient, program):
+    """Test que Server-Timing informa las sentencias ejecutadas por el request."""
+    url = f"/api/v1/programs/{program.id}"
+
+    with count_queries() as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    queries, duration = _db_timing(response)
+    assert queries == len(statements) > 0
+    assert duration > 0
+    assert "db-slowest;dur=" in response.headers["server-timing"]
+
+    # Una validación condicional no toca la BD
+    cached = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert _db_timing(cached) == (0, 0.0)
+
+
+def test_slow_queries_and_requests_are_logged(client: TestClient, program, caplog, monkeypatch):
+    """Test que se loguean las sentencias lentas normalizadas y una línea por request."""
+    url = f"/api/v1/programs/{program.id}"
+    monkeypatch.setattr(db_instrumentation, "slow_query_threshold_ms", 0.0)
+    caplog.set_level(logging.INFO)
+
+    client.get(url)
+
+    slow = [record for record in caplog.records if record.name == "src.db_instrumentation"]
+    assert slow
+    assert all(record.levelno == logging.WARNING for record in slow)
+    assert str(program.id.hex) not in slow[0].statement
+    (request,) = [record for record in caplog.records if record.name == "src.middleware.sql_timing"]
+    assert request.path == url
+    assert request.status == 200
+    assert request.db_statements == len(slow)
+    assert "db_statements=" in request.getMessage()